@@ -0,0 +1,117 @@
+"""add denormalized resolved_attributes to videos
+
+Revision ID: 2fb5ba2d1782
+Revises: 1c792abff75a
+Create Date: 2026-10-19 10:12:31.402113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '2fb5ba2d1782'
+down_revision: Union[str, Sequence[str], None] = '1c792abff75a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_video_resolved_attributes(video_ids uuid[]) RETURNS void AS $$
+    UPDATE videos v
+    SET resolved_attributes = COALESCE((
+        SELECT jsonb_agg(jsonb_build_object('type', t.name, 'value', av.value) ORDER BY t.name, av.value)
+        FROM video_attributes va
+        JOIN attribute_values av ON av.id = va.attribute_value_id
+        JOIN attribute_types t ON t.id = av.type_id
+        WHERE va.video_id = v.id
+    ), '[]'::jsonb)
+    WHERE v.id = ANY(video_ids);
+$$ LANGUAGE sql;
+"""
+
+# Statement-level triggers with transition tables: a bulk insert/delete of links
+# re-aggregates every affected video once instead of once per row.
+LINKS_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_resolved_attributes_from_links() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM refresh_video_resolved_attributes(ARRAY(SELECT DISTINCT video_id FROM new_links));
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        PERFORM refresh_video_resolved_attributes(ARRAY(SELECT DISTINCT video_id FROM old_links));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Deleting values/types cascades to video_attributes, so only renames need handling here.
+VALUES_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_resolved_attributes_from_values() RETURNS trigger AS $$
+BEGIN
+    PERFORM refresh_video_resolved_attributes(ARRAY(
+        SELECT DISTINCT va.video_id
+        FROM video_attributes va
+        JOIN new_values nv ON nv.id = va.attribute_value_id
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TYPES_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_resolved_attributes_from_types() RETURNS trigger AS $$
+BEGIN
+    PERFORM refresh_video_resolved_attributes(ARRAY(
+        SELECT DISTINCT va.video_id
+        FROM video_attributes va
+        JOIN attribute_values av ON av.id = va.attribute_value_id
+        JOIN new_types nt ON nt.id = av.type_id
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS = [
+    # (name, event, table, transition tables, function)
+    ("video_attributes_resolved_ins", "INSERT", "video_attributes", "NEW TABLE AS new_links", "sync_resolved_attributes_from_links"),
+    ("video_attributes_resolved_upd", "UPDATE", "video_attributes", "OLD TABLE AS old_links NEW TABLE AS new_links", "sync_resolved_attributes_from_links"),
+    ("video_attributes_resolved_del", "DELETE", "video_attributes", "OLD TABLE AS old_links", "sync_resolved_attributes_from_links"),
+    ("attribute_values_resolved_upd", "UPDATE", "attribute_values", "NEW TABLE AS new_values", "sync_resolved_attributes_from_values"),
+    ("attribute_types_resolved_upd", "UPDATE", "attribute_types", "NEW TABLE AS new_types", "sync_resolved_attributes_from_types"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'videos',
+        sa.Column('resolved_attributes', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'[]'::jsonb"), nullable=False)
+    )
+    op.execute(REFRESH_FUNCTION)
+    op.execute(LINKS_TRIGGER_FUNCTION)
+    op.execute(VALUES_TRIGGER_FUNCTION)
+    op.execute(TYPES_TRIGGER_FUNCTION)
+    for name, event, table, referencing, function in TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} AFTER {event} ON {table} "
+            f"REFERENCING {referencing} FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+        )
+
+    # Backfill existing videos
+    op.execute("SELECT refresh_video_resolved_attributes(ARRAY(SELECT id FROM videos))")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _, table, _, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS sync_resolved_attributes_from_types()")
+    op.execute("DROP FUNCTION IF EXISTS sync_resolved_attributes_from_values()")
+    op.execute("DROP FUNCTION IF EXISTS sync_resolved_attributes_from_links()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_video_resolved_attributes(uuid[])")
+    op.drop_column('videos', 'resolved_attributes')
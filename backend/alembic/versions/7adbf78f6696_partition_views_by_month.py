@@ -0,0 +1,91 @@
+"""partition views by month on viewed_at
+
+Revision ID: 7adbf78f6696
+Revises: 2fb5ba2d1782
+Create Date: 2026-10-19 11:03:52.871644
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7adbf78f6696'
+down_revision: Union[str, Sequence[str], None] = '2fb5ba2d1782'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# One partition per UTC month, from the oldest existing row up to two months ahead.
+# Later months are created by ViewLogService partition maintenance.
+CREATE_MONTH_PARTITIONS = """
+DO $$
+DECLARE
+    month_start timestamp;
+    last_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '2 months';
+BEGIN
+    SELECT date_trunc('month', min(viewed_at) AT TIME ZONE 'UTC') INTO month_start FROM views_legacy;
+    month_start := LEAST(COALESCE(month_start, last_month), date_trunc('month', now() AT TIME ZONE 'UTC'));
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF views FOR VALUES FROM (%L) TO (%L)',
+            'views_' || to_char(month_start, 'YYYY_MM'),
+            month_start AT TIME ZONE 'UTC',
+            (month_start + interval '1 month') AT TIME ZONE 'UTC'
+        );
+        month_start := month_start + interval '1 month';
+    END LOOP;
+END $$;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE views RENAME TO views_legacy")
+    op.execute("ALTER INDEX views_pkey RENAME TO views_legacy_pkey")
+
+    op.create_table('views',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('video_id', sa.UUID(), nullable=True),
+    sa.Column('viewed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['video_id'], ['videos.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', 'viewed_at'),
+    postgresql_partition_by='RANGE (viewed_at)'
+    )
+    op.create_index('ix_views_viewed_at', 'views', ['viewed_at'])
+    op.create_index('ix_views_video_id', 'views', ['video_id'])
+
+    # Catches rows outside every monthly partition so late or skewed events are never rejected
+    op.execute("CREATE TABLE views_default PARTITION OF views DEFAULT")
+    op.execute(CREATE_MONTH_PARTITIONS)
+
+    op.execute(
+        "INSERT INTO views (id, user_id, video_id, viewed_at) "
+        "SELECT id, user_id, video_id, COALESCE(viewed_at, now()) FROM views_legacy"
+    )
+    op.drop_table('views_legacy')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table('views_plain',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('video_id', sa.UUID(), nullable=True),
+    sa.Column('viewed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['video_id'], ['videos.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name='views_plain_pkey')
+    )
+    op.execute(
+        "INSERT INTO views_plain (id, user_id, video_id, viewed_at) "
+        "SELECT id, user_id, video_id, viewed_at FROM views"
+    )
+    # Dropping the partitioned parent drops every partition with it
+    op.drop_table('views')
+    op.execute("ALTER TABLE views_plain RENAME TO views")
+    op.execute("ALTER INDEX views_plain_pkey RENAME TO views_pkey")
@@ -0,0 +1,108 @@
+"""
+Bytes on the wire and CPU per response for CompressionMiddleware on catalog-sized JSON.
+
+The payload is a `ListResponse[VideoRead]` body like /admin/videos/ returns (signed URLs and
+`hls_segments` maps included, see benchmarks.serialization). Each encoding that is installed
+(gzip always, br with `brotli`, zstd with `zstandard`) is run through the middleware as one body
+and as a stream of `--chunk` KiB pieces, against a plain ASGI app, so only compression is timed.
+
+Usage (from backend/):
+    python -m benchmarks.compression --items 100 --segments 300 --repeat 10
+"""
+import time
+import asyncio
+import argparse
+
+from src.schemas import ListResponse
+from src.core.responses import ModelJSONResponse
+from src.core.compression import CompressionMiddleware, available_encoders
+from src.modules.videos.schemas import VideoRead
+from benchmarks.serialization import make_rows, constructed
+
+LEVELS = {
+    "gzip": [1, 6, 9],
+    "br": [1, 4, 8],
+    "zstd": [1, 3, 10],
+}
+
+
+def build_app(body: bytes, chunk_size: int):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        if not chunk_size:
+            await send({"type": "http.response.body", "body": body})
+            return
+        for offset in range(0, len(body), chunk_size):
+            await send({
+                "type": "http.response.body",
+                "body": body[offset:offset + chunk_size],
+                "more_body": offset + chunk_size < len(body),
+            })
+
+    return app
+
+
+async def run_once(middleware: CompressionMiddleware, encoding: str) -> int:
+    sent = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal sent
+        if message["type"] == "http.response.body":
+            sent += len(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", encoding.encode())],
+    }
+    await middleware(scope, receive, send)
+    return sent
+
+
+async def measure(body: bytes, encoding: str, level: int, chunk_size: int, repeat: int) -> tuple[int, float]:
+    middleware = CompressionMiddleware(build_app(body, chunk_size), preference=(encoding,), levels={encoding: level})
+    sent = await run_once(middleware, encoding)
+    cpu = []
+    for _ in range(repeat):
+        started = time.process_time()
+        await run_once(middleware, encoding)
+        cpu.append(time.process_time() - started)
+    return sent, min(cpu)
+
+
+async def main(items: int, segments: int, chunk_kib: int, repeat: int):
+    videos = [constructed(row) for row in make_rows(items, segments)]
+    body = ModelJSONResponse(ListResponse[VideoRead].model_construct(data=videos, total=len(videos))).body
+    encoders = available_encoders()
+    missing = sorted(set(LEVELS) - set(encoders))
+
+    print(f"{items} videos x {segments} segments: {len(body) / 1024:.0f} KiB uncompressed")
+    if missing:
+        print(f"not installed, skipped: {', '.join(missing)}")
+    print(f"{'encoding':<10}{'level':>6}{'mode':>10}{'KiB':>10}{'ratio':>8}{'cpu, ms':>10}{'MiB/s':>9}")
+    for encoding in encoders:
+        for level in LEVELS[encoding]:
+            for mode, chunk_size in (("whole", 0), ("stream", chunk_kib * 1024)):
+                sent, cpu = await measure(body, encoding, level, chunk_size, repeat)
+                print(
+                    f"{encoding:<10}{level:>6}{mode:>10}{sent / 1024:>10.0f}{len(body) / sent:>8.1f}"
+                    f"{cpu * 1000:>10.1f}{len(body) / 2 ** 20 / max(cpu, 1e-9):>9.0f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--segments", type=int, default=300)
+    parser.add_argument("--chunk", type=int, default=64, help="stream chunk size, KiB")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.segments, args.chunk, args.repeat))
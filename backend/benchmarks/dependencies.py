@@ -0,0 +1,111 @@
+"""
+Per-request dependency overhead: service graphs built on every request vs shared container instances.
+
+A throwaway app exposes one endpoint that depends on the auth, user, video and attribute
+services (the same factories the routers use) and does nothing else, so the measured time
+is FastAPI's dependency resolution plus service construction. In "per-request" mode every
+factory cache is cleared before each request, which reproduces building the graph per request
+(CryptContext/bcrypt setup, JWTService, a boto3 client for VideoUtils, ...).
+No database or storage access happens; any values for the env settings will do.
+
+Usage (from backend/):
+    python -m benchmarks.dependencies --requests 2000
+"""
+import time
+import asyncio
+import argparse
+
+import httpx
+from fastapi import Depends, FastAPI, Request
+
+from src.modules.auth.service import AuthService
+from src.modules.users.service import UserService
+from src.modules.videos.service import VideoService
+from src.modules.attributes.service import AttributeService
+from src.modules.users.dependencies import get_user_service, get_principal_cache
+from src.modules.attributes.dependencies import get_attribute_service
+from src.modules.entitlements.dependencies import get_entitlement_service
+from src.modules.videos.dependencies import get_video_service, get_video_utils
+from src.modules.auth.dependencies import (
+    get_auth_service,
+    get_jwt_service,
+    get_password_manager,
+    get_revocation_store,
+)
+
+FACTORIES = (
+    get_jwt_service,
+    get_password_manager,
+    get_principal_cache,
+    get_user_service,
+    get_revocation_store,
+    get_auth_service,
+    get_attribute_service,
+    get_entitlement_service,
+    get_video_utils,
+    get_video_service,
+)
+
+
+def build_app(per_request: bool) -> FastAPI:
+    app = FastAPI()
+
+    if per_request:
+        @app.middleware("http")
+        async def rebuild_services(request: Request, call_next):
+            for factory in FACTORIES:
+                factory.cache_clear()
+            return await call_next(request)
+
+    @app.get("/noop")
+    async def noop(
+        auth_service: AuthService = Depends(get_auth_service),
+        user_service: UserService = Depends(get_user_service),
+        video_service: VideoService = Depends(get_video_service),
+        attribute_service: AttributeService = Depends(get_attribute_service),
+    ):
+        return None
+
+    return app
+
+
+async def measure(per_request: bool, requests: int) -> list[float]:
+    transport = httpx.ASGITransport(app=build_app(per_request))
+    timings = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(50, requests)):
+            await client.get("/noop")
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get("/noop")
+            timings.append(time.perf_counter() - started)
+            assert response.status_code == 200
+    return sorted(timings)
+
+
+def percentile(timings: list[float], p: float) -> float:
+    return timings[min(len(timings) - 1, int(len(timings) * p))] * 1e6
+
+
+async def main(requests: int):
+    results = {
+        "per-request graph": await measure(True, requests),
+        "shared container": await measure(False, requests),
+    }
+    get_password_manager().shutdown()
+
+    print(f"{requests} requests per mode (microseconds per request)")
+    print(f"{'mode':<20}{'p50':>10}{'p90':>10}{'p99':>10}{'mean':>10}")
+    for name, timings in results.items():
+        mean = sum(timings) / len(timings) * 1e6
+        print(
+            f"{name:<20}{percentile(timings, 0.5):>10.0f}{percentile(timings, 0.9):>10.0f}"
+            f"{percentile(timings, 0.99):>10.0f}{mean:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
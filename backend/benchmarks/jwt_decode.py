@@ -0,0 +1,73 @@
+"""
+Access token decode cost per request: plain PyJWT verification vs JWTService's verified-token cache.
+
+Simulates `--clients` clients each reusing one access token for `--requests` requests in total
+(round robin), the way a browser session does for the token's lifetime. With --threads the
+requests are split over that many threads sharing one service, like FastAPI's threadpool
+running the sync auth dependencies.
+No database or network access; SECRET_KEY and friends can be any values.
+
+Usage (from backend/):
+    python -m benchmarks.jwt_decode --clients 500 --requests 200000
+    python -m benchmarks.jwt_decode --clients 500 --requests 200000 --threads 8
+"""
+import time
+import argparse
+import threading
+from uuid import uuid4
+from types import SimpleNamespace
+
+from src.modules.auth.jwt_service import JWTService
+
+
+def build_service(cache_size: int) -> JWTService:
+    return JWTService(
+        algorithm="HS256",
+        secret_key="benchmark-secret",
+        access_expiry=60,
+        refresh_expiry=43200,
+        decode_cache_size=cache_size,
+    )
+
+
+def run(service: JWTService, tokens: list[str], requests: int, threads: int) -> float:
+    def decode(offset: int, count: int):
+        for i in range(offset, offset + count):
+            service.decode_token(tokens[i % len(tokens)])
+
+    share = requests // threads
+    workers = [
+        threading.Thread(target=decode, args=(n * share, share + (requests % threads if n == threads - 1 else 0)))
+        for n in range(threads)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+
+def main(clients: int, requests: int, threads: int):
+    issuer = build_service(0)
+    users = [SimpleNamespace(id=uuid4(), email=f"user{i}@example.com") for i in range(clients)]
+    tokens = [issuer.generate_access_token(user) for user in users]
+
+    results = {
+        "no cache": run(build_service(0), tokens, requests, threads),
+        "decode cache": run(build_service(max(clients, 1)), tokens, requests, threads),
+    }
+
+    print(f"{clients} tokens, {requests} decodes on {threads} thread(s)")
+    print(f"{'path':<16}{'us / request':>14}{'total, s':>12}")
+    for name, seconds in results.items():
+        print(f"{name:<16}{seconds / requests * 1e6:>14.2f}{seconds:>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+    main(args.clients, args.requests, args.threads)
@@ -0,0 +1,114 @@
+"""
+Logging cost per request as seen by the event loop: the old setup (f-string debug messages built
+even when DEBUG is off, path resolution and a synchronous stdout write per record) vs the queue
+pipeline (lazy %-style messages, QueueHandler in front, formatting and writing on the listener thread).
+
+Each simulated request makes `--debug-calls` CRUDBase-style debug calls carrying a payload
+(dropped at INFO level) and `--info-calls` INFO records. `--sink-delay-us` makes every write
+to the sink sleep, the way stdout blocks when the log pipe / docker log driver falls behind.
+No database or network access; SECRET_KEY and friends can be any values.
+
+Usage (from backend/):
+    python -m benchmarks.logging_overhead --requests 20000 --sink-delay-us 50
+"""
+import io
+import time
+import queue
+import logging
+import argparse
+from pathlib import Path
+from logging.handlers import QueueListener
+
+from src.core.logger import CustomFormatter, LogQueueHandler, SamplingFilter, FORMAT, DATEFMT
+
+
+class SlowSink(io.TextIOBase):
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.written = 0
+
+    def write(self, s: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        self.written += len(s)
+        return len(s)
+
+
+class PathResolvingFormatter(CustomFormatter):
+    """
+    Formatter as it was: resolves the record's path on every call.
+    """
+
+    def format(self, record):
+        record.pathname = str(Path(record.pathname).resolve())
+        return super().format(record)
+
+
+def make_payload() -> dict:
+    return {f"field_{i}": f"value {i} " * 8 for i in range(20)}
+
+
+def run_eager(log: logging.Logger, payload: dict, requests: int, debug_calls: int, info_calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(requests):
+        for _ in range(debug_calls):
+            log.debug(f"Creating VideoTable with data: {payload}")
+        for _ in range(info_calls):
+            log.info(f"Request {i} handled")
+    return time.perf_counter() - started
+
+
+def run_lazy(log: logging.Logger, payload: dict, requests: int, debug_calls: int, info_calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(requests):
+        for _ in range(debug_calls):
+            log.debug("Creating %s with data: %s", "VideoTable", payload)
+        for _ in range(info_calls):
+            log.info("Request %s handled", i)
+    return time.perf_counter() - started
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    log = logging.getLogger(f"benchmark.{name}")
+    log.handlers = [handler]
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    return log
+
+
+def main(requests: int, debug_calls: int, info_calls: int, sink_delay_us: float, sample_threshold: int):
+    payload = make_payload()
+    delay = sink_delay_us / 1e6
+    results = {}
+
+    sync_handler = logging.StreamHandler(SlowSink(delay))
+    sync_handler.setFormatter(PathResolvingFormatter(FORMAT, DATEFMT))
+    results["sync, eager"] = run_eager(make_logger("sync", sync_handler), payload, requests, debug_calls, info_calls)
+
+    for name, threshold in (("queue, lazy", 0), ("queue, lazy, sampled", sample_threshold)):
+        console = logging.StreamHandler(SlowSink(delay))
+        console.setFormatter(CustomFormatter(FORMAT, DATEFMT))
+        handler = LogQueueHandler(queue.Queue(100000), SamplingFilter(threshold, 10))
+        listener = QueueListener(handler.queue, console)
+        listener.start()
+        results[name] = run_lazy(make_logger(name, handler), payload, requests, debug_calls, info_calls)
+        listener.stop()
+        stats = handler.stats()
+        if stats["dropped_queue_full"] or stats["sampled_out"]:
+            results[name + f" ({stats['sampled_out']} sampled out, {stats['dropped_queue_full']} dropped)"] = results.pop(name)
+
+    print(f"{requests} requests x ({debug_calls} debug + {info_calls} info), sink delay {sink_delay_us} us")
+    print(f"{'pipeline':<56}{'us / request':>14}{'total, s':>12}")
+    for name, seconds in results.items():
+        print(f"{name:<56}{seconds / requests * 1e6:>14.2f}{seconds:>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--debug-calls", type=int, default=4)
+    parser.add_argument("--info-calls", type=int, default=1)
+    parser.add_argument("--sink-delay-us", type=float, default=0)
+    parser.add_argument("--sample-threshold", type=int, default=100)
+    args = parser.parse_args()
+    main(args.requests, args.debug_calls, args.info_calls, args.sink_delay_us, args.sample_threshold)
@@ -0,0 +1,403 @@
+"""
+Microbenchmarks for the hot paths, with fixed inputs:
+
+    presign.*    VideoUtils.attach_presigned_urls for one video (list fields, and with
+                 `--segments` HLS segments from a canned bucket listing)
+    jwt.*        JWTService.generate_access_token and decode_token (cache off / warm cache)
+    password.*   PasswordManager hash and verify at `--bcrypt-rounds`, through its thread pool
+    serialize.*  a `--page` item ListResponse[VideoRead] rendered by ModelJSONResponse
+    crud.*       CRUDBase.get_multi of a `--page` of videos with the selectinload chain down to
+                 attribute types (only with --database; rows are seeded in a transaction
+                 that is rolled back)
+
+Each benchmark is calibrated to run for at least `--min-time` seconds per round; the median
+of `--rounds` rounds is reported as ops/s and time per op. Allocations come from tracemalloc in
+a separate pass: peak KiB while one op runs, and bytes per op still held after `--alloc-ops` ops.
+Presigning is local, nothing talks to storage; SPACES_* and SECRET_KEY can be any values.
+
+Results saved with --output carry the commit they were measured on; --compare prints the
+change against such a file and exits with 1 when an op got slower than --tolerance allows.
+Compare runs made on the same machine with the same settings.
+
+Usage (from backend/):
+    python -m benchmarks.micro --output micro-before.json
+    python -m benchmarks.micro --compare micro-before.json --filter jwt serialize
+    python -m benchmarks.micro --database --page 100
+"""
+import sys
+import json
+import time
+import asyncio
+import inspect
+import argparse
+import platform
+import statistics
+import subprocess
+import tracemalloc
+from uuid import uuid4
+from decimal import Decimal
+from types import SimpleNamespace
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from src.schemas import ListResponse
+from src.core.dependencies import get_config
+from src.core.responses import ModelJSONResponse
+from src.modules.auth.jwt_service import JWTService
+from src.modules.auth.password_manager import PasswordManager
+from src.modules.videos.schemas import VideoRead
+from src.modules.videos.utils import VideoUtils
+from benchmarks.serialization import constructed, make_rows
+
+# Everything a list endpoint returns; hls_segments needs a bucket listing and has its own benchmark
+LIST_FIELDS = frozenset(VideoRead.model_fields) - {"hls_segments"}
+
+Op = Union[Callable[[], Any], Callable[[], Awaitable[Any]]]
+
+
+class Bench:
+    def __init__(self, name: str, op: Op):
+        self.name = name
+        self.op = op
+        self.is_async = inspect.iscoroutinefunction(op)
+
+
+    def run(self, loop: asyncio.AbstractEventLoop, number: int) -> float:
+        """
+        Seconds taken by `number` back to back ops (async ops run in one loop pass).
+        """
+        op = self.op
+        if not self.is_async:
+            started = time.perf_counter()
+            for _ in range(number):
+                op()
+            return time.perf_counter() - started
+
+        async def batch() -> float:
+            started = time.perf_counter()
+            for _ in range(number):
+                await op()
+            return time.perf_counter() - started
+
+        return loop.run_until_complete(batch())
+
+
+def calibrate(bench: Bench, loop: asyncio.AbstractEventLoop, min_time: float) -> int:
+    number = 1
+    while True:
+        elapsed = bench.run(loop, number)
+        if elapsed >= min_time:
+            return number
+        # aim a bit past min_time so the next try usually lands
+        number = max(number * 2, int(number * min_time * 1.2 / max(elapsed, 1e-9)))
+
+
+def allocations(bench: Bench, loop: asyncio.AbstractEventLoop, ops: int) -> tuple[float, float]:
+    """
+    (peak KiB while one op runs, bytes per op still allocated after `ops` ops).
+    """
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        bench.run(loop, 1)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+
+        baseline = tracemalloc.get_traced_memory()[0]
+        bench.run(loop, ops)
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    return peak / 1024, retained / ops
+
+
+def measure(bench: Bench, loop: asyncio.AbstractEventLoop, min_time: float, rounds: int, alloc_ops: int) -> dict:
+    bench.run(loop, 1)  # warm-up: imports, caches, lazy client setup
+    number = calibrate(bench, loop, min_time)
+    per_op = [bench.run(loop, number) / number for _ in range(rounds)]
+    peak_kib, retained = allocations(bench, loop, min(alloc_ops, number))
+    median = statistics.median(per_op)
+    return {
+        "ops_per_sec": 1 / median,
+        "us_per_op": median * 1e6,
+        "us_per_op_min": min(per_op) * 1e6,
+        "number": number,
+        "rounds": rounds,
+        "peak_kib_per_op": peak_kib,
+        "retained_bytes_per_op": retained,
+    }
+
+
+def video_row(i: int) -> SimpleNamespace:
+    config = get_config()
+    base = f"{config.SPACES_ENDPOINT}/{config.SPACES_BUCKET}"
+    return SimpleNamespace(
+        id=uuid4(),
+        title=f"Benchmark lesson {i}",
+        description="Opening principles, middlegame plans and endgame technique.",
+        preview_url=f"{base}/previews/{i}.jpg",
+        hls_url=f"{base}/hls/{i}/master.m3u8",
+        access_level=i % 3,
+        price=Decimal("9.99") if i % 3 else None,
+        created_at=datetime.now(timezone.utc),
+        resolved_attributes=[{"type": "level", "value": "intermediate"}, {"type": "coach", "value": "GM Example"}],
+    )
+
+
+def presign_benches(segments: int) -> list[Bench]:
+    utils = VideoUtils(get_config())
+    video = video_row(1)
+    prefix = utils.extract_key(video.hls_url).replace("master.m3u8", "")
+    listing = {"Contents": [{"Key": f"{prefix}master{n}.ts"} for n in range(segments)] + [{"Key": f"{prefix}master.m3u8"}]}
+    # Canned listing instead of a bucket round trip: only the signing is measured
+    utils.s3.list_objects_v2 = lambda **kwargs: listing
+    return [
+        Bench("presign.attach_presigned_urls", lambda: utils.attach_presigned_urls(video, LIST_FIELDS)),
+        Bench(f"presign.attach_presigned_urls+{segments}_segments", lambda: utils.attach_presigned_urls(video)),
+    ]
+
+
+def jwt_benches(tokens: int) -> list[Bench]:
+    def service(cache_size: int) -> JWTService:
+        return JWTService("HS256", "benchmark-secret", access_expiry=60, refresh_expiry=43200, decode_cache_size=cache_size)
+
+    issuer, uncached, cached = service(0), service(0), service(tokens)
+    users = [SimpleNamespace(id=uuid4(), email=f"user{i}@example.com") for i in range(tokens)]
+    issued = [issuer.generate_access_token(user) for user in users]
+    for token in issued:
+        cached.decode_token(token)
+
+    def round_robin(decoder: JWTService) -> Callable[[], dict]:
+        state = {"i": 0}
+
+        def op() -> dict:
+            state["i"] = (state["i"] + 1) % tokens
+            return decoder.decode_token(issued[state["i"]])
+        return op
+
+    return [
+        Bench("jwt.generate_access_token", lambda: issuer.generate_access_token(users[0])),
+        Bench("jwt.decode_token", round_robin(uncached)),
+        Bench("jwt.decode_token_cached", round_robin(cached)),
+    ]
+
+
+def password_benches(rounds: int) -> list[Bench]:
+    manager = PasswordManager(rounds=rounds, max_workers=1, max_queue=1)
+    hashed = manager.pwd_context.hash("benchmark-password")
+
+    async def hash_op() -> str:
+        return await manager.hash_password("benchmark-password")
+
+    async def verify_op() -> bool:
+        return await manager.verify_password("benchmark-password", hashed)
+
+    return [
+        Bench(f"password.hash_password_{rounds}_rounds", hash_op),
+        Bench(f"password.verify_password_{rounds}_rounds", verify_op),
+    ]
+
+
+def serialize_benches(page: int, segments: int) -> list[Bench]:
+    rows = make_rows(page, 0)
+    rows_with_segments = make_rows(page, segments)
+
+    def render(rows: list[dict]) -> Callable[[], bytes]:
+        def op() -> bytes:
+            videos = [constructed(row) for row in rows]
+            return ModelJSONResponse(ListResponse[VideoRead].model_construct(data=videos, total=len(videos))).body
+        return op
+
+    return [
+        Bench(f"serialize.list_response_{page}", render(rows)),
+        Bench(f"serialize.list_response_{page}+{segments}_segments", render(rows_with_segments)),
+    ]
+
+
+async def seed_catalog(conn, videos: int):
+    from sqlalchemy import insert
+    from src.models import AttributeTypeTable, AttributeValueTable, VideoAttributeLinkTable, VideoTable
+
+    now = datetime.now(timezone.utc)
+    value_ids = []
+    for t in range(4):
+        type_id = uuid4()
+        await conn.execute(insert(AttributeTypeTable.__table__).values(id=type_id, name=f"Benchmark type {t} {type_id}"))
+        values = [{"id": uuid4(), "type_id": type_id, "value": f"Value {v}"} for v in range(6)]
+        await conn.execute(insert(AttributeValueTable.__table__), values)
+        value_ids += [value["id"] for value in values]
+
+    video_rows, link_rows = [], []
+    for i in range(videos):
+        row = vars(video_row(i))
+        row["created_at"] = now
+        video_rows.append(row)
+        link_rows += [
+            {"id": uuid4(), "video_id": row["id"], "attribute_value_id": value_ids[(i + n * 6) % len(value_ids)]}
+            for n in range(3)
+        ]
+    await conn.execute(insert(VideoTable.__table__), video_rows)
+    await conn.execute(insert(VideoAttributeLinkTable.__table__), link_rows)
+
+
+async def crud_benches(conn, page: int) -> list[Bench]:
+    from sqlalchemy.orm import selectinload
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from src.models import AttributeValueTable, VideoAttributeLinkTable, VideoTable
+    from src.modules.videos.crud import VideoDatabase
+
+    await seed_catalog(conn, page)
+    database = VideoDatabase(VideoTable)
+    options = [
+        selectinload(VideoTable.attributes)
+        .selectinload(VideoAttributeLinkTable.attribute_value)
+        .selectinload(AttributeValueTable.type)
+    ]
+
+    async def get_multi() -> list:
+        # A fresh session per op, so the identity map doesn't turn later ops into cache hits
+        async with AsyncSession(bind=conn, join_transaction_mode="create_savepoint") as session:
+            videos = await database.get_multi(session, 0, page, options=options)
+            assert len(videos) >= page
+            return videos
+
+    async def get_multi_plain() -> list:
+        async with AsyncSession(bind=conn, join_transaction_mode="create_savepoint") as session:
+            return await database.get_multi(session, 0, page)
+
+    return [
+        Bench(f"crud.get_multi_{page}+selectinload", get_multi),
+        Bench(f"crud.get_multi_{page}", get_multi_plain),
+    ]
+
+
+def git_commit() -> Optional[dict]:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {"sha": sha, "dirty": bool(dirty)}
+
+
+def print_report(results: dict[str, dict]):
+    print(f"{'benchmark':<48}{'ops/s':>12}{'us/op':>12}{'min us/op':>12}{'peak KiB':>10}{'kept B/op':>11}")
+    for name, r in results.items():
+        print(
+            f"{name:<48}{r['ops_per_sec']:>12.1f}{r['us_per_op']:>12.2f}{r['us_per_op_min']:>12.2f}"
+            f"{r['peak_kib_per_op']:>10.1f}{r['retained_bytes_per_op']:>11.0f}"
+        )
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """
+    Prints the time per op against the baseline; returns the benchmarks slower by more than `tolerance`.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<48}{'old us/op':>12}{'new us/op':>12}{'change':>9}{'peak KiB':>18}")
+    for name, new in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        change = new["us_per_op"] / old["us_per_op"] - 1
+        flag = "  SLOWER" if change > tolerance else ""
+        print(
+            f"{name:<48}{old['us_per_op']:>12.2f}{new['us_per_op']:>12.2f}{change:>+9.1%}"
+            f"{old['peak_kib_per_op']:>9.1f} ->{new['peak_kib_per_op']:>7.1f}{flag}"
+        )
+        if flag:
+            regressions.append(f"{name}: {old['us_per_op']:.2f} -> {new['us_per_op']:.2f} us/op ({change:+.1%})")
+    return regressions
+
+
+def selected(benches: list[Bench], filters: Optional[list[str]]) -> list[Bench]:
+    if not filters:
+        return benches
+    return [bench for bench in benches if any(f in bench.name for f in filters)]
+
+
+def build_benches(args) -> list[Bench]:
+    benches = [
+        *presign_benches(args.segments),
+        *jwt_benches(args.tokens),
+        *password_benches(args.bcrypt_rounds),
+        *serialize_benches(args.page, args.segments),
+    ]
+    return selected(benches, args.filter)
+
+
+def run(args) -> int:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    conn = trans = None
+    try:
+        benches = build_benches(args)
+        if args.database and (not args.filter or any("crud" in f for f in args.filter)):
+            from src.core.database import engine
+            conn = loop.run_until_complete(engine.connect())
+            trans = loop.run_until_complete(conn.begin())
+            benches += selected(loop.run_until_complete(crud_benches(conn, args.page)), args.filter)
+
+        results = {}
+        for bench in benches:
+            print(f"  {bench.name}...", file=sys.stderr)
+            results[bench.name] = measure(bench, loop, args.min_time, args.rounds, args.alloc_ops)
+    finally:
+        if trans is not None:
+            loop.run_until_complete(trans.rollback())
+            loop.run_until_complete(conn.close())
+            from src.core.database import engine
+            loop.run_until_complete(engine.dispose())
+        loop.close()
+
+    print_report(results)
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "settings": {
+            "min_time": args.min_time, "rounds": args.rounds, "page": args.page, "segments": args.segments,
+            "tokens": args.tokens, "bcrypt_rounds": args.bcrypt_rounds,
+            "python": platform.python_version(), "machine": platform.node(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        sha = (baseline.get("commit") or {}).get("sha", "unknown commit")
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"\nSLOWER than {args.compare} ({sha[:12]}, tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.compare} ({sha[:12]}, tolerance {args.tolerance:.0%})")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", nargs="+", help="only benchmarks whose name contains one of these")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--alloc-ops", type=int, default=200, help="ops in the retained-memory pass")
+    parser.add_argument("--page", type=int, default=50, help="videos per list response / get_multi page")
+    parser.add_argument("--segments", type=int, default=300, help="HLS segments per video")
+    parser.add_argument("--tokens", type=int, default=500, help="distinct access tokens decoded round robin")
+    parser.add_argument("--bcrypt-rounds", type=int, default=get_config().BCRYPT_ROUNDS)
+    parser.add_argument("--database", action="store_true", help="also run the crud benchmarks (needs DATABASE_URL)")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", help="compare against results saved with --output")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown per op (0.1 = 10%%)")
+    args = parser.parse_args()
+    sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
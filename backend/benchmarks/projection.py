@@ -0,0 +1,125 @@
+"""
+CPU time and memory per 1000 rows: ORM `CRUDBase.get_multi` vs `CRUDBase.get_multi_projected`.
+
+Both paths fetch the same page of videos and build `VideoRead` models from it
+(presigned URL signing is left out, it is identical for both).
+Rows are seeded inside a transaction that is rolled back at the end,
+so this can be pointed at any database with the current schema.
+
+Usage (from backend/):
+    python -m benchmarks.projection --rows 5000 --repeat 20
+"""
+import time
+import asyncio
+import argparse
+import tracemalloc
+from uuid import uuid4
+from decimal import Decimal
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncConnection
+
+from src.models import VideoTable
+from src.core.database import engine
+from src.modules.videos.crud import VideoDatabase
+from src.modules.videos.utils import VIDEO_READ_COLUMNS
+from src.modules.videos.schemas import VideoRead, AttributeTypedValueRead
+
+database = VideoDatabase(VideoTable)
+
+
+async def seed(conn: AsyncConnection, rows: int):
+    now = datetime.now(timezone.utc)
+    await conn.execute(insert(VideoTable.__table__), [
+        {
+            "id": uuid4(),
+            "title": f"Benchmark lesson {i}",
+            "description": "Opening principles, middlegame plans and endgame technique. " * 4,
+            "preview_url": f"https://example.com/bucket/previews/{i}.jpg",
+            "hls_url": f"https://example.com/bucket/hls/{i}/master.m3u8",
+            "access_level": i % 3,
+            "price": Decimal("9.99") if i % 3 else None,
+            "created_at": now,
+            "resolved_attributes": [
+                {"type": "level", "value": "intermediate"},
+                {"type": "opening", "value": "Sicilian Defence"},
+                {"type": "coach", "value": "GM Example"},
+            ],
+        }
+        for i in range(rows)
+    ])
+
+
+def to_read(video) -> VideoRead:
+    return VideoRead(
+        id=video.id,
+        title=video.title,
+        description=video.description,
+        preview_url=video.preview_url,
+        hls_url=video.hls_url,
+        access_level=video.access_level,
+        price=video.price,
+        created_at=video.created_at,
+        attributes=[AttributeTypedValueRead(**item) for item in video.resolved_attributes or []],
+    )
+
+
+async def orm_path(session: AsyncSession, rows: int) -> list[VideoRead]:
+    videos = await database.get_multi(session, 0, rows)
+    return [to_read(video) for video in videos]
+
+
+async def projection_path(session: AsyncSession, rows: int) -> list[VideoRead]:
+    videos = await database.get_multi_projected(session, VIDEO_READ_COLUMNS, 0, rows)
+    return [to_read(video) for video in videos]
+
+
+async def measure(conn: AsyncConnection, path, rows: int, repeat: int) -> dict:
+    cpu_times = []
+    for _ in range(repeat):
+        async with AsyncSession(bind=conn, join_transaction_mode="create_savepoint") as session:
+            started = time.process_time()
+            result = await path(session, rows)
+            cpu_times.append(time.process_time() - started)
+            assert len(result) == rows
+
+    async with AsyncSession(bind=conn, join_transaction_mode="create_savepoint") as session:
+        tracemalloc.start()
+        await path(session, rows)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    scale = 1000 / rows
+    return {
+        "cpu_ms_per_1000": min(cpu_times) * 1000 * scale,
+        "cpu_ms_per_1000_avg": sum(cpu_times) / len(cpu_times) * 1000 * scale,
+        "peak_kib_per_1000": peak / 1024 * scale,
+    }
+
+
+async def main(rows: int, repeat: int):
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            await seed(conn, rows)
+            results = {
+                "orm get_multi": await measure(conn, orm_path, rows, repeat),
+                "get_multi_projected": await measure(conn, projection_path, rows, repeat),
+            }
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+
+    print(f"{rows} rows, {repeat} runs (values per 1000 rows)")
+    print(f"{'path':<22}{'cpu min, ms':>14}{'cpu avg, ms':>14}{'peak mem, KiB':>16}")
+    for name, r in results.items():
+        print(f"{name:<22}{r['cpu_ms_per_1000']:>14.2f}{r['cpu_ms_per_1000_avg']:>14.2f}{r['peak_kib_per_1000']:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
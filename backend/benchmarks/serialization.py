@@ -0,0 +1,111 @@
+"""
+Time to build and serialize `ListResponse[VideoRead]`: validated models returned through FastAPI's
+`response_model` (re-validation + jsonable_encoder + json.dumps) vs `model_construct` returned
+as a `ModelJSONResponse` (pydantic-core serialization).
+
+Rows imitate what VideoUtils.attach_presigned_urls sees, including an `hls_segments` dict
+with `--segments` signed URLs per video. Requests go through a throwaway app over ASGI,
+so routing and response rendering are included; no database or storage is touched.
+
+Usage (from backend/):
+    python -m benchmarks.serialization --sizes 100 1000 --segments 300 --repeat 20
+"""
+import json
+import time
+import asyncio
+import secrets
+import argparse
+from uuid import uuid4
+from decimal import Decimal
+from datetime import datetime, timezone
+
+import httpx
+from fastapi import FastAPI
+
+from src.schemas import ListResponse
+from src.core.responses import ModelJSONResponse
+from src.modules.videos.schemas import VideoRead, AttributeTypedValueRead
+
+
+def make_rows(count: int, segments: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": uuid4(),
+            "title": f"Benchmark lesson {i}",
+            "description": "Opening principles, middlegame plans and endgame technique.",
+            "preview_url": f"https://bucket.example.com/previews/{i}.jpg?X-Amz-Signature={secrets.token_hex(32)}",
+            "hls_url": f"https://bucket.example.com/hls/{i}/master.m3u8?X-Amz-Signature={secrets.token_hex(32)}",
+            "access_level": i % 3,
+            "price": Decimal("9.99") if i % 3 else None,
+            "created_at": now,
+            "attributes": [{"type": "level", "value": "intermediate"}, {"type": "coach", "value": "GM Example"}],
+            "hls_segments": {
+                f"master{n}.ts": f"https://bucket.example.com/hls/{i}/master{n}.ts?X-Amz-Signature={secrets.token_hex(32)}"
+                for n in range(segments)
+            },
+            "can_watch": bool(i % 2),
+        }
+        for i in range(count)
+    ]
+
+
+def validated(row: dict) -> VideoRead:
+    return VideoRead(**{**row, "attributes": [AttributeTypedValueRead(**a) for a in row["attributes"]]})
+
+
+def constructed(row: dict) -> VideoRead:
+    return VideoRead.model_construct(
+        **{**row, "attributes": [AttributeTypedValueRead.model_construct(**a) for a in row["attributes"]]}
+    )
+
+
+def build_app(rows: list[dict]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before", response_model=ListResponse[VideoRead])
+    async def before():
+        videos = [validated(row) for row in rows]
+        return ListResponse[VideoRead](data=videos, total=len(videos))
+
+    @app.get("/after", response_model=ListResponse[VideoRead])
+    async def after():
+        videos = [constructed(row) for row in rows]
+        return ModelJSONResponse(ListResponse[VideoRead].model_construct(data=videos, total=len(videos)))
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, repeat: int) -> tuple[float, bytes]:
+    body = (await client.get(path)).content
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = await client.get(path)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200
+    return min(timings), body
+
+
+async def main(sizes: list[int], segments: int, repeat: int):
+    print(f"{segments} hls segments per video, best of {repeat} (ms per response)")
+    print(f"{'items':>6}{'response_model':>16}{'ModelJSONResponse':>20}{'speedup':>10}{'body, KiB':>12}")
+    for size in sizes:
+        transport = httpx.ASGITransport(app=build_app(make_rows(size, segments)))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            before, before_body = await measure(client, "/before", repeat)
+            after, after_body = await measure(client, "/after", repeat)
+        assert json.loads(before_body) == json.loads(after_body), "response bodies differ"
+        print(
+            f"{size:>6}{before * 1000:>16.1f}{after * 1000:>20.1f}"
+            f"{before / after:>9.1f}x{len(after_body) / 1024:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--segments", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.segments, args.repeat))
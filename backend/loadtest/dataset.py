@@ -0,0 +1,455 @@
+"""
+Synthetic dataset at production scale: users, attribute types and values, videos with their
+attribute links, view logs, purchases and subscriptions, bulk-loaded with COPY.
+
+Skew is what makes the volumes realistic: video popularity and user activity follow Zipf-like
+distributions (a few videos get most views and sales, a few users do most of the watching),
+the catalog and the view log grow towards the present, views follow a daily cycle, and nothing
+happens before the user or video it refers to existed.
+Every table is drawn from its own random stream derived from the seed, so the same sizes and
+anchor give the same rows, ids included, and the catalog can be rebuilt without the database.
+"""
+import os
+import math
+import time
+import random
+from uuid import UUID
+from decimal import Decimal
+from itertools import accumulate, islice
+from datetime import date, datetime, timezone
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import text
+from passlib.context import CryptContext
+
+from src.models import AccessLevelEnum, ViewLogTable
+from src.core.dependencies import get_config
+from src.modules.views.crud import ViewLogDatabase, VIEW_COLUMNS
+from src.modules.views.service import add_months
+from loadtest.seed import ADMIN_EMAIL, ATTRIBUTES, PASSWORD, user_email
+
+DAY = 86400
+VIDEO_HISTORY_DAYS = 3 * 365
+USER_HISTORY_DAYS = 2 * 365
+ANONYMOUS_VIEW_SHARE = 0.03
+USER_ACTIVITY_SKEW = 0.9
+HLS_SEGMENT_SECONDS = 10
+
+# Relative views per UTC hour: quiet nights, evening peak
+HOURLY_TRAFFIC = [3, 2, 1, 1, 1, 2, 3, 5, 6, 7, 7, 8, 8, 8, 8, 9, 10, 11, 13, 15, 16, 14, 10, 6]
+HOURLY_CUM_WEIGHTS = list(accumulate(HOURLY_TRAFFIC))
+
+# Column order of the rows each generator yields, as passed to COPY
+COLUMNS = {
+    "users": ["id", "email", "hashed_password", "chess_level", "is_admin", "created_at"],
+    "attribute_types": ["id", "name"],
+    "attribute_values": ["id", "type_id", "value"],
+    "videos": ["id", "title", "description", "preview_url", "hls_url", "access_level", "price", "created_at"],
+    "video_attributes": ["id", "video_id", "attribute_value_id"],
+    "views": VIEW_COLUMNS,
+    "purchases": ["id", "user_id", "video_id", "purchase_date"],
+    "subscriptions": ["id", "user_id", "started_at", "expires_at"],
+}
+
+RESET_TABLES = (
+    "users, videos, attribute_types, revoked_tokens, views, purchases, subscriptions, "
+    "video_views_hourly, video_views_daily, view_rollup_seen, rollup_watermarks"
+)
+
+# One MPEG-TS null packet; fake segments are runs of these
+TS_NULL_PACKET = b"\x47\x1f\xff\x10" + b"\xff" * 184
+# JPEG markers around a comment: recognizable as JPEG, not a decodable picture
+PREVIEW_PLACEHOLDER = b"\xff\xd8\xff\xfe\x00\x0fsynthetic pic\xff\xd9"
+
+
+def new_uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def zipf_cum_weights(n: int, skew: float) -> list[float]:
+    """
+    Cumulative weights of ranks 1..n under a Zipf law, for random.choices(cum_weights=...).
+    """
+    return list(accumulate(rank ** -skew for rank in range(1, n + 1)))
+
+
+def utc(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc)
+
+
+def towards(rng: random.Random, start: float, end: float, growth: float) -> float:
+    """
+    A time in [start, end); growth < 1 makes later times more likely.
+    """
+    return end - (end - start) * (1 - rng.random() ** growth)
+
+
+def batched(rows: Iterable, size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+class DatasetGenerator:
+    """
+    Yields the rows of each table in dependency order. Later tables sample from state the
+    earlier generators leave behind (ids, creation times, popularity order), so consume them
+    in the order of TABLES.
+    """
+    TABLES = ("users", "attribute_types", "attribute_values", "videos", "video_attributes", "views", "purchases", "subscriptions")
+
+    def __init__(
+        self,
+        seed: int,
+        anchor: datetime,
+        users: int,
+        videos: int,
+        attribute_types: int,
+        attribute_values: int,
+        views: int,
+        purchases: int,
+        subscriptions: int,
+        view_days: int,
+        skew: float = 1.1,
+        max_segments: int = 120,
+    ):
+        self.seed = seed
+        self.anchor = anchor.timestamp()
+        self.counts = {"users": users, "videos": videos, "views": views, "purchases": purchases, "subscriptions": subscriptions}
+        self.attribute_types = attribute_types
+        self.attribute_values = attribute_values
+        self.view_days = view_days
+        self.skew = skew
+        self.max_segments = max_segments
+        config = get_config()
+        self.base_url = f"{config.SPACES_ENDPOINT}/{config.SPACES_BUCKET}"
+
+        self.user_ids: list[UUID] = []
+        self.user_created: list[float] = []
+        self.type_rows: list[tuple] = []
+        self.value_ids_by_type: list[list[UUID]] = []
+        self.video_ids: list[UUID] = []
+        self.video_created: list[float] = []
+        self.video_access: list[int] = []
+        self.video_segments: list[int] = []
+        self.link_rows: list[tuple] = []
+
+    def stream(self, name: str) -> random.Random:
+        return random.Random(f"{self.seed}:{name}")
+
+
+    def rows(self, table: str) -> Iterator[tuple]:
+        return getattr(self, f"_{table}")()
+
+
+    def _users(self) -> Iterator[tuple]:
+        """
+        The loadtest.seed admin and accounts (same emails, one shared bcrypt hash of its password).
+        """
+        rng = self.stream("users")
+        hashed = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=get_config().BCRYPT_ROUNDS).hash(PASSWORD)
+        levels = ATTRIBUTES["Level"]
+        yield (new_uuid(rng), ADMIN_EMAIL, hashed, "Master", True, utc(self.anchor - USER_HISTORY_DAYS * DAY))
+        for i in range(self.counts["users"]):
+            user_id = new_uuid(rng)
+            created = towards(rng, self.anchor - USER_HISTORY_DAYS * DAY, self.anchor, 0.6)
+            self.user_ids.append(user_id)
+            self.user_created.append(created)
+            yield (user_id, user_email(i), hashed, rng.choice(levels), False, utc(created))
+
+
+    def _attribute_types(self) -> Iterator[tuple]:
+        rng = self.stream("attributes")
+        names = list(ATTRIBUTES)[:self.attribute_types]
+        names += [f"Topic {n}" for n in range(len(names), self.attribute_types)]
+        self.type_rows = [(new_uuid(rng), name) for name in names]
+        return iter(self.type_rows)
+
+
+    def _attribute_values(self) -> Iterator[tuple]:
+        """
+        The seed vocabularies for the first types; the remaining values are spread over the
+        synthetic types with a long tail (a few large types, many small ones).
+        """
+        rng = self.stream("attribute_values")
+        fixed = [ATTRIBUTES.get(name) for _, name in self.type_rows]
+        synthetic = [i for i, values in enumerate(fixed) if values is None]
+        remaining = max(self.attribute_values - sum(len(values) for values in fixed if values), 0)
+        weights = [1 / (rank + 1) for rank in range(len(synthetic))]
+        sizes = {i: max(2, round(remaining * w / sum(weights))) for i, w in zip(synthetic, weights)}
+
+        self.value_ids_by_type = []
+        for i, (type_id, name) in enumerate(self.type_rows):
+            values = fixed[i] or [f"{name} #{n}" for n in range(sizes[i])]
+            ids = []
+            for value in values:
+                ids.append(new_uuid(rng))
+                yield (ids[-1], type_id, value)
+            self.value_ids_by_type.append(ids)
+
+
+    def catalog(self):
+        """
+        Build the video catalog without yielding it (e.g. to emit HLS trees with no database).
+        """
+        for _ in self.rows("attribute_types"):
+            pass
+        for _ in self.rows("attribute_values"):
+            pass
+        for _ in self.rows("videos"):
+            pass
+
+
+    def _videos(self) -> Iterator[tuple]:
+        """
+        Every video is tagged with a Level value and 1-3 values of other types, picked with a
+        Zipf skew over types and over the values within a type. Links are kept for video_attributes.
+        """
+        rng = self.stream("videos")
+        access_levels = list(AccessLevelEnum)
+        type_cum = zipf_cum_weights(len(self.value_ids_by_type) - 1, 1.0)
+        value_cums = [zipf_cum_weights(len(ids), self.skew) for ids in self.value_ids_by_type]
+        openings, themes = ATTRIBUTES["Opening"], ATTRIBUTES["Theme"]
+        segments_mu = math.log(max(self.max_segments / 3, 1))
+
+        for i in range(self.counts["videos"]):
+            video_id = new_uuid(rng)
+            access_level = int(rng.choices(access_levels, weights=[60, 20, 20])[0])
+            created = towards(rng, self.anchor - VIDEO_HISTORY_DAYS * DAY, self.anchor, 0.5)
+            self.video_ids.append(video_id)
+            self.video_created.append(created)
+            self.video_access.append(access_level)
+            self.video_segments.append(min(self.max_segments, max(3, int(rng.lognormvariate(segments_mu, 0.5)))))
+
+            type_indexes = {0}
+            if type_cum:
+                for _ in range(rng.randint(1, 3)):
+                    type_indexes.add(1 + rng.choices(range(len(type_cum)), cum_weights=type_cum)[0])
+            for t in sorted(type_indexes):
+                value_id = rng.choices(self.value_ids_by_type[t], cum_weights=value_cums[t])[0]
+                self.link_rows.append((new_uuid(rng), video_id, value_id))
+
+            yield (
+                video_id,
+                f"{rng.choice(openings)}: {rng.choice(themes).lower()} #{i}",
+                " ".join(rng.choice(themes) for _ in range(rng.randint(5, 40))),
+                f"{self.base_url}/previews/{video_id}.jpg",
+                f"{self.base_url}/hls/{video_id}/master.m3u8",
+                access_level,
+                Decimal(rng.choice(["4.99", "9.99", "19.99"])) if access_level == AccessLevelEnum.ONE_TIME else None,
+                utc(created),
+            )
+
+
+    def _video_attributes(self) -> Iterator[tuple]:
+        return iter(self.link_rows)
+
+
+    def popularity(self) -> list[int]:
+        """
+        Video indexes from most to least popular; the same order drives views and sales.
+        """
+        order = list(range(len(self.video_ids)))
+        self.stream("popularity").shuffle(order)
+        return order
+
+
+    def activity(self) -> list[int]:
+        """
+        User indexes from most to least active.
+        """
+        order = list(range(len(self.user_ids)))
+        self.stream("activity").shuffle(order)
+        return order
+
+
+    def _views(self) -> Iterator[tuple]:
+        """
+        Views lean towards the last days of the window and the evening hours; a small share is
+        anonymous. A view before its video or user existed is moved into their lifetime.
+        """
+        rng = self.stream("views")
+        videos, users = self.popularity(), self.activity()
+        video_cum = zipf_cum_weights(len(videos), self.skew)
+        user_cum = zipf_cum_weights(len(users), USER_ACTIVITY_SKEW)
+        first_day = (self.anchor // DAY - self.view_days) * DAY
+        hours = range(24)
+
+        remaining = self.counts["views"]
+        while remaining > 0:
+            chunk = min(remaining, 10000)
+            remaining -= chunk
+            picked_videos = rng.choices(videos, cum_weights=video_cum, k=chunk)
+            picked_users = rng.choices(users, cum_weights=user_cum, k=chunk) if users else [None] * chunk
+            picked_hours = rng.choices(hours, cum_weights=HOURLY_CUM_WEIGHTS, k=chunk)
+            for v, u, hour in zip(picked_videos, picked_users, picked_hours):
+                day = self.view_days - 1 - int(self.view_days * (1 - rng.random() ** 0.6))
+                viewed = first_day + day * DAY + (hour + rng.random()) * 3600
+                earliest = self.video_created[v]
+                if u is not None and rng.random() >= ANONYMOUS_VIEW_SHARE:
+                    earliest = max(earliest, self.user_created[u])
+                    user_id = self.user_ids[u]
+                else:
+                    user_id = None
+                if viewed < earliest or viewed >= self.anchor:
+                    viewed = earliest + (self.anchor - earliest) * rng.random()
+                yield (new_uuid(rng), user_id, self.video_ids[v], utc(viewed))
+
+
+    def _purchases(self) -> Iterator[tuple]:
+        """
+        One-time videos only, at most one purchase per (user, video); popular videos and active
+        users account for most sales. Stops early if the pairs run out.
+        """
+        rng = self.stream("purchases")
+        videos = [v for v in self.popularity() if self.video_access[v] == AccessLevelEnum.ONE_TIME]
+        users = self.activity()
+        if not videos or not users:
+            return
+        video_cum = zipf_cum_weights(len(videos), self.skew)
+        user_cum = zipf_cum_weights(len(users), USER_ACTIVITY_SKEW)
+
+        seen: set[int] = set()
+        wanted = min(self.counts["purchases"], len(videos) * len(users))
+        attempts_left = wanted * 20
+        while len(seen) < wanted and attempts_left > 0:
+            chunk = min(wanted - len(seen), 10000)
+            attempts_left -= chunk
+            for v, u in zip(rng.choices(videos, cum_weights=video_cum, k=chunk), rng.choices(users, cum_weights=user_cum, k=chunk)):
+                pair = u * len(self.video_ids) + v
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                earliest = max(self.video_created[v], self.user_created[u])
+                bought = earliest + (self.anchor - earliest) * rng.random()
+                yield (new_uuid(rng), self.user_ids[u], self.video_ids[v], utc(bought))
+
+
+    def _subscriptions(self) -> Iterator[tuple]:
+        """
+        Monthly and yearly plans started any time in a user's lifetime; some are still running.
+        """
+        rng = self.stream("subscriptions")
+        if not self.user_ids:
+            return
+        for _ in range(self.counts["subscriptions"]):
+            u = rng.randrange(len(self.user_ids))
+            started = towards(rng, self.user_created[u], self.anchor, 0.7)
+            days = rng.choice([30, 30, 30, 365])
+            yield (new_uuid(rng), self.user_ids[u], utc(started), utc(started + days * DAY))
+
+
+async def copy_rows(db, table: str, rows: Iterable[tuple], batch_size: int) -> int:
+    """
+    COPY the rows in batches and commit; returns the row count.
+    """
+    conn = await db.connection()
+    raw = (await conn.get_raw_connection()).driver_connection
+    count = 0
+    for batch in batched(rows, batch_size):
+        await raw.copy_records_to_table(table, records=batch, columns=COLUMNS[table])
+        count += len(batch)
+    await db.commit()
+    return count
+
+
+async def ensure_view_partitions(db, first: date, last: date) -> list[str]:
+    """
+    Monthly views partitions from `first` to `last`, so COPY doesn't route the history into views_default.
+    """
+    database = ViewLogDatabase(ViewLogTable)
+    existing = set((await database.get_month_partitions(db)).values())
+    created = []
+    month = date(first.year, first.month, 1)
+    while month <= last:
+        if month not in existing:
+            await database.create_month_partition(db, month)
+            created.append(f"views_{month:%Y_%m}")
+        month = add_months(month, 1)
+    await db.commit()
+    return created
+
+
+async def load(generator: DatasetGenerator, batch_size: int, reset: bool = False):
+    from src.core.database import SessionLocal
+
+    async with SessionLocal() as db:
+        if reset:
+            await db.execute(text(f"TRUNCATE {RESET_TABLES} CASCADE"))
+            await db.commit()
+        elif await db.scalar(text("SELECT EXISTS (SELECT 1 FROM users)")):
+            raise RuntimeError("The users table is not empty, pass --reset to replace its contents")
+
+        anchor = utc(generator.anchor)
+        first_view_day = utc(generator.anchor - generator.view_days * DAY).date()
+        created = await ensure_view_partitions(db, first_view_day, anchor.date())
+        if created:
+            print(f"Created view log partitions {', '.join(created)}")
+
+        for table in generator.TABLES:
+            started = time.perf_counter()
+            count = await copy_rows(db, table, generator.rows(table), batch_size)
+            elapsed = time.perf_counter() - started
+            print(f"  {table:<18}{count:>12,} rows {elapsed:>8.1f}s {count / max(elapsed, 1e-9):>12,.0f} rows/s")
+
+        await db.execute(text(f"ANALYZE {', '.join(generator.TABLES)}"))
+        await db.commit()
+
+
+def hls_objects(generator: DatasetGenerator, segment_bytes: int, limit: Optional[int] = None) -> Iterator[tuple[str, bytes, str]]:
+    """
+    (key, body, content type) of the preview and HLS tree of each video, laid out like
+    VideoService uploads: previews/<id>.jpg, hls/<id>/master.m3u8 and hls/<id>/master<n>.ts.
+    """
+    segment = TS_NULL_PACKET * max(1, segment_bytes // len(TS_NULL_PACKET))
+    for video_id, segments in islice(zip(generator.video_ids, generator.video_segments), limit):
+        playlist = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{HLS_SEGMENT_SECONDS}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+        ]
+        for n in range(segments):
+            playlist += [f"#EXTINF:{HLS_SEGMENT_SECONDS}.000000,", f"master{n}.ts"]
+        playlist.append("#EXT-X-ENDLIST")
+
+        yield f"previews/{video_id}.jpg", PREVIEW_PLACEHOLDER, "image/jpeg"
+        yield f"hls/{video_id}/master.m3u8", ("\n".join(playlist) + "\n").encode(), "application/vnd.apple.mpegurl"
+        for n in range(segments):
+            yield f"hls/{video_id}/master{n}.ts", segment, "video/mp2t"
+
+
+def write_objects(directory: str, objects: Iterable[tuple[str, bytes, str]]) -> int:
+    count = 0
+    for key, body, _ in objects:
+        path = os.path.join(directory, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(body)
+        count += 1
+    return count
+
+
+def upload_objects(objects: Iterable[tuple[str, bytes, str]], workers: int) -> int:
+    import boto3
+    from concurrent.futures import ThreadPoolExecutor
+
+    config = get_config()
+    s3 = boto3.client(
+        "s3",
+        region_name=config.SPACES_REGION,
+        endpoint_url=config.SPACES_ENDPOINT,
+        aws_access_key_id=config.SPACES_KEY,
+        aws_secret_access_key=config.SPACES_SECRET,
+    )
+
+    def put(obj: tuple[str, bytes, str]):
+        key, body, content_type = obj
+        s3.put_object(Bucket=config.SPACES_BUCKET, Key=key, Body=body, ContentType=content_type)
+
+    count = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hls-upload") as executor:
+        for batch in batched(objects, workers * 50):
+            list(executor.map(put, batch))
+            count += len(batch)
+    return count
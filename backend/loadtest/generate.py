@@ -0,0 +1,117 @@
+"""
+Synthetic dataset generator for scale testing: bulk-loads configurable volumes into the schema
+with COPY (see loadtest/dataset.py for the distributions). Seeded: the same options and --anchor
+give the same rows. Accounts are the loadtest.seed ones, so `loadtest.run` can be pointed at the
+result (it skips its own seeding when the seed admin exists).
+
+With --hls-dir or --hls-upload each video also gets the objects its URLs point at: a preview,
+hls/<id>/master.m3u8 and fake master<n>.ts segments. --hls-dir writes them in bucket layout
+(`mc mirror DIR local/loadtest` copies them into the MinIO stand-in), --hls-upload puts them
+into SPACES_BUCKET. --skip-db only rebuilds the catalog to emit these.
+
+App settings come from loadtest/loadtest.env (variables already set in the environment win).
+Migrations must be applied; the view log history must fit VIEW_LOG_RETENTION_MONTHS or
+partition maintenance drops it.
+
+Usage (from backend/):
+    python -m loadtest.generate --reset
+    python -m loadtest.generate --reset --users 10000 --videos 2000 --views 200000 --purchases 20000 --rollup
+    python -m loadtest.generate --skip-db --videos 2000 --hls-dir /tmp/loadtest-bucket
+"""
+import sys
+import time
+import asyncio
+import argparse
+from datetime import date, datetime, timezone
+
+from loadtest.run import ENV_FILE, load_env
+
+
+async def run(args) -> int:
+    # Imported after the env file is loaded: src reads its settings at import time
+    from src.core.dependencies import get_config
+    from loadtest.dataset import DatasetGenerator, hls_objects, load, upload_objects, write_objects
+
+    anchor = datetime.combine(args.anchor, datetime.min.time(), tzinfo=timezone.utc)
+    retention_days = get_config().VIEW_LOG_RETENTION_MONTHS * 30
+    if args.view_days > retention_days:
+        print(f"Warning: {args.view_days} days of views exceed VIEW_LOG_RETENTION_MONTHS, "
+              f"partition maintenance will drop the oldest")
+
+    generator = DatasetGenerator(
+        seed=args.seed,
+        anchor=anchor,
+        users=args.users,
+        videos=args.videos,
+        attribute_types=args.attribute_types,
+        attribute_values=args.attribute_values,
+        views=args.views,
+        purchases=args.purchases,
+        subscriptions=args.subscriptions,
+        view_days=args.view_days,
+        skew=args.skew,
+        max_segments=args.max_segments,
+    )
+
+    if args.skip_db:
+        generator.catalog()
+    else:
+        print(f"Loading dataset (seed {args.seed}, anchor {args.anchor})...")
+        started = time.perf_counter()
+        await load(generator, args.batch_size, reset=args.reset)
+        print(f"Loaded in {time.perf_counter() - started:.1f}s")
+
+        if args.rollup:
+            from src.modules.views.dependencies import get_view_rollup_service
+            started = time.perf_counter()
+            steps = await get_view_rollup_service().run_rollup()
+            print(f"View rollups caught up in {steps} steps ({time.perf_counter() - started:.1f}s)")
+
+    limit = args.hls_videos if args.hls_videos is not None else len(generator.video_ids)
+    if args.hls_dir:
+        started = time.perf_counter()
+        count = write_objects(args.hls_dir, hls_objects(generator, args.segment_bytes, limit))
+        print(f"Wrote {count:,} objects for {limit:,} videos to {args.hls_dir} in {time.perf_counter() - started:.1f}s")
+    if args.hls_upload:
+        started = time.perf_counter()
+        count = upload_objects(hls_objects(generator, args.segment_bytes, limit), args.hls_workers)
+        print(f"Uploaded {count:,} objects for {limit:,} videos in {time.perf_counter() - started:.1f}s")
+
+    from src.core.database import engine
+    await engine.dispose()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--videos", type=int, default=100_000)
+    parser.add_argument("--attribute-types", type=int, default=50)
+    parser.add_argument("--attribute-values", type=int, default=5000, help="total over all types")
+    parser.add_argument("--views", type=int, default=10_000_000)
+    parser.add_argument("--purchases", type=int, default=2_000_000)
+    parser.add_argument("--subscriptions", type=int, default=200_000)
+    parser.add_argument("--view-days", type=int, default=180, help="days of view log history before the anchor")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of video popularity and value usage")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor", type=date.fromisoformat, default=datetime.now(timezone.utc).date(),
+                        help="UTC day the data ends at, YYYY-MM-DD (default: today); fix it for identical reruns")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="rows per COPY")
+    parser.add_argument("--reset", action="store_true", help="truncate users, catalog, views and sales first")
+    parser.add_argument("--rollup", action="store_true", help="fold the generated views into the hourly/daily rollups")
+    parser.add_argument("--skip-db", action="store_true", help="don't touch the database, only emit HLS objects")
+    parser.add_argument("--hls-dir", help="write fake preview/HLS objects under this directory")
+    parser.add_argument("--hls-upload", action="store_true", help="upload fake preview/HLS objects to SPACES_BUCKET")
+    parser.add_argument("--hls-videos", type=int, help="emit objects for the first N videos only")
+    parser.add_argument("--hls-workers", type=int, default=16)
+    parser.add_argument("--max-segments", type=int, default=120, help="upper bound of segments per video")
+    parser.add_argument("--segment-bytes", type=int, default=1880)
+    parser.add_argument("--env-file", default=ENV_FILE)
+    args = parser.parse_args()
+
+    load_env(args.env_file)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Load test: brings up local stand-ins (Postgres, MinIO for Spaces), migrates and seeds them,
+starts the app with uvicorn, drives a mixed workload and reports throughput and
+p50/p95/p99 latency per endpoint. With --baseline the run is compared against stored
+results and the exit code is 1 when an endpoint regressed beyond --tolerance.
+Runs that are compared should use the same sizes, mix and machine, and --reset so uploads
+from earlier runs don't grow the catalog.
+
+App settings come from loadtest/loadtest.env (variables already set in the environment win).
+The upload scenario needs ffmpeg on the PATH (to make a sample clip and for the app itself).
+The driver's own dependencies are in requirements-dev.txt (pip install -r requirements-dev.txt).
+
+Usage (from backend/):
+    python -m loadtest.run --start-stack --users 50 --duration 60 --save-baseline loadtest/baseline.json
+    python -m loadtest.run --users 50 --duration 60 --baseline loadtest/baseline.json
+    python -m loadtest.run --mix trending=5,view=10 --workers 4 --output results.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from typing import Optional
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(HERE)
+COMPOSE_FILE = os.path.join(HERE, "docker-compose.yml")
+ENV_FILE = os.path.join(HERE, "loadtest.env")
+
+
+def load_env(path: str) -> dict[str, str]:
+    env = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                key, _, value = line.partition("=")
+                env[key.strip()] = value.strip()
+    for key, value in env.items():
+        os.environ.setdefault(key, value)
+    return {key: os.environ[key] for key in env}
+
+
+def start_stack():
+    print("Starting Postgres and MinIO stand-ins...")
+    subprocess.run(["docker", "compose", "-f", COMPOSE_FILE, "up", "-d", "--wait"], check=True)
+
+
+def migrate():
+    print("Applying migrations...")
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=BACKEND, check=True)
+
+
+def make_sample_clip(directory: str) -> Optional[str]:
+    if shutil.which("ffmpeg") is None:
+        return None
+    path = os.path.join(directory, "sample.mp4")
+    subprocess.run(
+        ["ffmpeg", "-loglevel", "error", "-y", "-f", "lavfi", "-i", "testsrc=duration=4:size=640x360:rate=25",
+         "-c:v", "libx264", "-pix_fmt", "yuv420p", path],
+        check=True,
+    )
+    return path
+
+
+def start_app(port: int, workers: int) -> subprocess.Popen:
+    print(f"Starting the app on port {port} with {workers} worker(s)...")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--no-access-log"],
+        cwd=BACKEND,
+    )
+
+
+def wait_until_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/openapi.json", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"The app did not come up at {base_url} within {timeout:.0f}s")
+
+
+def print_report(results: dict[str, dict], duration: float):
+    total = sum(stats["requests"] for stats in results.values())
+    errors = sum(stats["errors"] for stats in results.values())
+    print(f"\n{total} requests in {duration:.1f}s ({total / duration:.1f} req/s), {errors} errors")
+    print(f"{'endpoint':<32}{'requests':>10}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for endpoint, stats in results.items():
+        print(
+            f"{endpoint:<32}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>9.1f}"
+            f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}"
+        )
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """
+    Regressions against the baseline: p95 or p99 slower, throughput lower, or error rate
+    higher by more than `tolerance`. Endpoints with too few requests are skipped.
+    """
+    regressions = []
+    for endpoint, old in baseline.items():
+        new = results.get(endpoint)
+        if new is None or old["requests"] < 20 or new["requests"] < 20:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            if new[key] > old[key] * (1 + tolerance):
+                regressions.append(f"{endpoint}: {key} {old[key]:.1f} -> {new[key]:.1f}")
+        if new["rps"] < old["rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: req/s {old['rps']:.1f} -> {new['rps']:.1f}")
+        old_rate, new_rate = old["errors"] / old["requests"], new["errors"] / new["requests"]
+        if new_rate > old_rate + tolerance / 10:
+            regressions.append(f"{endpoint}: error rate {old_rate:.2%} -> {new_rate:.2%}")
+    return regressions
+
+
+async def run(args) -> int:
+    # Imported after the env file is loaded: src reads its settings at import time
+    from loadtest.seed import seed
+    from loadtest.workload import DEFAULT_MIX, Workload, parse_mix
+
+    mix = parse_mix(args.mix) if args.mix else dict(DEFAULT_MIX)
+
+    print(f"Seeding {args.seed_users} users and {args.seed_videos} videos...")
+    video_ids = await seed(args.seed_users, args.seed_videos, reset=args.reset)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        upload_file = make_sample_clip(tmpdir) if mix.get("upload") else None
+        if mix.get("upload") and upload_file is None:
+            print("ffmpeg not found, leaving the upload scenario out")
+            mix.pop("upload")
+
+        app = None
+        base_url = args.base_url or f"http://127.0.0.1:{args.port}"
+        try:
+            if not args.base_url:
+                app = start_app(args.port, args.workers)
+            wait_until_ready(base_url)
+
+            print(f"Running {args.users} virtual users for {args.duration:g}s (+{args.warmup:g}s warm-up), mix {mix}")
+            workload = Workload(base_url, args.users, args.seed_users, video_ids, mix, upload_file)
+            results, measured = await workload.run(args.duration, args.warmup)
+        finally:
+            if app is not None:
+                app.terminate()
+                app.wait(timeout=30)
+
+    print_report(results, measured)
+    report = {
+        "settings": {
+            "users": args.users, "duration": args.duration, "workers": args.workers, "mix": mix,
+            "seed_users": args.seed_users, "seed_videos": args.seed_videos,
+            "python": platform.python_version(), "machine": platform.node(),
+        },
+        "duration": measured,
+        "endpoints": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["endpoints"], args.tolerance)
+        if regressions:
+            print(f"\nREGRESSIONS against {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=10, help="unrecorded seconds before measuring")
+    parser.add_argument("--mix", help="scenario weights, e.g. login=1,trending=6,view=8 (default: built-in mix)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--base-url", help="test an already running app instead of starting one")
+    parser.add_argument("--seed-users", type=int, default=1000)
+    parser.add_argument("--seed-videos", type=int, default=5000)
+    parser.add_argument("--reset", action="store_true", help="truncate and reseed the catalog")
+    parser.add_argument("--start-stack", action="store_true", help="docker compose up the stand-ins first")
+    parser.add_argument("--skip-migrate", action="store_true")
+    parser.add_argument("--env-file", default=ENV_FILE)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--save-baseline", help="store this run's results as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    load_env(args.env_file)
+    if args.start_stack:
+        start_stack()
+    if not args.skip_migrate:
+        migrate()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Seeds a realistic catalog for load tests: users (one of them admin), attribute types and
+values, and videos with 2-4 attribute values each. Ids and values come from a fixed random
+seed and timestamps count back from the start of the current UTC day, so two runs with the same
+sizes on the same day produce the same rows (the bcrypt salt aside). A no-op when the seed admin
+already exists, unless `reset` truncates the catalog first.
+"""
+import random
+from uuid import UUID
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
+from passlib.context import CryptContext
+from sqlalchemy import func, insert, select, text
+
+from src.core.database import SessionLocal
+from src.core.dependencies import get_config
+from src.models import (
+    AccessLevelEnum,
+    AttributeTypeTable,
+    AttributeValueTable,
+    UserTable,
+    VideoAttributeLinkTable,
+    VideoTable,
+)
+
+PASSWORD = "loadtest-password"
+ADMIN_EMAIL = "admin@loadtest.local"
+
+ATTRIBUTES = {
+    "Level": ["Beginner", "Intermediate", "Advanced", "Master"],
+    "Opening": [
+        "Sicilian Defense", "Ruy Lopez", "Queen's Gambit", "King's Indian Defense",
+        "French Defense", "Caro-Kann", "English Opening", "Italian Game",
+    ],
+    "Theme": ["Tactics", "Endgames", "Strategy", "Calculation", "Opening Theory", "Middlegame Plans"],
+    "Format": ["Lecture", "Game Analysis", "Puzzle Rush", "Q&A"],
+}
+
+
+def new_uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def user_email(i: int) -> str:
+    return f"user{i}@loadtest.local"
+
+
+async def insert_batches(db, table, rows: list[dict], batch_size: int):
+    for start in range(0, len(rows), batch_size):
+        await db.execute(insert(table), rows[start:start + batch_size])
+
+
+async def seed(users: int, videos: int, reset: bool = False, batch_size: int = 1000) -> list[UUID]:
+    """
+    Returns the ids of the seeded videos.
+    """
+    rng = random.Random(42)
+    config = get_config()
+
+    async with SessionLocal() as db:
+        if reset:
+            await db.execute(text("TRUNCATE users, videos, attribute_types, revoked_tokens CASCADE"))
+            await db.commit()
+
+        seeded = await db.scalar(select(func.count()).select_from(UserTable).where(UserTable.email == ADMIN_EMAIL))
+        if seeded:
+            result = await db.execute(select(VideoTable.id))
+            return list(result.scalars().all())
+
+        # One hash for everybody: logins still pay the full bcrypt verification
+        hashed = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=config.BCRYPT_ROUNDS).hash(PASSWORD)
+        levels = ATTRIBUTES["Level"]
+        now = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        user_rows = [{
+            "id": new_uuid(rng), "email": ADMIN_EMAIL, "hashed_password": hashed,
+            "chess_level": "Master", "is_admin": True, "created_at": now,
+        }]
+        user_rows += [{
+            "id": new_uuid(rng), "email": user_email(i), "hashed_password": hashed,
+            "chess_level": rng.choice(levels), "is_admin": False,
+            "created_at": now - timedelta(days=rng.randint(0, 720)),
+        } for i in range(users)]
+        await insert_batches(db, UserTable, user_rows, batch_size)
+
+        values_by_type: dict[str, list[UUID]] = {}
+        for type_name, values in ATTRIBUTES.items():
+            type_id = new_uuid(rng)
+            await db.execute(insert(AttributeTypeTable).values(id=type_id, name=type_name))
+            value_rows = [{"id": new_uuid(rng), "type_id": type_id, "value": value} for value in values]
+            await db.execute(insert(AttributeValueTable), value_rows)
+            values_by_type[type_name] = [row["id"] for row in value_rows]
+
+        base_url = f"{config.SPACES_ENDPOINT}/{config.SPACES_BUCKET}"
+        video_rows, link_rows = [], []
+        for i in range(videos):
+            video_id = new_uuid(rng)
+            access_level = rng.choices(list(AccessLevelEnum), weights=[60, 20, 20])[0]
+            video_rows.append({
+                "id": video_id,
+                "title": f"{rng.choice(ATTRIBUTES['Opening'])}: {rng.choice(ATTRIBUTES['Theme']).lower()} #{i}",
+                "description": " ".join(rng.choice(ATTRIBUTES["Theme"]) for _ in range(rng.randint(5, 40))),
+                "preview_url": f"{base_url}/previews/{video_id}.jpg",
+                "hls_url": f"{base_url}/hls/{video_id}/master.m3u8",
+                "access_level": int(access_level),
+                "price": Decimal(rng.choice(["4.99", "9.99", "19.99"])) if access_level == AccessLevelEnum.ONE_TIME else None,
+                "created_at": now - timedelta(minutes=rng.randint(0, 525600)),
+            })
+            chosen = [rng.choice(values_by_type["Level"]), rng.choice(values_by_type["Theme"])]
+            for optional in ("Opening", "Format"):
+                if rng.random() < 0.5:
+                    chosen.append(rng.choice(values_by_type[optional]))
+            link_rows += [{"id": new_uuid(rng), "video_id": video_id, "attribute_value_id": value_id} for value_id in chosen]
+
+        await insert_batches(db, VideoTable, video_rows, batch_size)
+        await insert_batches(db, VideoAttributeLinkTable, link_rows, batch_size)
+        await db.commit()
+        return [row["id"] for row in video_rows]
@@ -0,0 +1,211 @@
+"""
+Mixed workload driver: `users` virtual users, each logged in as its own seeded account,
+run scenarios picked by weight back to back (no think time) until the duration is over.
+Latencies are recorded per endpoint; responses with status >= 400 count as errors.
+"""
+import math
+import time
+import random
+import asyncio
+from uuid import UUID
+from typing import Optional
+from dataclasses import dataclass, field
+
+import httpx
+
+from loadtest.seed import ADMIN_EMAIL, PASSWORD, user_email
+
+DEFAULT_MIX = {
+    "login": 1,
+    "refresh": 2,
+    "list_videos": 4,
+    "trending": 6,
+    "most_watched": 3,
+    "view": 8,
+    "upload": 0.05,
+}
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown scenario {name!r}, expected one of {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # nearest rank
+    rank = min(len(sorted_values), max(1, math.ceil(q * len(sorted_values)))) - 1
+    return sorted_values[rank]
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    def summary(self, duration: float) -> dict:
+        values = sorted(self.latencies)
+        return {
+            "requests": len(values),
+            "errors": self.errors,
+            "rps": len(values) / duration if duration else 0.0,
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p95_ms": percentile(values, 0.95) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+            "max_ms": (values[-1] * 1000) if values else 0.0,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+        }
+
+
+class Recorder:
+    def __init__(self):
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.recording = False
+
+    async def request(self, client: httpx.AsyncClient, endpoint: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        elapsed = time.perf_counter() - started
+        if self.recording:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.latencies.append(elapsed)
+            status = response.status_code if response is not None else 0
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if response is None or response.status_code >= 400:
+                stats.errors += 1
+        return response
+
+
+class Session:
+    """
+    Tokens of one account; logs in again whenever a refresh is rejected.
+    """
+
+    def __init__(self, email: str):
+        self.email = email
+        self.access_token: Optional[str] = None
+        self.refresh_token: Optional[str] = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+    async def login(self, client: httpx.AsyncClient, recorder: Recorder) -> bool:
+        response = await recorder.request(
+            client, "POST /auth/login", "POST", "/auth/login",
+            data={"username": self.email, "password": PASSWORD},
+        )
+        if response is None or response.status_code != 200:
+            return False
+        tokens = response.json()
+        self.access_token, self.refresh_token = tokens["access_token"], tokens["refresh_token"]
+        return True
+
+
+    async def refresh(self, client: httpx.AsyncClient, recorder: Recorder) -> bool:
+        response = await recorder.request(
+            client, "POST /auth/token/refresh", "POST", "/auth/token/refresh",
+            headers={"Authorization": f"Bearer {self.refresh_token}"},
+        )
+        if response is None or response.status_code != 200:
+            return await self.login(client, recorder)
+        self.access_token = response.json()["access_token"]
+        return True
+
+
+class Workload:
+    def __init__(
+        self,
+        base_url: str,
+        users: int,
+        seeded_users: int,
+        video_ids: list[UUID],
+        mix: dict[str, float],
+        upload_file: Optional[str] = None,
+        timeout: float = 30.0,
+    ):
+        self.base_url = base_url
+        self.users = users
+        self.seeded_users = seeded_users
+        self.video_ids = video_ids
+        self.mix = {name: weight for name, weight in mix.items() if weight > 0}
+        self.upload_file = upload_file
+        self.timeout = timeout
+        self.recorder = Recorder()
+        self.admin = Session(ADMIN_EMAIL)
+
+    async def scenario(self, name: str, client: httpx.AsyncClient, session: Session, rng: random.Random):
+        request = self.recorder.request
+        if name == "login":
+            await session.login(client, self.recorder)
+        elif name == "refresh":
+            await session.refresh(client, self.recorder)
+        elif name == "list_videos":
+            skip = rng.randrange(0, max(len(self.video_ids) - 50, 1))
+            await request(client, "GET /admin/videos/", "GET", "/admin/videos/",
+                          params={"skip": skip, "limit": 50}, headers=self.admin.headers)
+        elif name == "trending":
+            await request(client, "GET /videos/trending", "GET", "/videos/trending",
+                          params={"limit": 20}, headers=session.headers)
+        elif name == "most_watched":
+            await request(client, "GET /videos/most-watched", "GET", "/videos/most-watched",
+                          params={"period": rng.choice(["day", "week", "month"]), "limit": 20}, headers=session.headers)
+        elif name == "view":
+            video_id = rng.choice(self.video_ids)
+            await request(client, "POST /videos/{video_id}/views", "POST", f"/videos/{video_id}/views",
+                          headers=session.headers)
+        elif name == "upload":
+            with open(self.upload_file, "rb") as video, open(self.upload_file, "rb") as preview:
+                await request(
+                    client, "POST /admin/videos/", "POST", "/admin/videos/",
+                    data={"title": f"Load test upload {rng.random():.6f}", "access_level": "0"},
+                    files={"video_file": ("video.mp4", video, "video/mp4"), "preview_file": ("preview.jpg", preview, "image/jpeg")},
+                    headers=self.admin.headers,
+                )
+
+
+    async def virtual_user(self, index: int, client: httpx.AsyncClient, deadline: float):
+        rng = random.Random(index)
+        session = Session(user_email(index % self.seeded_users))
+        if not await session.login(client, self.recorder):
+            return
+        names, weights = list(self.mix), list(self.mix.values())
+        while time.monotonic() < deadline:
+            await self.scenario(rng.choices(names, weights)[0], client, session, rng)
+
+
+    async def run(self, duration: float, warmup: float = 0.0) -> tuple[dict[str, dict], float]:
+        """
+        Returns per-endpoint summaries and the measured duration. Requests made during
+        `warmup` (connection set-up, cold caches) are not recorded.
+        """
+        limits = httpx.Limits(max_connections=self.users + 1, max_keepalive_connections=self.users + 1)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits) as client:
+            if not await self.admin.login(client, self.recorder):
+                raise RuntimeError("Could not log in as the seeded admin, is the database seeded?")
+
+            started = time.monotonic()
+            deadline = started + warmup + duration
+            tasks = [asyncio.create_task(self.virtual_user(i, client, deadline)) for i in range(self.users)]
+            await asyncio.sleep(warmup)
+            self.recorder.recording = True
+            measured_from = time.monotonic()
+            await asyncio.gather(*tasks)
+            measured = time.monotonic() - measured_from
+
+        return {
+            endpoint: stats.summary(measured)
+            for endpoint, stats in sorted(self.recorder.endpoints.items())
+        }, measured
@@ -9,17 +9,91 @@ class Config:
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 43200
     SECRET_KEY: str = os.getenv("SECRET_KEY")
+    JWT_DECODE_CACHE_SIZE: int = int(os.getenv("JWT_DECODE_CACHE_SIZE", "10000"))
+    REVOCATION_SYNC_INTERVAL: float = float(os.getenv("REVOCATION_SYNC_INTERVAL", "5"))
+    REVOCATION_PRUNE_INTERVAL: int = int(os.getenv("REVOCATION_PRUNE_INTERVAL", "3600"))
+    REVOCATION_FILTER_CAPACITY: int = int(os.getenv("REVOCATION_FILTER_CAPACITY", "100000"))
+    REVOCATION_FILTER_ERROR_RATE: float = float(os.getenv("REVOCATION_FILTER_ERROR_RATE", "0.001"))
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_QUEUE: int = int(os.getenv("PASSWORD_HASH_QUEUE", "32"))
+    AUTH_IP_RATE: float = float(os.getenv("AUTH_IP_RATE", "30"))  # attempts per minute
+    AUTH_IP_BURST: int = int(os.getenv("AUTH_IP_BURST", "10"))
+    AUTH_ACCOUNT_RATE: float = float(os.getenv("AUTH_ACCOUNT_RATE", "5"))
+    AUTH_ACCOUNT_BURST: int = int(os.getenv("AUTH_ACCOUNT_BURST", "5"))
+    AUTH_RATE_LIMIT_KEYS: int = int(os.getenv("AUTH_RATE_LIMIT_KEYS", "100000"))
+    TRUST_FORWARDED_FOR: bool = os.getenv("TRUST_FORWARDED_FOR", "false").lower() == "true"
+    PRINCIPAL_CACHE_TTL: float = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
 
     # === GENERAL SETTINGS ===
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
     ALLOWED_HOSTS: list[str] = os.getenv("ALLOWED_HOSTS", "").split(",")
 
+    # === LOGGING ===
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")  # text | json
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_SAMPLE_THRESHOLD: int = int(os.getenv("LOG_SAMPLE_THRESHOLD", "100"))  # records per second per logger and level, 0 = off
+    LOG_SAMPLE_RATE: int = int(os.getenv("LOG_SAMPLE_RATE", "10"))  # above the threshold keep 1 in N
+
+    # === METRICS ===
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"  # false: nothing is recorded and /metrics is not served
+
+    # === TRACING ===
+    TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", "0"))  # share of traces recorded, 0 = off
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "traces/spans.jsonl")
+    TRACE_FILE_MAX_BYTES: int = int(os.getenv("TRACE_FILE_MAX_BYTES", str(50 * 1024 * 1024)))
+    TRACE_FILE_BACKUPS: int = int(os.getenv("TRACE_FILE_BACKUPS", "5"))
+    TRACE_QUEUE_SIZE: int = int(os.getenv("TRACE_QUEUE_SIZE", "10000"))
+
+    # === PROFILER ===
+    PROFILER_MAX_SECONDS: float = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+
+    # === SERVER-TIMING ===
+    SERVER_TIMING: str = os.getenv("SERVER_TIMING", "admin")  # off | admin | all
+
+    # === HTTP CACHING ===
+    METADATA_CACHE_CONTROL: str = os.getenv("METADATA_CACHE_CONTROL", "private, max-age=60")
+    CACHE_VARY: str = os.getenv("CACHE_VARY", "Authorization")
+
+    # === COMPRESSION ===
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_ENCODINGS: list[str] = os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", "1"))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "4"))
+    ZSTD_LEVEL: int = int(os.getenv("ZSTD_LEVEL", "3"))
+
     # === DATABASE ===
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DB_POOL_WARM_CONNECTIONS: int = int(os.getenv("DB_POOL_WARM_CONNECTIONS", "5"))
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
 
     # === STORAGE ===
     SPACES_KEY: str = os.getenv("SPACES_KEY")
     SPACES_SECRET: str = os.getenv("SPACES_SECRET")
     SPACES_REGION: str = os.getenv("SPACES_REGION")
     SPACES_BUCKET: str = os.getenv("SPACES_BUCKET")
-    SPACES_ENDPOINT: str = os.getenv("SPACES_ENDPOINT")
\ No newline at end of file
+    SPACES_ENDPOINT: str = os.getenv("SPACES_ENDPOINT")
+    STORAGE_WARM_UP: bool = os.getenv("STORAGE_WARM_UP", "true").lower() == "true"
+
+    # === VIEW LOG ===
+    VIEW_LOG_FLUSH_SIZE: int = int(os.getenv("VIEW_LOG_FLUSH_SIZE", "500"))
+    VIEW_LOG_FLUSH_INTERVAL: float = float(os.getenv("VIEW_LOG_FLUSH_INTERVAL", "2"))
+    VIEW_LOG_BUFFER_LIMIT: int = int(os.getenv("VIEW_LOG_BUFFER_LIMIT", "50000"))
+    VIEW_LOG_RETENTION_MONTHS: int = int(os.getenv("VIEW_LOG_RETENTION_MONTHS", "12"))
+    VIEW_LOG_PARTITIONS_AHEAD: int = int(os.getenv("VIEW_LOG_PARTITIONS_AHEAD", "2"))
+    VIEW_LOG_MAINTENANCE_INTERVAL: int = int(os.getenv("VIEW_LOG_MAINTENANCE_INTERVAL", "3600"))
+
+    # === VIEW ROLLUPS / RANKINGS ===
+    VIEW_ROLLUP_INTERVAL: int = int(os.getenv("VIEW_ROLLUP_INTERVAL", "60"))
+    # Seconds, must exceed the view log flush delay. Views committed more than this after their
+    # viewed_at (e.g. a buffer retrying through a database outage) may already be behind the rollup
+    # watermark: they stay in the log and export but are never counted in the rollups.
+    VIEW_ROLLUP_LAG: int = int(os.getenv("VIEW_ROLLUP_LAG", "120"))
+    VIEW_ROLLUP_STEP_HOURS: int = int(os.getenv("VIEW_ROLLUP_STEP_HOURS", "6"))
+    TRENDING_WINDOW_HOURS: int = int(os.getenv("TRENDING_WINDOW_HOURS", "72"))
+    TRENDING_HALF_LIFE_HOURS: float = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+
+    # === ENTITLEMENTS ===
+    ENTITLEMENT_CACHE_TTL: float = float(os.getenv("ENTITLEMENT_CACHE_TTL", "30"))
+    ENTITLEMENT_CACHE_SIZE: int = int(os.getenv("ENTITLEMENT_CACHE_SIZE", "10000"))
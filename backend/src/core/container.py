@@ -0,0 +1,56 @@
+from typing import Awaitable, Callable
+
+from src.core.logger import logger
+
+Hook = Callable[[], Awaitable[None]]
+
+
+class Container:
+    """
+    Application-lifetime services.
+    Providers are the lru_cache'd `get_*` dependency factories: building them once at startup
+    means every request gets the same instances, and clearing them at shutdown lets a new
+    lifespan (tests, reloads) start from a clean graph.
+    Startup hooks run in registration order, shutdown hooks in reverse.
+    """
+
+    def __init__(self):
+        self._providers: list[Callable] = []
+        self._startup: list[Hook] = []
+        self._shutdown: list[Hook] = []
+        self.started = False
+
+    def provide(self, *providers: Callable):
+        for provider in providers:
+            if not hasattr(provider, "cache_clear"):
+                raise TypeError(f"{provider.__name__} must be wrapped in lru_cache to be shared")
+            self._providers.append(provider)
+
+
+    def on_startup(self, hook: Hook):
+        self._startup.append(hook)
+
+
+    def on_shutdown(self, hook: Hook):
+        self._shutdown.append(hook)
+
+
+    async def start(self):
+        for provider in self._providers:
+            provider()
+        for hook in self._startup:
+            await hook()
+        self.started = True
+        logger.info(f"Container started: {len(self._providers)} services")
+
+
+    async def stop(self):
+        for hook in reversed(self._shutdown):
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"Shutdown hook {hook.__qualname__} failed: {e}")
+        for provider in self._providers:
+            provider.cache_clear()
+        self.started = False
+        logger.info("Container stopped")
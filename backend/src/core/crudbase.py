@@ -1,12 +1,13 @@
 from pydantic import BaseModel
 from fastapi import HTTPException
-from typing import Any, Generic, Optional, Type, TypeVar, Union
+from typing import Any, AsyncIterator, Generic, Optional, Type, TypeVar, Union
 
-from sqlalchemy import select, func
+from sqlalchemy import Row, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database import Base
 from src.core.logger import logger
+from src.core.tracing import traced
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -41,11 +42,12 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return obj
 
 
+    @traced("crud.create")
     async def create(self, db: AsyncSession, obj_in: Union[CreateSchemaType, dict[str, Any]]) -> ModelType:
         """
         Create a new object from input schema or dict.
         """
-        logger.debug(f"Creating {self.model.__name__} with data: {obj_in}")
+        logger.debug("Creating %s with data: %s", self.model.__name__, obj_in)
         obj_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump()
         db_obj = self.model(**obj_data)
         db.add(db_obj)
@@ -53,6 +55,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return db_obj
 
 
+    @traced("crud.get")
     async def get(
         self, 
         db: AsyncSession, 
@@ -64,7 +67,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         If options are provided, loads related objects (e.g. selectinload()).
         Raises 404 if not found.
         """
-        logger.debug(f"Fetching {self.model.__name__} by primary key id={id} with options={options}")
+        logger.debug("Fetching %s by primary key id=%s with options=%s", self.model.__name__, id, options)
 
         if options:
             stmt = select(self.model).options(*options).filter_by(id=id)
@@ -76,6 +79,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return self._raise_not_found_if_empty(obj, id=id)
 
 
+    @traced("crud.get_multi")
     async def get_multi(
         self,
         db: AsyncSession,
@@ -88,7 +92,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Supports loading related objects if options are provided.
         Returns an empty list if none found.
         """
-        logger.debug(f"Fetching multiple {self.model.__name__} entries: skip={skip}, limit={limit}, options={options}")
+        logger.debug("Fetching multiple %s entries: skip=%s, limit=%s, options=%s", self.model.__name__, skip, limit, options)
 
         stmt = select(self.model).offset(skip).limit(limit)
         if options:
@@ -98,6 +102,77 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return result.scalars().all()
         
 
+    @traced("crud.get_multi_projected")
+    async def get_multi_projected(
+        self,
+        db: AsyncSession,
+        columns: list[str],
+        skip: int = 0,
+        limit: int = 100,
+        **kwargs
+    ) -> list[Row]:
+        """
+        Retrieve multiple rows (paginated) selecting only the given columns.
+        Runs a Core select on the table: rows are plain tuples with attribute access,
+        no ORM instances are built and nothing is added to the session identity map.
+        Optional keyword arguments filter by column; list values match any of their items (IN).
+        Raises 400 if any column or field is invalid.
+        """
+        table = self.model.__table__
+        invalid_fields = [k for k in [*columns, *kwargs] if k not in table.columns]
+        if invalid_fields:
+            raise HTTPException(status_code=400, detail=f"Invalid field(s): {', '.join(invalid_fields)}")
+        logger.debug("Fetching projected %s rows: columns=%s, skip=%s, limit=%s, filters=%s", self.model.__name__, columns, skip, limit, kwargs)
+
+        stmt = select(*(table.c[name] for name in columns)).offset(skip).limit(limit)
+        for field, value in kwargs.items():
+            column = table.c[field]
+            stmt = stmt.where(column.in_(value) if isinstance(value, (list, tuple, set)) else column == value)
+
+        result = await db.execute(stmt)
+        return result.all()
+
+
+    async def stream(
+        self,
+        db: AsyncSession,
+        columns: Optional[list[str]] = None,
+        batch_size: int = 1000,
+        where: Optional[list[Any]] = None,
+        **kwargs
+    ) -> AsyncIterator[Row]:
+        """
+        Iterate over rows through a server-side cursor, `batch_size` rows per round trip.
+        Memory stays constant however large the table is; rows are Core rows of `columns`
+        (all columns by default). Keyword filters work as in get_multi_projected,
+        `where` takes extra SQL expressions (e.g. ranges).
+        The session's transaction stays open until iteration ends.
+        Raises 400 if any column or field is invalid.
+        """
+        table = self.model.__table__
+        columns = columns or [column.name for column in table.columns]
+        invalid_fields = [k for k in [*columns, *kwargs] if k not in table.columns]
+        if invalid_fields:
+            raise HTTPException(status_code=400, detail=f"Invalid field(s): {', '.join(invalid_fields)}")
+        logger.debug("Streaming %s rows: columns=%s, batch_size=%s, filters=%s", self.model.__name__, columns, batch_size, kwargs)
+
+        stmt = select(*(table.c[name] for name in columns))
+        for field, value in kwargs.items():
+            column = table.c[field]
+            stmt = stmt.where(column.in_(value) if isinstance(value, (list, tuple, set)) else column == value)
+        for clause in where or []:
+            stmt = stmt.where(clause)
+
+        result = await db.stream(stmt.execution_options(yield_per=batch_size))
+        try:
+            async for partition in result.partitions():
+                for row in partition:
+                    yield row
+        finally:
+            await result.close()
+
+
+    @traced("crud.get_objects")
     async def get_objects(self, db: AsyncSession, return_many: bool = False, options: Optional[list[Any]] = None, **kwargs) -> Union[ModelType, list[ModelType]]:
         """
         Universal search for objects by one or more fields.
@@ -109,7 +184,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         invalid_fields = [k for k in kwargs if k not in self.model.__table__.columns]
         if invalid_fields:
             raise HTTPException(status_code=400, detail=f"Invalid field(s): {', '.join(invalid_fields)}")
-        logger.debug(f"Fetching {'all' if return_many else 'one'} {self.model.__name__} by fields: {kwargs}")
+        logger.debug("Fetching %s %s by fields: %s", 'all' if return_many else 'one', self.model.__name__, kwargs)
 
         stmt = select(self.model).filter_by(**kwargs)
         if options:
@@ -124,12 +199,13 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             return self._raise_not_found_if_empty(obj, **kwargs)
 
 
+    @traced("crud.update")
     async def update(self, db: AsyncSession, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, dict[str, Any]]) -> ModelType:
         """
         Update an existing object with input schema or dict.
         Only fields present in input will be updated.
         """
-        logger.debug(f"Updating {self.model.__name__} with data: {obj_in}")
+        logger.debug("Updating %s with data: %s", self.model.__name__, obj_in)
         update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_obj, field, value)
@@ -138,30 +214,53 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return db_obj
 
 
+    @traced("crud.refresh")
+    async def refresh(self, db: AsyncSession, db_obj: ModelType, attribute_names: Optional[list[str]] = None) -> ModelType:
+        """
+        Reload object attributes from the database.
+        Needed for columns filled by server defaults or triggers after a flush.
+        """
+        logger.debug("Refreshing %s attributes: %s", self.model.__name__, attribute_names or 'all')
+        await db.refresh(db_obj, attribute_names)
+        return db_obj
+
+
+    @traced("crud.remove")
     async def remove(self, db: AsyncSession, id: int) -> ModelType:
         """
         Remove an object by primary key.
         Raises 404 if not found.
         """
-        logger.debug(f"Removing {self.model.__name__} with id: {id}")
+        logger.debug("Removing %s with id: %s", self.model.__name__, id)
         obj = await self.get(db, id)
         await db.delete(obj)
         await db.flush()
         return obj
 
 
+    @traced("crud.remove_by_field")
     async def remove_by_field(self, db: AsyncSession, **kwargs) -> ModelType:
         """
         Remove a single object by field(s) and value(s).
         Raises 404 if not found or 400 if any field is invalid.
         """
-        logger.debug(f"Removing {self.model.__name__} entry by fields: {kwargs}")
+        logger.debug("Removing %s entry by fields: %s", self.model.__name__, kwargs)
         obj = await self.get_objects(db, **kwargs)
         await db.delete(obj)
         await db.flush()
         return obj
     
 
+    async def try_advisory_lock(self, db: AsyncSession, key: int) -> bool:
+        """
+        Try to take a transaction-scoped Postgres advisory lock.
+        Lets one worker out of many run a periodic job; released on commit/rollback.
+        """
+        result = await db.execute(select(func.pg_try_advisory_xact_lock(key)))
+        return bool(result.scalar_one())
+
+
+    @traced("crud.count")
     async def count(self, db: AsyncSession) -> int:
         stmt = select(func.count()).select_from(self.model)
         result = await db.execute(stmt)
@@ -1,4 +1,7 @@
-from sqlalchemy.orm import sessionmaker
+import asyncio
+from typing import Callable
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
@@ -33,6 +36,30 @@ SessionLocal = sessionmaker(
 # --- Декларативная база ---
 Base = declarative_base()
 
+# --- Хуки после коммита ---
+def run_after_commit(db: AsyncSession, callback: Callable[[], None]):
+    """
+    Run `callback` once the session's current transaction has committed (dropped on rollback).
+    For in-process caches of database state: invalidating before the commit lets a concurrent
+    request read the old row and cache it again.
+    """
+    db.sync_session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session):
+    for callback in session.info.pop("after_commit", ()):
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"After-commit callback failed: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit_callbacks(session: Session):
+    session.info.pop("after_commit", None)
+
+
 # --- Асинхронная сессия ---
 async def get_db():
     async with SessionLocal() as session:
@@ -45,4 +72,23 @@ async def get_db():
             raise
 
         finally:
-            logger.debug("Async DB session closed.")
\ No newline at end of file
+            logger.debug("Async DB session closed.")
+
+
+# --- Прогрев пула ---
+async def warm_pool(connections: int):
+    """
+    Open `connections` pooled connections up front so the first requests don't pay for connect/auth.
+    """
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    connections = min(connections, DATABASE_KWARGS["pool_size"])
+    await asyncio.gather(*(ping() for _ in range(connections)))
+    logger.info(f"Database pool warmed with {connections} connections")
+
+
+async def dispose_engine():
+    await engine.dispose()
+    logger.info("Database engine disposed")
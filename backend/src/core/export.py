@@ -0,0 +1,83 @@
+import io
+import csv
+from decimal import Decimal
+from datetime import datetime
+from typing import Any, AsyncIterator, Literal, Optional
+from pydantic_core import to_json
+from fastapi.responses import StreamingResponse
+
+from src.core.logger import logger
+from src.core.crudbase import CRUDBase
+from src.core.database import SessionLocal
+from src.core.http_cache import NO_STORE_HEADERS
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def csv_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return to_json(value).decode()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return format(value, "f")
+    return str(value)
+
+
+async def export_rows(
+    database: CRUDBase,
+    fmt: ExportFormat,
+    columns: list[str],
+    batch_size: int = 1000,
+    chunk_size: int = 64 * 1024,
+    where: Optional[list[Any]] = None,
+    session_factory=SessionLocal,
+    **kwargs
+) -> AsyncIterator[bytes]:
+    """
+    Encode a table as NDJSON or CSV, reading it through CRUDBase.stream.
+    Opens its own session: the request's session is already closed once a streaming body runs.
+    Rows are sent in ~`chunk_size` byte pieces; each `yield` waits until the server has handed
+    the previous piece to the client, so a slow client slows the cursor down instead of
+    making the export pile up in memory.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(columns)
+
+    exported = 0
+    async with session_factory() as db:
+        async for row in database.stream(db, columns, batch_size, where=where, **kwargs):
+            if writer is not None:
+                writer.writerow([csv_value(value) for value in row])
+            else:
+                buffer.write(to_json(row._asdict()).decode())
+                buffer.write("\n")
+            exported += 1
+            if buffer.tell() >= chunk_size:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+    logger.info(f"Exported {exported} {database.model.__tablename__} rows as {fmt}")
+
+
+def export_response(rows: AsyncIterator[bytes], fmt: ExportFormat, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        rows,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={
+            **NO_STORE_HEADERS,
+            "Content-Disposition": f'attachment; filename="{name}.{fmt}"',
+        },
+    )
@@ -0,0 +1,62 @@
+import hashlib
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, HTTPException, Request, Response
+
+from src.core.database import get_db
+from src.models import TableVersionTable
+from src.core.dependencies import get_config
+
+# Responses with presigned URLs: a cached copy would outlive its signatures
+NO_STORE_HEADERS = {"Cache-Control": "no-store"}
+
+
+def no_store(response: Response):
+    response.headers.update(NO_STORE_HEADERS)
+
+
+async def get_table_versions(db: AsyncSession, tables: tuple[str, ...]) -> dict[str, int]:
+    result = await db.execute(
+        select(TableVersionTable.name, TableVersionTable.version).where(TableVersionTable.name.in_(tables))
+    )
+    versions = dict(result.all())
+    return {table: versions.get(table, 0) for table in tables}
+
+
+def make_etag(request: Request, versions: dict[str, int]) -> str:
+    source = f"{request.url.path}?{request.url.query}|" + ",".join(f"{k}={v}" for k, v in sorted(versions.items()))
+    return f'W/"{hashlib.sha256(source.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes don't matter
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def conditional_on(*tables: str):
+    """
+    Dependency for GET endpoints whose body only depends on `tables` and the query string.
+    The weak ETag comes from the tables' change versions (one primary-key lookup), so a matching
+    If-None-Match is answered with 304 before the endpoint runs its own queries.
+    """
+
+    async def check(request: Request, response: Response, db: AsyncSession = Depends(get_db)) -> str:
+        versions = await get_table_versions(db, tables)
+        etag = make_etag(request, versions)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": get_config().METADATA_CACHE_CONTROL,
+            "Vary": get_config().CACHE_VARY,
+        }
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return etag
+
+    return check
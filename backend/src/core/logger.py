@@ -1,93 +1,232 @@
+import sys
+import copy
+import queue
+import atexit
 import logging
 import logging.config
 from pathlib import Path
+from typing import Optional
+from functools import lru_cache
+from pydantic_core import to_json
 from datetime import datetime, timezone, timedelta
+from logging.handlers import QueueHandler, QueueListener
 
 from src.core.dependencies import get_config
+from src.core.request_context import request_id_var
+
+LOG_TIMEZONE = timezone(timedelta(hours=5))
+
+
+@lru_cache(maxsize=1024)
+def display_filename(pathname: str) -> str:
+    try:
+        full_path = Path(pathname).resolve()
+    except Exception:
+        return pathname
+    return str(full_path).replace('/src/', '').replace('src/', '')
+
 
 class CustomFormatter(logging.Formatter):
     def formatTime(self, record, datefmt=None):
-        utc_dt = datetime.fromtimestamp(record.created, tz=timezone.utc)
-        local_dt = utc_dt.astimezone(timezone(timedelta(hours=5)))
+        local_dt = datetime.fromtimestamp(record.created, tz=LOG_TIMEZONE)
         return local_dt.strftime(datefmt) if datefmt else local_dt.isoformat()
 
     def format(self, record):
         if record.name.startswith("uvicorn"):
             record.custom_filename = "uvicorn"
         else:
-            full_path = Path(record.pathname).resolve()
-            try:
-                relative_path = str(full_path).replace('/src/', '').replace('src/', '')
-                record.custom_filename = relative_path
-            except Exception:
-                record.custom_filename = full_path.name
+            record.custom_filename = display_filename(record.pathname)
+        record.padded_levelname = f"{record.levelname:^7}"
+        if not hasattr(record, "request_id"):
+            record.request_id = "-"
+        return super().format(record)
+
+
+class JsonFormatter(CustomFormatter):
+    """
+    One JSON object per line, for log shippers.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "file": "uvicorn" if record.name.startswith("uvicorn") else display_filename(record.pathname),
+            "line": record.lineno,
+            "request_id": getattr(record, "request_id", None),
+            "message": record.getMessage(),
+        }
+        # Records come off the queue with the traceback already rendered into exc_text
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return to_json(entry, fallback=str).decode()
+
+
+class RequestContextFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Under high volume, keeps the first `threshold` records per second of each (logger, level)
+    and then only every `rate`-th one. WARNING and above always pass.
+    A threshold of 0 disables sampling.
+    """
+
+    def __init__(self, threshold: int, rate: int):
+        super().__init__()
+        self.threshold = threshold
+        self.rate = max(rate, 1)
+        self._second = 0
+        self._counts: dict[tuple[str, int], int] = {}
+        self.dropped = 0
+
+    def filter(self, record):
+        if self.threshold <= 0 or record.levelno >= logging.WARNING:
+            return True
+        second = int(record.created)
+        if second != self._second:
+            self._second = second
+            self._counts.clear()
+        key = (record.name, record.levelno)
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+        if count <= self.threshold or (count - self.threshold) % self.rate == 0:
+            return True
+        self.dropped += 1
+        return False
+
 
+class LogQueueHandler(QueueHandler):
+    """
+    The only handler loggers write to: it merges the message and request id into the record
+    and puts it on a bounded queue; a QueueListener thread formats and writes it to stdout.
+    When the queue is full the record is dropped and counted instead of blocking the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue, sampler: SamplingFilter):
+        super().__init__(log_queue)
+        self.sampler = sampler
+        self.dropped = 0
+        self.addFilter(sampler)
+        self.addFilter(RequestContextFilter())
+
+    def enqueue(self, record):
         try:
-            record.levelname = f"{record.levelname:^7}"
-        except Exception:
-            pass
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
-        s = super().format(record)
 
+    def prepare(self, record):
+        """
+        Like QueueHandler.prepare (message merged with its args, nothing left that can't cross
+        threads), but the traceback is rendered into exc_text instead of being appended to the
+        message, so the listener's formatter decides where it goes (JsonFormatter: "exc").
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
         if record.exc_info:
-            exc_text = self.formatException(record.exc_info)
-            s = f"{s}\n{exc_text}"
+            if not record.exc_text:
+                record.exc_text = (self.formatter or logging.Formatter()).formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queue.qsize(),
+            "dropped_queue_full": self.dropped,
+            "sampled_out": self.sampler.dropped,
+        }
 
-        return s
 
-FORMAT = "[%(asctime)s] [ %(levelname)s ] [%(custom_filename)s] %(message)s"
+@lru_cache()
+def get_log_queue_handler() -> LogQueueHandler:
+    config = get_config()
+    return LogQueueHandler(
+        queue.Queue(config.LOG_QUEUE_SIZE),
+        SamplingFilter(config.LOG_SAMPLE_THRESHOLD, config.LOG_SAMPLE_RATE),
+    )
+
+
+FORMAT = "[%(asctime)s] [ %(padded_levelname)s ] [%(custom_filename)s] [%(request_id)s] %(message)s"
 DATEFMT = "%Y-%m-%d %H:%M:%S"
 
 # Базовая конфигурация
 LOGGING_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
-    "formatters": {
-        "default": {
-            "()": CustomFormatter,
-            "format": FORMAT,
-            "datefmt": DATEFMT,
-        },
-    },
     "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "default",
-            "stream": "ext://sys.stdout",
+        "queue": {
+            "()": get_log_queue_handler,
         },
     },
     "loggers": {
         "uvicorn": {
             "level": "INFO",
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "propagate": False,
         },
         "uvicorn.error": {
             "level": "INFO",
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "propagate": False,
         },
         "uvicorn.access": {
             "level": "INFO",
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "propagate": False,
         },
-        "": {
-            "level": "NOTSET",
-            "handlers": ["console"],
+        "src": {
+            "level": "INFO",
             "propagate": True,
         },
     },
     "root": {
         "level": "ERROR",
-        "handlers": ["console"],
+        "handlers": ["queue"],
     },
 }
 
+_listener: Optional[QueueListener] = None
+
+
 def setup_logging():
-    debug = get_config().DEBUG
-    level = "DEBUG" if debug else "INFO"
-    LOGGING_CONFIG["loggers"][""]["level"] = level
+    global _listener
+    config = get_config()
+    level = "DEBUG" if config.DEBUG else "INFO"
+    LOGGING_CONFIG["loggers"]["src"]["level"] = level
     logging.config.dictConfig(LOGGING_CONFIG)
 
-logger = logging.getLogger(__name__)
\ No newline at end of file
+    if _listener is None:
+        console = logging.StreamHandler(sys.stdout)
+        if config.LOG_FORMAT == "json":
+            console.setFormatter(JsonFormatter())
+        else:
+            console.setFormatter(CustomFormatter(FORMAT, DATEFMT))
+        _listener = QueueListener(get_log_queue_handler().queue, console, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """
+    Write out whatever is still queued and stop the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+logger = logging.getLogger(__name__)
@@ -0,0 +1,261 @@
+import os
+import time
+import inspect
+import functools
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+from src.core.dependencies import get_config
+from src.core.server_timing import add_server_timing
+
+# With several uvicorn/gunicorn workers set PROMETHEUS_MULTIPROC_DIR (an empty dir, cleared on deploy):
+# every worker writes its samples to mmap'd files there and /metrics aggregates all of them.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# METRICS_ENABLED=false: metrics are not created and every recording call is a no-op
+ENABLED = get_config().METRICS_ENABLED
+# Server-Timing reuses the storage and dependency timings, so those hooks stay unless both are off
+SERVER_TIMING_ENABLED = get_config().SERVER_TIMING != "off"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class NoopMetric:
+    """
+    Stands in for any metric (and its labelled children) when metrics are disabled.
+    """
+    __slots__ = ()
+
+    def labels(self, *args, **kwargs) -> "NoopMetric":
+        return self
+
+    def inc(self, amount: float = 1):
+        pass
+
+    def dec(self, amount: float = 1):
+        pass
+
+    def set(self, value: float):
+        pass
+
+    def observe(self, amount: float):
+        pass
+
+
+NOOP_METRIC = NoopMetric()
+
+
+def metric(cls, *args, **kwargs):
+    return cls(*args, **kwargs) if ENABLED else NOOP_METRIC
+
+
+REQUEST_LATENCY = metric(
+    Histogram,
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = metric(
+    Gauge,
+    "http_requests_in_flight",
+    "Requests being handled",
+    multiprocess_mode="livesum",
+)
+DEPENDENCY_LATENCY = metric(
+    Histogram,
+    "dependency_duration_seconds",
+    "Time spent resolving a FastAPI dependency",
+    ["dependency"],
+    buckets=LATENCY_BUCKETS,
+)
+
+DB_POOL_CHECKED_OUT = metric(
+    Gauge,
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the SQLAlchemy pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = metric(
+    Gauge,
+    "db_pool_overflow_connections",
+    "Connections open beyond pool_size (negative: pool not filled yet)",
+    multiprocess_mode="livesum",
+)
+
+SPACES_REQUESTS = metric(
+    Counter,
+    "spaces_requests_total",
+    "Object storage API calls",
+    ["operation", "status"],
+)
+SPACES_LATENCY = metric(
+    Histogram,
+    "spaces_request_duration_seconds",
+    "Object storage API call latency",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+FFMPEG_DURATION = metric(
+    Histogram,
+    "ffmpeg_job_duration_seconds",
+    "ffmpeg HLS conversion time",
+    ["result"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200),
+)
+
+CACHE_REQUESTS = metric(
+    Counter,
+    "cache_requests_total",
+    "In-process cache lookups (hit ratio = hit / (hit + miss))",
+    ["cache", "result"],
+)
+
+
+def cache_counters(cache: str) -> tuple[Counter, Counter]:
+    """
+    (hit, miss) counter children for one cache, bound once so lookups only pay for inc().
+    """
+    return CACHE_REQUESTS.labels(cache, "hit"), CACHE_REQUESTS.labels(cache, "miss")
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead():
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def instrument_pool(engine: AsyncEngine):
+    pool = engine.sync_engine.pool
+
+    def update(*args):
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_OVERFLOW.set(pool.overflow())
+
+    event.listen(pool, "checkout", update)
+    event.listen(pool, "checkin", update)
+
+
+def instrument_boto_client(client):
+    """
+    Count and time every API call of a boto3 client through botocore's event hooks
+    (covers the calls s3transfer makes for multipart uploads too).
+    """
+    def before_call(model, context, **kwargs):
+        context["metrics_call"] = (model.name, time.perf_counter())
+
+    def after_call(context, http_response=None, **kwargs):
+        # after-call-error (connection failures, timeouts) passes no model or response
+        call = context.pop("metrics_call", None)
+        if call is None:
+            return
+        operation, started = call
+        status = str(http_response.status_code) if http_response is not None else "error"
+        SPACES_REQUESTS.labels(operation, status).inc()
+        elapsed = time.perf_counter() - started
+        SPACES_LATENCY.labels(operation).observe(elapsed)
+        add_server_timing("storage", elapsed)
+
+    if not (ENABLED or SERVER_TIMING_ENABLED):
+        return
+    events = client.meta.events
+    events.register("before-call.s3", before_call)
+    events.register("after-call.s3", after_call)
+    events.register("after-call-error.s3", after_call)
+
+
+def timed_dependency(name: str, span: Optional[str] = None) -> Callable:
+    """
+    Record how long a dependency takes to resolve, and add it to the request's
+    Server-Timing `span` if given. Keeps the function's signature
+    (FastAPI follows __wrapped__) and its sync/async nature.
+    """
+    if not ENABLED and (span is None or not SERVER_TIMING_ENABLED):
+        return lambda func: func
+    histogram = DEPENDENCY_LATENCY.labels(name)
+
+    def observe(seconds: float):
+        histogram.observe(seconds)
+        if span is not None:
+            add_server_timing(span, seconds)
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    observe(time.perf_counter() - started)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(time.perf_counter() - started)
+        return wrapper
+
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    Request latency by (method, route template, status) and in-flight requests.
+    The route template (e.g. /admin/videos/{video_id}) keeps label cardinality bounded;
+    unmatched paths are all reported as "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+            ).observe(time.perf_counter() - started)
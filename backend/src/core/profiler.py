@@ -0,0 +1,166 @@
+import sys
+import time
+import asyncio
+import threading
+from html import escape
+from typing import Optional
+from collections import Counter
+
+_profile_lock = threading.Lock()
+
+
+def frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+def thread_stack(frame) -> list[str]:
+    stack = []
+    while frame is not None:
+        stack.append(frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def task_stack(task: asyncio.Task) -> list[str]:
+    """
+    Where a task is suspended: its coroutine and everything it is awaiting, outermost first.
+    """
+    stack = []
+    coro = task.get_coro()
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        stack.append(frame_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "ag_await", None)
+    return stack
+
+
+class StackSampler:
+    """
+    Samples the stacks of every thread of this process (and optionally the suspended
+    asyncio tasks of `loop`) from its own thread, `rate` times per second. Runs only while a
+    profile is requested; nothing is installed in the interpreter, so there is no cost when idle.
+    """
+
+    def __init__(self, rate: int, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.interval = 1 / rate
+        self.loop = loop
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+
+    def run(self, seconds: float):
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        deadline = time.monotonic() + seconds
+        next_tick = time.monotonic()
+        while next_tick < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack = thread_stack(frame)
+                if stack:
+                    self.stacks[";".join([f"thread:{names.get(ident, ident)}", *stack])] += 1
+            if self.loop is not None:
+                self.sample_tasks()
+            self.samples += 1
+            next_tick += self.interval
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+
+
+    def sample_tasks(self):
+        try:
+            tasks = asyncio.all_tasks(self.loop)
+        except RuntimeError:  # the set changed while being copied, skip this tick
+            return
+        for task in tasks:
+            try:
+                stack = task_stack(task)
+            except Exception:
+                continue
+            if stack:
+                self.stacks[";".join(["task", *stack])] += 1
+
+
+    def collapsed(self) -> str:
+        """
+        Brendan Gregg's folded format, readable by flamegraph.pl, speedscope and inferno.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def profile(seconds: float, rate: int, loop: Optional[asyncio.AbstractEventLoop] = None) -> Optional[StackSampler]:
+    """
+    Sample for `seconds`; returns None if another profile is already running in this process.
+    Blocking, call it from a worker thread.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        sampler = StackSampler(rate, loop)
+        sampler.run(seconds)
+        return sampler
+    finally:
+        _profile_lock.release()
+
+
+class FlameNode:
+    __slots__ = ("name", "count", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.children: dict[str, "FlameNode"] = {}
+
+
+def render_flamegraph(stacks: Counter, title: str = "CPU profile", width: int = 1200, row: int = 16) -> str:
+    """
+    Minimal standalone flame graph: one <rect> per frame, width proportional to samples,
+    frame name and counts in the tooltip. Frames narrower than a pixel are left out.
+    """
+    root = FlameNode("all")
+    for stack, count in stacks.items():
+        root.count += count
+        node = root
+        for name in stack.split(";"):
+            node = node.children.setdefault(name, FlameNode(name))
+            node.count += count
+
+    def depth(node: FlameNode) -> int:
+        return 1 + max((depth(child) for child in node.children.values()), default=0)
+
+    rows = depth(root)
+    height = rows * row + 40
+    scale = width / max(root.count, 1)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">',
+        f'<text x="{width / 2}" y="18" text-anchor="middle" font-size="14">{escape(title)}</text>',
+    ]
+
+    def draw(node: FlameNode, x: float, level: int):
+        w = node.count * scale
+        if w < 1:
+            return
+        y = height - (level + 1) * row
+        hue = 10 + hash(node.name) % 50
+        label = escape(node.name)
+        share = node.count / max(root.count, 1) * 100
+        parts.append(
+            f'<g><title>{label} ({node.count} samples, {share:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row - 1}" fill="hsl({hue},80%,60%)"/>'
+        )
+        if w > 30:
+            chars = int(w / 7)
+            text = label if len(node.name) <= chars else escape(node.name[:max(chars - 2, 1)]) + ".."
+            parts.append(f'<text x="{x + 3:.1f}" y="{y + row - 4}">{text}</text>')
+        parts.append("</g>")
+        for child in sorted(node.children.values(), key=lambda child: child.name):
+            draw(child, x, level + 1)
+            x += child.count * scale
+
+    draw(root, 0.0, 0)
+    parts.append("</svg>")
+    return "\n".join(parts)
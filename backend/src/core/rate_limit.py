@@ -0,0 +1,72 @@
+import math
+import time
+from collections import OrderedDict
+from fastapi import HTTPException
+
+from src.core.logger import logger
+
+
+def too_many_requests(retry_after: float, detail: str = "Too many requests") -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class TokenBucketLimiter:
+    """
+    In-process token buckets: `burst` attempts at once, refilled at `rate` per minute, per key.
+    At most `max_keys` buckets are kept (least recently used are evicted, which only ever
+    makes a key less limited), so memory stays fixed no matter how many IPs/accounts show up.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_keys: int):
+        self.name = name
+        self.rate = rate / 60
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+        self.allowed = 0
+        self.limited = 0
+        self.evicted = 0
+
+    def hit(self, key: str) -> float:
+        """
+        Take one token for `key`. Returns 0 if allowed, else seconds until a token is available.
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+            self.allowed += 1
+        else:
+            retry_after = (1 - tokens) / self.rate
+            self.limited += 1
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            self.evicted += 1
+        return retry_after
+
+
+    def check(self, key: str):
+        retry_after = self.hit(key)
+        if retry_after:
+            if self.limited == 1 or self.limited % 1000 == 0:
+                logger.warning(f"{self.name} rate limit hit ({self.limited} rejected so far)")
+            raise too_many_requests(retry_after)
+
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "keys": len(self._buckets),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evicted": self.evicted,
+        }
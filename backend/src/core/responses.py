@@ -0,0 +1,23 @@
+from typing import Any, Optional
+from pydantic_core import to_json
+from fastapi.responses import JSONResponse
+
+from src.core.server_timing import server_timing
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSON response serialized straight from pydantic models by pydantic-core (in Rust).
+    Return it from an endpoint instead of the model itself: FastAPI then skips validating the
+    result against `response_model` and the jsonable_encoder pass, so keep `response_model=`
+    on the route for the OpenAPI schema only and build trusted data with `model_construct`.
+    `include` is passed to pydantic-core (sparse fieldsets); fields left out of it may be unset.
+    """
+
+    def __init__(self, content: Any, include: Optional[dict] = None, **kwargs):
+        self.include = include
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        with server_timing("serialize"):
+            return to_json(content, include=self.include)
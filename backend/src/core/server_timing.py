@@ -0,0 +1,130 @@
+import time
+from typing import Optional
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SERVER_TIMING_MODES = ("off", "admin", "all")
+
+
+class RequestTimings:
+    """
+    Time spent per span name during one request: name -> [seconds, count].
+    """
+    __slots__ = ("spans", "admin")
+
+    def __init__(self):
+        self.spans: dict[str, list] = {}
+        self.admin = False
+
+    def add(self, name: str, seconds: float):
+        span = self.spans.get(name)
+        if span is None:
+            self.spans[name] = [seconds, 1]
+        else:
+            span[0] += seconds
+            span[1] += 1
+
+
+    def header(self, total: float) -> str:
+        parts = [
+            f'{name};dur={seconds * 1000:.1f};desc="{count}x"'
+            for name, (seconds, count) in self.spans.items()
+        ]
+        parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+
+# Set by ServerTimingMiddleware while a request is handled, None everywhere else
+timings_var: ContextVar[Optional[RequestTimings]] = ContextVar("server_timings", default=None)
+
+
+class server_timing:
+    """
+    `with server_timing("sign"): ...` adds the block's wall time to the current request's
+    Server-Timing span. Costs one contextvar lookup when timing is off.
+    """
+    __slots__ = ("name", "timings", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.timings = timings_var.get()
+        if self.timings is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.timings is not None:
+            self.timings.add(self.name, time.perf_counter() - self.started)
+
+
+def add_server_timing(name: str, seconds: float):
+    timings = timings_var.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+def mark_admin_request():
+    """
+    Called by the auth dependencies; in "admin" mode only such requests get the header.
+    """
+    timings = timings_var.get()
+    if timings is not None:
+        timings.admin = True
+
+
+def instrument_engine_timing(engine: AsyncEngine):
+    """
+    Every statement's execution time goes to the "db" span, whichever module issued it.
+    SQLAlchemy runs the asyncpg calls in a greenlet sharing the request's context.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if timings_var.get() is not None:
+            conn.info.setdefault("server_timing_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("server_timing_started")
+        if started:
+            add_server_timing("db", time.perf_counter() - started.pop())
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a Server-Timing header (db, storage, sign, auth, serialize, total) that browser devtools
+    and load-test tools show next to each request. `mode` is "all" or "admin" (only requests
+    authenticated as an admin). Streaming bodies are timed up to the start of the response.
+    """
+
+    def __init__(self, app: ASGIApp, mode: str = "admin"):
+        self.app = app
+        self.mode = mode
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self.mode == "off":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start" and (self.mode == "all" or timings.admin):
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", timings.header(time.perf_counter() - started).encode()),
+                ]
+            await send(message)
+
+        token = timings_var.set(timings)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            timings_var.reset(token)
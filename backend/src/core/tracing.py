@@ -0,0 +1,305 @@
+import os
+import time
+import queue
+import random
+import inspect
+import logging
+import functools
+from typing import Any, Callable, Optional
+from functools import lru_cache
+from contextvars import ContextVar
+from pydantic_core import to_json
+from logging.handlers import QueueListener, RotatingFileHandler
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.dependencies import get_config
+
+SERVICE_NAME = "chesslessons-backend"
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "error", "sampled")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool, attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+
+    def to_otlp(self) -> dict:
+        """
+        One OTLP/JSON ExportTraceServiceRequest holding just this span, so every line of the
+        trace file can be POSTed as is to a collector's /v1/traces endpoint.
+        """
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 2 if self.parent_id is None else 1,  # SERVER for roots, INTERNAL otherwise
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id is not None:
+            span["parentSpanId"] = self.parent_id
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    otlp_attribute("service.name", SERVICE_NAME),
+                    otlp_attribute("process.pid", os.getpid()),
+                ]},
+                "scopeSpans": [{"scope": {"name": "src.core.tracing"}, "spans": [span]}],
+            }]
+        }
+
+
+def otlp_attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+# The span code is running in; asyncio tasks inherit it, executor jobs need copy_context().run
+current_span_var: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class SpanFormatter(logging.Formatter):
+    def format(self, record):
+        return to_json(record.msg.to_otlp()).decode()
+
+
+class SpanExporter:
+    """
+    Writes finished spans as JSON lines to a size-rotated file. Spans are queued and encoded
+    on a listener thread; when the queue is full they are dropped and counted.
+    """
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int, queue_size: int):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        handler.setFormatter(SpanFormatter())
+        self.queue: queue.Queue = queue.Queue(queue_size)
+        self.listener = QueueListener(self.queue, handler)
+        self.listener.start()
+        self.exported = 0
+        self.dropped = 0
+
+    def export(self, span: Span):
+        try:
+            self.queue.put_nowait(logging.makeLogRecord({"msg": span}))
+            self.exported += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+    def shutdown(self):
+        self.listener.stop()
+
+
+class SpanScope:
+    """
+    `with tracer.span(...) as span:` - makes the span current for the block, ends and exports
+    it on exit (marking it failed if the block raised). Works across awaits in async code.
+    """
+    __slots__ = ("tracer", "span", "token")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.token = current_span_var.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        current_span_var.reset(self.token)
+        if exc is not None:
+            self.span.error = f"{exc_type.__name__}: {exc}"
+        self.tracer.end_span(self.span)
+
+
+class NoopScope:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc):
+        return None
+
+
+NOOP_SCOPE = NoopScope()
+
+
+class Tracer:
+    """
+    In-process tracing. Whether a trace is recorded is decided once at its root span
+    (`sample_rate`); children follow the decision. With a rate of 0 spans cost one attribute check.
+    """
+
+    def __init__(self, sample_rate: float, exporter: Optional[SpanExporter] = None):
+        self.sample_rate = sample_rate if exporter is not None else 0.0
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+
+    def start_span(self, name: str, **attributes) -> Span:
+        """
+        A span under the current one that does not become current itself (leaf work such as
+        single statements); finish it with end_span.
+        """
+        parent = current_span_var.get()
+        if parent is None:
+            return Span(name, f"{random.getrandbits(128):032x}", None, random.random() < self.sample_rate, attributes)
+        return Span(name, parent.trace_id, parent.span_id, parent.sampled, attributes)
+
+
+    def end_span(self, span: Span):
+        span.end_ns = time.time_ns()
+        if span.sampled:
+            self.exporter.export(span)
+
+
+    def span(self, name: str, **attributes):
+        if not self.enabled:
+            return NOOP_SCOPE
+        return SpanScope(self, self.start_span(name, **attributes))
+
+
+    def stats(self) -> dict:
+        if self.exporter is None:
+            return {"sample_rate": 0.0}
+        return {
+            "sample_rate": self.sample_rate,
+            "exported": self.exporter.exported,
+            "dropped": self.exporter.dropped,
+            "queued": self.exporter.queue.qsize(),
+        }
+
+
+    def shutdown(self):
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+@lru_cache()
+def get_tracer() -> Tracer:
+    config = get_config()
+    if config.TRACE_SAMPLE_RATE <= 0:
+        return Tracer(0.0)
+    exporter = SpanExporter(
+        config.TRACE_FILE,
+        max_bytes=config.TRACE_FILE_MAX_BYTES,
+        backup_count=config.TRACE_FILE_BACKUPS,
+        queue_size=config.TRACE_QUEUE_SIZE,
+    )
+    return Tracer(config.TRACE_SAMPLE_RATE, exporter)
+
+
+def traced(name: str) -> Callable:
+    """
+    Run every call of the function in a span called `name`. Keeps its sync/async nature.
+    """
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with get_tracer().span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def instrument_engine_tracing(engine: AsyncEngine):
+    """
+    A "db.query" span for every statement, under whatever span issued it.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_span_var.get() is not None:
+            span = get_tracer().start_span("db.query", **{"db.statement": statement[:300], "db.executemany": executemany})
+            conn.info.setdefault("tracing_spans", []).append(span)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("tracing_spans")
+        if spans:
+            get_tracer().end_span(spans.pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        spans = context.connection.info.get("tracing_spans") if context.connection is not None else None
+        if spans:
+            span = spans.pop()
+            span.error = f"{type(context.original_exception).__name__}: {context.original_exception}"
+            get_tracer().end_span(span)
+
+
+class TracingMiddleware:
+    """
+    Root span for every HTTP request, named "<METHOD> <route template>" once routing is done.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        tracer = get_tracer()
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        span = tracer.start_span(
+            f"{scope['method']} {scope['path']}",
+            **{"http.method": scope["method"], "http.target": scope["path"]},
+        )
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    span.error = f"HTTP {message['status']}"
+            await send(message)
+
+        token = current_span_var.set(span)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current_span_var.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                span.name = f"{scope['method']} {route.path}"
+                span.set_attribute("http.route", route.path)
+            tracer.end_span(span)
@@ -1,17 +1,113 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.core.container import Container
+from src.core.compression import CompressionMiddleware
+from src.core.request_context import RequestIdMiddleware
+from src.core.server_timing import ServerTimingMiddleware, instrument_engine_timing
+from src.core.tracing import TracingMiddleware, get_tracer, instrument_engine_tracing
+from src.core.metrics import MetricsMiddleware, instrument_pool, render_metrics, mark_process_dead
 from src.core.dependencies import get_config
 from src.routers.all import router as all_routes
 from src.core.logger import logger, setup_logging
+from src.core.database import engine, warm_pool, dispose_engine
+from src.modules.users.dependencies import get_user_service, get_principal_cache
+from src.modules.attributes.dependencies import get_attribute_service
+from src.modules.entitlements.dependencies import get_entitlement_service
+from src.modules.videos.dependencies import get_video_service, get_video_utils
+from src.modules.views.dependencies import get_view_log_service, get_view_rollup_service
+from src.modules.auth.dependencies import (
+    get_auth_service,
+    get_jwt_service,
+    get_password_manager,
+    get_revocation_store,
+    get_ip_rate_limiter,
+    get_account_rate_limiter,
+)
 
 setup_logging()
 logger.info("✅ Logging initialized!")
 
+
+container = Container()
+container.provide(
+    get_config,
+    get_tracer,
+    get_jwt_service,
+    get_password_manager,
+    get_ip_rate_limiter,
+    get_account_rate_limiter,
+    get_principal_cache,
+    get_user_service,
+    get_revocation_store,
+    get_auth_service,
+    get_attribute_service,
+    get_entitlement_service,
+    get_video_utils,
+    get_video_service,
+    get_view_log_service,
+    get_view_rollup_service,
+)
+
+
+async def warm_up():
+    tasks = [warm_pool(get_config().DB_POOL_WARM_CONNECTIONS)]
+    if get_config().STORAGE_WARM_UP:
+        tasks.append(asyncio.to_thread(get_video_utils().warm_up))
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Warm-up step failed: {result}")
+
+
+async def start_background_services():
+    await get_view_log_service().start()
+    await get_view_rollup_service().start()
+    await get_revocation_store().start()
+
+
+async def stop_background_services():
+    await get_revocation_store().stop()
+    await get_view_rollup_service().stop()
+    await get_view_log_service().stop()
+
+
+async def shutdown_password_manager():
+    get_password_manager().shutdown()
+
+
+async def shutdown_tracing():
+    get_tracer().shutdown()
+
+
+async def mark_metrics_process_dead():
+    mark_process_dead()
+
+
+container.on_startup(warm_up)
+container.on_startup(start_background_services)
+container.on_shutdown(shutdown_tracing)
+container.on_shutdown(mark_metrics_process_dead)
+container.on_shutdown(dispose_engine)
+container.on_shutdown(shutdown_password_manager)
+container.on_shutdown(stop_background_services)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await container.start()
+    app.state.container = container
+    yield
+    await container.stop()
+
+
 app = FastAPI(
     title="Chess Video Platform",
     version="1.0.0",
     debug=get_config().DEBUG,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -21,4 +117,31 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.include_router(all_routes)
\ No newline at end of file
+app.add_middleware(
+    CompressionMiddleware,
+    min_size=get_config().COMPRESSION_MIN_SIZE,
+    preference=tuple(get_config().COMPRESSION_ENCODINGS),
+    levels={
+        "gzip": get_config().GZIP_LEVEL,
+        "br": get_config().BROTLI_QUALITY,
+        "zstd": get_config().ZSTD_LEVEL,
+    },
+)
+if get_config().SERVER_TIMING != "off":
+    app.add_middleware(ServerTimingMiddleware, mode=get_config().SERVER_TIMING)
+    instrument_engine_timing(engine)
+if get_config().TRACE_SAMPLE_RATE > 0:
+    app.add_middleware(TracingMiddleware)
+    instrument_engine_tracing(engine)
+app.add_middleware(RequestIdMiddleware)
+app.include_router(all_routes)
+
+if get_config().METRICS_ENABLED:
+    # Outermost, so the latency includes compression and CORS handling
+    app.add_middleware(MetricsMiddleware)
+    instrument_pool(engine)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        body, content_type = render_metrics()
+        return Response(body, media_type=content_type)
@@ -7,15 +7,19 @@ from sqlalchemy import (
     String,
     DateTime,
     Integer,
+    BigInteger,
     ForeignKey,
     Numeric,
     Text,
     UniqueConstraint,
+    Index,
     Boolean,
+    text,
+    func,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy import Enum as SQLAEnum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 from src.core.database import Base
 
@@ -38,7 +42,16 @@ class UserTable(Base):
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     purchases = relationship("PurchaseTable", back_populates="user")
-    views = relationship("ViewLogTable", back_populates="user")
+    subscriptions = relationship("SubscriptionTable", back_populates="user", cascade="all, delete")
+    views = relationship("ViewLogTable", back_populates="user", passive_deletes=True)
+
+
+class RevokedTokenTable(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String, primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
 
 
 class AttributeTypeTable(Base):
@@ -71,10 +84,13 @@ class VideoTable(Base):
     access_level = Column(Integer, default=0, nullable=False)
     price = Column(Numeric, nullable=True)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    # Denormalized [{"type": ..., "value": ...}] list, maintained by DB triggers on
+    # video_attributes / attribute_values / attribute_types (see migration 2fb5ba2d1782).
+    resolved_attributes = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
 
     attributes = relationship("VideoAttributeLinkTable", back_populates="video", cascade="all, delete")
     purchases = relationship("PurchaseTable", back_populates="video", cascade="all, delete")
-    views = relationship("ViewLogTable", back_populates="video", cascade="all, delete")
+    views = relationship("ViewLogTable", back_populates="video", passive_deletes=True)
 
 
 class VideoAttributeLinkTable(Base):
@@ -101,13 +117,73 @@ class PurchaseTable(Base):
     video = relationship("VideoTable", back_populates="purchases")
 
 
+class SubscriptionTable(Base):
+    __tablename__ = "subscriptions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    started_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    user = relationship("UserTable", back_populates="subscriptions")
+
+
 class ViewLogTable(Base):
     __tablename__ = "views"
+    # Monthly range partitions (views_YYYY_MM) plus views_default, managed by ViewLogService
+    __table_args__ = (
+        Index("ix_views_viewed_at", "viewed_at"),
+        Index("ix_views_video_id", "video_id"),
+        {"postgresql_partition_by": "RANGE (viewed_at)"},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
     video_id = Column(UUID(as_uuid=True), ForeignKey("videos.id", ondelete="SET NULL"))
-    viewed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    viewed_at = Column(DateTime(timezone=True), primary_key=True, default=lambda: datetime.now(timezone.utc))
 
     user = relationship("UserTable", back_populates="views")
-    video = relationship("VideoTable", back_populates="views")
\ No newline at end of file
+    video = relationship("VideoTable", back_populates="views")
+
+class VideoViewsHourlyTable(Base):
+    __tablename__ = "video_views_hourly"
+    __table_args__ = (Index("ix_video_views_hourly_bucket_start", "bucket_start"),)
+
+    video_id = Column(UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    views = Column(Integer, nullable=False, default=0)
+
+
+class VideoViewsDailyTable(Base):
+    __tablename__ = "video_views_daily"
+    __table_args__ = (Index("ix_video_views_daily_bucket_start", "bucket_start"),)
+
+    video_id = Column(UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    views = Column(Integer, nullable=False, default=0)
+
+
+class ViewRollupSeenTable(Base):
+    # (user, video) pairs already counted in an open rollup window, pruned once the window closes
+    __tablename__ = "view_rollup_seen"
+
+    granularity = Column(String, primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    video_id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+
+
+class RollupWatermarkTable(Base):
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String, primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
+
+
+class TableVersionTable(Base):
+    # Bumped by statement-level triggers on every write to `name`; feeds HTTP ETags
+    __tablename__ = "table_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default=text("0"))
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,7 +1,10 @@
+from functools import lru_cache
+
 from .service import AttributeService
 from .crud import AttributeTypeDatabase, AttributeValueDatabase
 from src.models import AttributeTypeTable, AttributeValueTable
 
+@lru_cache()
 def get_attribute_service() -> AttributeService:
     return AttributeService(
         att_database=AttributeTypeDatabase(AttributeTypeTable),
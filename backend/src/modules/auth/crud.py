@@ -0,0 +1,44 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.core.logger import logger
+from src.core.crudbase import CRUDBase
+from src.models import RevokedTokenTable
+from src.modules.auth.schemas import RevokedTokenCreate
+
+
+class RevokedTokenDatabase(CRUDBase[RevokedTokenTable, RevokedTokenCreate, RevokedTokenCreate]):
+    async def revoke(self, db: AsyncSession, jti: str, expires_at: datetime):
+        stmt = (
+            pg_insert(RevokedTokenTable)
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=["jti"])
+        )
+        await db.execute(stmt)
+
+
+    async def get_revoked_since(
+        self,
+        db: AsyncSession,
+        since: Optional[datetime],
+    ) -> list[tuple[str, datetime, datetime]]:
+        """
+        Unexpired revocations recorded after `since` (all of them when None) as (jti, expires_at, revoked_at).
+        """
+        stmt = (
+            select(RevokedTokenTable.jti, RevokedTokenTable.expires_at, RevokedTokenTable.revoked_at)
+            .where(RevokedTokenTable.expires_at > func.now())
+        )
+        if since is not None:
+            stmt = stmt.where(RevokedTokenTable.revoked_at >= since)
+        result = await db.execute(stmt)
+        return result.all()
+
+
+    async def delete_expired(self, db: AsyncSession) -> int:
+        result = await db.execute(delete(RevokedTokenTable).where(RevokedTokenTable.expires_at <= func.now()))
+        logger.debug("Pruned %s expired revoked tokens", result.rowcount)
+        return result.rowcount
@@ -1,47 +1,145 @@
-from fastapi import Depends, HTTPException
+from typing import Optional
+from functools import lru_cache
+from fastapi import Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
 
-from src.models import UserTable
-from src.core.database import get_db
+from src.core.database import get_db, SessionLocal
 from src.core.dependencies import get_config
+from src.core.rate_limit import TokenBucketLimiter
+from src.core.metrics import timed_dependency
+from src.core.server_timing import mark_admin_request
+from src.models import RevokedTokenTable
 from src.modules.auth.service import AuthService
 from src.modules.auth.jwt_service import JWTService
-from src.modules.users.dependencies import get_user_service
+from src.modules.auth.crud import RevokedTokenDatabase
+from src.modules.auth.revocation import RevocationStore
+from src.modules.auth.principal_cache import PrincipalCache
+from src.modules.auth.schemas import Principal, TokenClaims
+from src.modules.users.dependencies import get_user_service, get_principal_cache
 from src.modules.auth.password_manager import PasswordManager
 
 token_scheme = HTTPBearer(auto_error=True)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+@lru_cache()
+def get_password_manager() -> PasswordManager:
+    return PasswordManager(
+        rounds=get_config().BCRYPT_ROUNDS,
+        max_workers=get_config().PASSWORD_HASH_WORKERS,
+        max_queue=get_config().PASSWORD_HASH_QUEUE,
+    )
+
+
+@lru_cache()
+def get_ip_rate_limiter() -> TokenBucketLimiter:
+    return TokenBucketLimiter(
+        name="auth-ip",
+        rate=get_config().AUTH_IP_RATE,
+        burst=get_config().AUTH_IP_BURST,
+        max_keys=get_config().AUTH_RATE_LIMIT_KEYS,
+    )
+
+
+@lru_cache()
+def get_account_rate_limiter() -> TokenBucketLimiter:
+    return TokenBucketLimiter(
+        name="auth-account",
+        rate=get_config().AUTH_ACCOUNT_RATE,
+        burst=get_config().AUTH_ACCOUNT_BURST,
+        max_keys=get_config().AUTH_RATE_LIMIT_KEYS,
+    )
+
+
+@lru_cache()
+def get_revocation_store() -> RevocationStore:
+    return RevocationStore(
+        database=RevokedTokenDatabase(RevokedTokenTable),
+        session_factory=SessionLocal,
+        sync_interval=get_config().REVOCATION_SYNC_INTERVAL,
+        prune_interval=get_config().REVOCATION_PRUNE_INTERVAL,
+        capacity=get_config().REVOCATION_FILTER_CAPACITY,
+        error_rate=get_config().REVOCATION_FILTER_ERROR_RATE,
+    )
+
+
+@lru_cache()
+def get_jwt_service() -> JWTService:
+    return JWTService(
+        algorithm=get_config().ALGORITHM,
+        secret_key=get_config().SECRET_KEY,
+        access_expiry=get_config().ACCESS_TOKEN_EXPIRE_MINUTES,
+        refresh_expiry=get_config().REFRESH_TOKEN_EXPIRE_MINUTES,
+        decode_cache_size=get_config().JWT_DECODE_CACHE_SIZE,
+    )
+
+
+@lru_cache()
 def get_auth_service() -> AuthService:
     return AuthService(
-        jwt_service=JWTService(
-            algorithm=get_config().ALGORITHM,
-            secret_key=get_config().SECRET_KEY,
-            access_expiry=get_config().ACCESS_TOKEN_EXPIRE_MINUTES,
-            refresh_expiry=get_config().REFRESH_TOKEN_EXPIRE_MINUTES,
-        ),
-        password_manager=PasswordManager(),
+        jwt_service=get_jwt_service(),
+        password_manager=get_password_manager(),
         user_service=get_user_service(),
+        revocation_store=get_revocation_store(),
     )
 
 
-async def get_current_user(
+@timed_dependency("get_token_claims", span="auth")
+def get_token_claims(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
     auth_service: AuthService = Depends(get_auth_service),
-) -> UserTable:
+) -> TokenClaims:
+    """
+    Verified access token claims without any database access.
+    Use instead of get_current_user when the user id/email is all an endpoint needs.
+    """
     payload = auth_service.jwt_service.decode_token(token)
     if payload.get("type") != "access":
         raise HTTPException(status_code=403, detail="Invalid token type")
-    return await auth_service.user_service.get_by_email(payload["sub"], db)
+    return TokenClaims(**payload)
+
+
+@timed_dependency("get_current_user", span="auth")
+async def get_current_user(
+    claims: TokenClaims = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_db),
+    auth_service: AuthService = Depends(get_auth_service),
+    principal_cache: PrincipalCache = Depends(get_principal_cache),
+) -> Principal:
+    principal = principal_cache.get(claims.id, claims.iat)
+    if principal is None:
+        user = await auth_service.user_service.get_by_email(claims.sub, db)
+        principal = Principal.model_validate(user)
+        principal_cache.put(principal, claims.iat)
+    if principal.is_admin:
+        mark_admin_request()
+    return principal
 
 
 def get_bearer_token(credentials: HTTPAuthorizationCredentials = Depends(token_scheme)) -> str:
     return credentials.credentials
 
 
-def get_admin_user(user: UserTable = Depends(get_current_user)):
+@timed_dependency("get_admin_user", span="auth")
+def get_admin_user(user: Principal = Depends(get_current_user)) -> Principal:
     if not user.is_admin:
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    return user
\ No newline at end of file
+    return user
+
+
+def get_client_ip(request: Request) -> str:
+    if get_config().TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def check_auth_rate_limit(request: Request, account: Optional[str] = None):
+    """
+    Per-IP and per-account throttling for endpoints that cost a password hash.
+    Call before any password work so rejected attempts stay cheap.
+    """
+    get_ip_rate_limiter().check(get_client_ip(request))
+    if account:
+        get_account_rate_limiter().check(account.strip().lower())
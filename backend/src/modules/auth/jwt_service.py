@@ -1,18 +1,56 @@
 import jwt
+import time
 import uuid
+import hashlib
+import threading
 from typing import Literal
+from collections import OrderedDict
 from fastapi import HTTPException
 from datetime import datetime, timedelta, timezone
 
 from src.models import UserTable
 from src.core.logger import logger
+from src.core.metrics import cache_counters
 
 class JWTService:
-    def __init__(self, algorithm: str, secret_key: str, access_expiry: int, refresh_expiry: int):
+    """
+    Issues and verifies HS* tokens.
+    Verified tokens are remembered in a bounded LRU (sha256 of the token -> claims) until their
+    `exp`, so a client reusing one access token doesn't pay for parsing and the HMAC check on every
+    request. Only successful decodes are cached; changing `secret_key` empties the cache.
+    The cache is shared by the threadpool threads running sync dependencies, so it is guarded by a lock
+    (held only for the dict operations, not for verification).
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret_key: str,
+        access_expiry: int,
+        refresh_expiry: int,
+        decode_cache_size: int = 10000,
+    ):
         self.algorithm = algorithm
-        self.secret_key = secret_key
         self.access_expiry_minutes = access_expiry
         self.refresh_expiry_minutes = refresh_expiry
+        self.decode_cache_size = decode_cache_size
+        self._decoded: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._hit_counter, self._miss_counter = cache_counters("jwt_decode")
+        self.secret_key = secret_key
+
+    @property
+    def secret_key(self) -> str:
+        return self._secret_key
+
+    @secret_key.setter
+    def secret_key(self, value: str):
+        # Rotation: claims verified with the old secret must be checked again
+        with self._lock:
+            self._secret_key = value
+            self._decoded.clear()
 
     def generate_access_token(self, user: UserTable) -> str:
         return self.create_token(user, self.access_expiry_minutes, "access")
@@ -41,11 +79,39 @@ class JWTService:
 
 
     def decode_token(self, token: str) -> dict:
+        digest = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._decoded.get(digest)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self._decoded.move_to_end(digest)
+                    self.cache_hits += 1
+                    self._hit_counter.inc()
+                    return dict(entry[1])
+                del self._decoded[digest]
+            self.cache_misses += 1
+        self._miss_counter.inc()
+
         try:
-            return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
         except jwt.ExpiredSignatureError:
             logger.warning("Token expired")
             raise HTTPException(status_code=403, detail="Token has expired")
         except jwt.InvalidTokenError:
             logger.warning("Invalid token")
             raise HTTPException(status_code=403, detail="Invalid token")
+
+        if self.decode_cache_size > 0 and "exp" in claims:
+            with self._lock:
+                self._decoded[digest] = (float(claims["exp"]), dict(claims))
+                if len(self._decoded) > self.decode_cache_size:
+                    self._decoded.popitem(last=False)
+        return claims
+
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "cached": len(self._decoded),
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+        }
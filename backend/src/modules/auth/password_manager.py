@@ -1,11 +1,110 @@
+import time
+import asyncio
+import threading
+import functools
+import contextvars
+from typing import Optional
 from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.rate_limit import too_many_requests
+from src.core.tracing import get_tracer
 
 class PasswordManager:
-    def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    """
+    bcrypt hashing/verification on a dedicated thread pool, so a ~200ms hash never blocks the event loop.
+    `max_workers` caps how many hashes run at once; queue time before a worker picks a job up is recorded.
+    At most `max_queue` jobs may wait for a worker, beyond that calls fail fast with 429 and a
+    Retry-After estimated from recent hash times, so a login burst can't pile up unbounded work.
+    Hashes made with a different cost than `rounds` are reported by verify_and_update for rehashing.
+    """
+
+    def __init__(self, rounds: int, max_workers: int, max_queue: int):
+        self.pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+        )
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password")
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.queued = 0
+        self.queue_seconds_total = 0.0
+        self.queue_seconds_max = 0.0
+        self.work_seconds_total = 0.0
+        self.rejected = 0
+
+    async def hash_password(self, password: str) -> str:
+        return await self._run(self.pwd_context.hash, password)
+
+    async def verify_password(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.pwd_context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """
+        Returns (verified, new_hash). new_hash is set when the stored hash uses outdated parameters.
+        """
+        return await self._run(self.pwd_context.verify_and_update, password, hashed_password)
+
+    async def _run(self, func, *args):
+        submitted = time.perf_counter()
+        with self._stats_lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise too_many_requests(self._drain_estimate(), detail="Server busy, try again later")
+            self.queued += 1
+        # Whichever comes first, the worker starting the job or the caller giving up on it
+        # (cancelled while still queued, so the job never runs), takes it off the queue count
+        dequeued = False
+
+        def dequeue():
+            nonlocal dequeued
+            if not dequeued:
+                dequeued = True
+                self.queued -= 1
+
+        def job():
+            waited = time.perf_counter() - submitted
+            with self._stats_lock:
+                dequeue()
+                self.calls += 1
+                self.queue_seconds_total += waited
+                self.queue_seconds_max = max(self.queue_seconds_max, waited)
+            started = time.perf_counter()
+            try:
+                with get_tracer().span(f"password.{func.__name__}", **{"password.queue_seconds": waited}):
+                    return func(*args)
+            finally:
+                with self._stats_lock:
+                    self.work_seconds_total += time.perf_counter() - started
+
+        # run_in_executor does not carry contextvars over to the worker thread (asyncio.to_thread does)
+        run = functools.partial(contextvars.copy_context().run, job)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, run)
+        finally:
+            with self._stats_lock:
+                dequeue()
+
+    def _drain_estimate(self) -> float:
+        # Seconds until the current queue is worked off; caller holds _stats_lock
+        avg_work = self.work_seconds_total / self.calls if self.calls else 0.25
+        return (self.queued / self.max_workers + 1) * avg_work
 
-    def hash_password(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+    def stats(self) -> dict[str, float]:
+        with self._stats_lock:
+            return {
+                "calls": self.calls,
+                "queued": self.queued,
+                "queue_seconds_total": self.queue_seconds_total,
+                "queue_seconds_max": self.queue_seconds_max,
+                "work_seconds_total": self.work_seconds_total,
+                "rejected": self.rejected,
+            }
 
-    def verify_password(self, password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(password, hashed_password)
\ No newline at end of file
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,73 @@
+import time
+from uuid import UUID
+from typing import Optional
+from collections import OrderedDict
+
+from src.core.logger import logger
+from src.core.metrics import cache_counters
+from src.modules.auth.schemas import Principal
+
+
+class PrincipalCache:
+    """
+    Short-lived, size-bounded cache of authenticated users keyed by (user id, token iat).
+    Lets get_current_user skip the user lookup for repeated requests with the same token.
+    Entries are per worker process; the TTL bounds how stale another worker's copy can get.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[UUID, int], tuple[Principal, float]] = OrderedDict()
+        self._keys_by_user: dict[UUID, set[int]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._hit_counter, self._miss_counter = cache_counters("principal")
+
+    def get(self, user_id: UUID, iat: int) -> Optional[Principal]:
+        key = (user_id, iat)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            self._miss_counter.inc()
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._hit_counter.inc()
+        return entry[0]
+
+
+    def put(self, principal: Principal, iat: int):
+        key = (principal.id, iat)
+        self._entries[key] = (principal, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        self._keys_by_user.setdefault(principal.id, set()).add(iat)
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+
+    def invalidate(self, user_id: UUID):
+        """
+        Drop every cached token of a user (password change, admin flag change, deletion).
+        """
+        for iat in self._keys_by_user.pop(user_id, ()):
+            self._entries.pop((user_id, iat), None)
+        logger.debug("Principal cache invalidated for user %s", user_id)
+
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_user.clear()
+
+
+    def _remove(self, key: tuple[UUID, int]):
+        self._entries.pop(key, None)
+        user_id, iat = key
+        iats = self._keys_by_user.get(user_id)
+        if iats is not None:
+            iats.discard(iat)
+            if not iats:
+                del self._keys_by_user[user_id]
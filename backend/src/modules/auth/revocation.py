@@ -0,0 +1,148 @@
+import math
+import time
+import asyncio
+import hashlib
+from typing import Optional
+from datetime import datetime, timezone, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.logger import logger
+from src.modules.auth.crud import RevokedTokenDatabase
+
+# Re-read revocations committed slightly out of revoked_at order
+SYNC_OVERLAP = timedelta(seconds=5)
+STALE_SYNC_FACTOR = 3
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings (double hashing on one blake2b digest).
+    No false negatives: `item not in filter` is a definite answer.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationStore:
+    """
+    Refresh-token revocations persisted in Postgres and mirrored in every worker.
+    Each worker keeps a Bloom filter plus an exact jti -> exp map and pulls new rows
+    incrementally (by revoked_at), so checking a token normally costs no I/O.
+    Expired entries are pruned from the table and the local copies by token `exp`.
+    """
+
+    def __init__(
+        self,
+        database: RevokedTokenDatabase,
+        session_factory,
+        sync_interval: float,
+        prune_interval: float,
+        capacity: int,
+        error_rate: float,
+    ):
+        self.database = database
+        self.session_factory = session_factory
+        self.sync_interval = sync_interval
+        self.prune_interval = prune_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self._exact: dict[str, int] = {}
+        self._filter = BloomFilter(capacity, error_rate)
+        self._watermark: Optional[datetime] = None
+        self._last_sync = 0.0
+        self._last_prune = time.monotonic()
+        self._sync_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def revoke(self, db: AsyncSession, jti: str, exp: int):
+        expires_at = datetime.fromtimestamp(exp, tz=timezone.utc)
+        await self.database.revoke(db, jti, expires_at)
+        self._add(jti, exp)
+
+
+    async def is_revoked(self, jti: str) -> bool:
+        # The background task keeps the copy fresh; only sync inline if it has fallen behind
+        if time.monotonic() - self._last_sync > STALE_SYNC_FACTOR * self.sync_interval:
+            await self.sync()
+        if jti not in self._filter:
+            return False
+        exp = self._exact.get(jti)
+        return exp is not None and exp > time.time()
+
+
+    async def sync(self):
+        async with self._sync_lock:
+            if time.monotonic() - self._last_sync <= self.sync_interval:
+                return
+            since = self._watermark - SYNC_OVERLAP if self._watermark else None
+            async with self.session_factory() as db:
+                rows = await self.database.get_revoked_since(db, since)
+            for jti, expires_at, revoked_at in rows:
+                self._add(jti, int(expires_at.timestamp()))
+                if self._watermark is None or revoked_at > self._watermark:
+                    self._watermark = revoked_at
+            self._last_sync = time.monotonic()
+
+
+    async def prune(self):
+        async with self.session_factory() as db:
+            await self.database.delete_expired(db)
+            await db.commit()
+
+        now = time.time()
+        self._exact = {jti: exp for jti, exp in self._exact.items() if exp > now}
+        # Bloom filters can't delete, rebuild from what is still revoked
+        self.capacity = max(self.capacity, 2 * len(self._exact))
+        self._filter = BloomFilter(self.capacity, self.error_rate)
+        for jti in self._exact:
+            self._filter.add(jti)
+        self._last_prune = time.monotonic()
+
+
+    def _add(self, jti: str, exp: int):
+        self._exact[jti] = exp
+        self._filter.add(jti)
+
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="revocation-sync")
+
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sync()
+                if time.monotonic() - self._last_prune > self.prune_interval:
+                    await self.prune()
+            except Exception as e:
+                logger.error(f"Revocation store sync failed: {e}")
+            await asyncio.sleep(self.sync_interval)
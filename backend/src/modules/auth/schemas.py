@@ -1,4 +1,6 @@
+from uuid import UUID
 from typing import Optional
+from datetime import datetime
 from pydantic import BaseModel, EmailStr
 
 
@@ -25,4 +27,32 @@ class ChangePasswordRequest(BaseModel):
 
 class ChangePassword(BaseModel):
     token: str
-    password: str
\ No newline at end of file
+    password: str
+
+
+class TokenClaims(BaseModel):
+    sub: str
+    id: UUID
+    type: str
+    jti: Optional[str] = None
+    iat: int
+    exp: int
+
+
+class Principal(BaseModel):
+    """
+    Detached snapshot of the authenticated user, safe to cache across requests and sessions.
+    """
+    id: UUID
+    email: str
+    chess_level: str
+    is_admin: Optional[bool] = False
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class RevokedTokenCreate(BaseModel):
+    jti: str
+    expires_at: datetime
@@ -2,52 +2,74 @@ from fastapi import HTTPException
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.models import UserTable
 from src.core.logger import logger
+from src.core.tracing import traced
 from src.modules.users.service import UserService
 from src.modules.auth.jwt_service import JWTService
 from src.modules.auth.schemas import RegisterRequest
+from src.modules.auth.revocation import RevocationStore
 from src.modules.auth.password_manager import PasswordManager
 
 class AuthService:
-    def __init__(self, jwt_service: JWTService, password_manager: PasswordManager, user_service: UserService):
+    def __init__(
+        self,
+        jwt_service: JWTService,
+        password_manager: PasswordManager,
+        user_service: UserService,
+        revocation_store: RevocationStore,
+    ):
         self.jwt_service = jwt_service
         self.password_manager = password_manager
         self.user_service = user_service
-        self.revoked_tokens: dict[str, int] = {}
+        self.revocation_store = revocation_store
 
+    @traced("auth.register")
     async def register_user(self, data: RegisterRequest, db: AsyncSession):
-        hashed_password = self.password_manager.hash_password(data.password)
-        await self.user_service.create_user(data.email, hashed_password, data.chess_level, db)
-        return await self.authenticate_user(data.email, data.password, db)
+        hashed_password = await self.password_manager.hash_password(data.password)
+        user = await self.user_service.create_user(data.email, hashed_password, data.chess_level, db)
+        return self._issue_tokens(user)
 
 
+    @traced("auth.login")
     async def authenticate_user(self, email: str, password: str, db: AsyncSession):
         user = await self.user_service.get_by_email(email, db)
-        if not self.password_manager.verify_password(password, user.hashed_password):
+        verified, new_hash = await self.password_manager.verify_and_update(password, user.hashed_password)
+        if not verified:
             raise HTTPException(status_code=400, detail="Incorrect email or password")
+        if new_hash:
+            logger.info(f"Rehashing password of user {user.id} with current bcrypt parameters")
+            await self.user_service.update_user_password(user.id, new_hash, db)
+        return self._issue_tokens(user)
+
+
+    def _issue_tokens(self, user: UserTable) -> tuple[str, str]:
         return (
             self.jwt_service.generate_access_token(user),
             self.jwt_service.generate_refresh_token(user)
         )
 
 
+    @traced("auth.refresh")
     async def refresh_token(self, token: str, db: AsyncSession):
         payload = self.jwt_service.decode_token(token)
         if payload.get("type") != "refresh":
             raise HTTPException(status_code=403, detail="Invalid token type")
         if jti := payload.get("jti"):
-            if jti in self.revoked_tokens:
+            if await self.revocation_store.is_revoked(jti):
                 raise HTTPException(status_code=403, detail="Refresh token is revoked")
         user = await self.user_service.get_by_email(payload["sub"], db)
         return self.jwt_service.generate_access_token(user)
     
 
+    @traced("auth.password_recovery")
     async def send_password_recovery_email(self, email: str, db: AsyncSession):
         user = await self.user_service.get_by_email(email, db)
         recovery_token = self.jwt_service.create_token(user, 30, "recovery")
         logger.info(f"[dev] Password recovery token for {email}: {recovery_token}")
 
 
+    @traced("auth.change_password")
     async def process_change_password(self, token: str, new_password: str, db: AsyncSession):
         payload = self.jwt_service.decode_token(token)
         if payload.get("type") != "recovery":
@@ -55,14 +77,13 @@ class AuthService:
         user_id = payload.get("id")
         if not user_id:
             raise HTTPException(status_code=400, detail="Invalid token payload")
-        hashed = self.password_manager.hash_password(new_password)
+        hashed = await self.password_manager.hash_password(new_password)
         user = await self.user_service.update_user_password(user_id, hashed, db)
-        return await self.authenticate_user(user.email, new_password, db)
+        return self._issue_tokens(user)
 
 
-    async def logout_user(self, refresh_token: str):
-        self._cleanup_revoked_tokens() 
-
+    @traced("auth.logout")
+    async def logout_user(self, refresh_token: str, db: AsyncSession):
         payload = self.jwt_service.decode_token(refresh_token)
 
         if payload.get("type") != "refresh":
@@ -80,17 +101,5 @@ class AuthService:
             logger.info(f"Refresh token already expired (jti={jti}), skipping revoke.")
             return
 
-        self.revoked_tokens[jti] = exp_timestamp
+        await self.revocation_store.revoke(db, jti, exp_timestamp)
         logger.info(f"Refresh token revoked: {jti} (TTL={ttl} seconds)")
-
-    def _cleanup_revoked_tokens(self):
-        now_ts = int(datetime.now(timezone.utc).timestamp())
-        old_size = len(self.revoked_tokens)
-
-        self.revoked_tokens = {
-            jti: exp for jti, exp in self.revoked_tokens.items() if exp > now_ts
-        }
-
-        cleaned = old_size - len(self.revoked_tokens)
-        if cleaned > 0:
-            logger.info(f"Cleaned up {cleaned} expired revoked tokens")
@@ -0,0 +1,46 @@
+from uuid import UUID
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.core.logger import logger
+from src.core.crudbase import CRUDBase
+from src.models import PurchaseTable, SubscriptionTable
+from .schemas import PurchaseCreate
+
+
+class EntitlementDatabase(CRUDBase[PurchaseTable, PurchaseCreate, PurchaseCreate]):
+    async def get_entitlements(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        video_ids: list[UUID],
+    ) -> tuple[Optional[datetime], set[UUID]]:
+        """
+        One round trip: the user's latest subscription expiry and which of `video_ids` they purchased.
+        """
+        logger.debug("Resolving entitlements for user %s over %s videos", user_id, len(video_ids))
+        subscribed_until = (
+            select(func.max(SubscriptionTable.expires_at))
+            .where(SubscriptionTable.user_id == user_id)
+            .scalar_subquery()
+        )
+        purchased = (
+            select(func.array_agg(PurchaseTable.video_id))
+            .where(PurchaseTable.user_id == user_id, PurchaseTable.video_id.in_(video_ids))
+            .scalar_subquery()
+        )
+        result = await db.execute(select(subscribed_until, purchased))
+        expires_at, purchased_ids = result.one()
+        return expires_at, set(purchased_ids or [])
+
+
+    async def add_purchase(self, db: AsyncSession, user_id: UUID, video_id: UUID):
+        stmt = (
+            pg_insert(PurchaseTable)
+            .values(user_id=user_id, video_id=video_id)
+            .on_conflict_do_nothing(constraint="unique_purchase")
+        )
+        await db.execute(stmt)
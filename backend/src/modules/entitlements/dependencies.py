@@ -0,0 +1,13 @@
+from functools import lru_cache
+
+from .crud import EntitlementDatabase
+from .service import EntitlementService
+from src.models import PurchaseTable
+from src.core.dependencies import get_config
+
+@lru_cache()
+def get_entitlement_service() -> EntitlementService:
+    return EntitlementService(
+        config=get_config(),
+        database=EntitlementDatabase(PurchaseTable),
+    )
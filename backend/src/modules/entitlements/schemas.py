@@ -0,0 +1,7 @@
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class PurchaseCreate(BaseModel):
+    user_id: UUID
+    video_id: UUID
@@ -0,0 +1,112 @@
+import time
+from uuid import UUID
+from typing import Optional
+from collections import OrderedDict
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import Config
+from src.core.database import run_after_commit
+from src.core.metrics import cache_counters
+from src.models import AccessLevelEnum
+from src.modules.auth.schemas import Principal
+from src.modules.videos.schemas import VideoRead
+from .crud import EntitlementDatabase
+
+
+class UserEntitlements:
+    """
+    What is known about one user's access: subscription expiry and, for every
+    video already checked, whether it was purchased.
+    """
+    __slots__ = ("subscribed_until", "purchased", "checked", "expires_at")
+
+    def __init__(self, subscribed_until: Optional[datetime], expires_at: float):
+        self.subscribed_until = subscribed_until
+        self.purchased: set[UUID] = set()
+        self.checked: set[UUID] = set()
+        self.expires_at = expires_at
+
+
+class EntitlementService:
+    def __init__(self, config: Config, database: EntitlementDatabase):
+        self.config = config
+        self.database = database
+        self._cache: OrderedDict[UUID, UserEntitlements] = OrderedDict()
+        self._hit_counter, self._miss_counter = cache_counters("entitlements")
+
+    async def resolve(self, user: Principal, videos: list[VideoRead], db: AsyncSession) -> dict[UUID, bool]:
+        """
+        Decide access for a page of videos with at most one query.
+        FREE videos are open to everyone, ONE_TIME needs a purchase,
+        SUBSCRIPTION needs an active subscription or a purchase. Admins can watch everything.
+        """
+        if user.is_admin:
+            return {video.id: True for video in videos}
+
+        paid_ids = [video.id for video in videos if video.access_level != AccessLevelEnum.FREE]
+        entry = self._get_cached(user.id)
+        unchecked = [video_id for video_id in paid_ids if entry is None or video_id not in entry.checked]
+
+        if entry is None or unchecked:
+            subscribed_until, purchased = await self.database.get_entitlements(db, user.id, unchecked)
+            if entry is None:
+                entry = UserEntitlements(subscribed_until, time.monotonic() + self.config.ENTITLEMENT_CACHE_TTL)
+                self._store(user.id, entry)
+            entry.subscribed_until = subscribed_until
+            entry.purchased.update(purchased)
+            entry.checked.update(unchecked)
+
+        subscribed = entry.subscribed_until is not None and entry.subscribed_until > datetime.now(timezone.utc)
+        return {
+            video.id: (
+                video.access_level == AccessLevelEnum.FREE
+                or video.id in entry.purchased
+                or (video.access_level == AccessLevelEnum.SUBSCRIPTION and subscribed)
+            )
+            for video in videos
+        }
+
+
+    async def attach_can_watch(self, user: Principal, videos: list[VideoRead], db: AsyncSession) -> list[VideoRead]:
+        access = await self.resolve(user, videos, db)
+        for video in videos:
+            video.can_watch = access[video.id]
+        return videos
+
+
+    async def record_purchase(self, user_id: UUID, video_id: UUID, db: AsyncSession):
+        """
+        For the purchase flow (there is no endpoint writing purchases yet).
+        The cached access is dropped once the purchase commits.
+        """
+        await self.database.add_purchase(db, user_id, video_id)
+        run_after_commit(db, lambda: self.invalidate(user_id))
+
+
+    def invalidate(self, user_id: UUID):
+        """
+        Forget cached access of a user; call after purchases and subscription changes.
+        """
+        self._cache.pop(user_id, None)
+
+
+    def _get_cached(self, user_id: UUID) -> Optional[UserEntitlements]:
+        entry = self._cache.get(user_id)
+        if entry is None:
+            self._miss_counter.inc()
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._cache[user_id]
+            self._miss_counter.inc()
+            return None
+        self._cache.move_to_end(user_id)
+        self._hit_counter.inc()
+        return entry
+
+
+    def _store(self, user_id: UUID, entry: UserEntitlements):
+        self._cache[user_id] = entry
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.config.ENTITLEMENT_CACHE_SIZE:
+            self._cache.popitem(last=False)
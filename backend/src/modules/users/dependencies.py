@@ -1,6 +1,23 @@
+from functools import lru_cache
+
 from .crud import UserDatabase
 from .service import UserService
 from src.models import UserTable
+from src.core.dependencies import get_config
+from src.modules.auth.principal_cache import PrincipalCache
+
+@lru_cache()
+def get_principal_cache() -> PrincipalCache:
+    return PrincipalCache(
+        max_size=get_config().PRINCIPAL_CACHE_SIZE,
+        ttl=get_config().PRINCIPAL_CACHE_TTL,
+    )
+
 
+@lru_cache()
 def get_user_service() -> UserService:
-    return UserService(UserDatabase(UserTable))
\ No newline at end of file
+    return UserService(
+        UserDatabase(UserTable),
+        principal_cache=get_principal_cache(),
+        export_batch_size=get_config().EXPORT_BATCH_SIZE,
+    )
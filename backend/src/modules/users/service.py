@@ -1,13 +1,27 @@
 from uuid import UUID
+from typing import AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
 from .crud import UserDatabase
 from src.models import UserTable
+from src.core.database import run_after_commit
+from src.core.export import ExportFormat, export_rows
+from src.modules.auth.principal_cache import PrincipalCache
+
+# Never hashed_password
+USER_EXPORT_COLUMNS = ["id", "email", "chess_level", "is_admin", "created_at"]
+
 
 class UserService:
-    def __init__(self, database: UserDatabase):
+    def __init__(self, database: UserDatabase, principal_cache: PrincipalCache, export_batch_size: int = 1000):
         self.database = database
+        self.principal_cache = principal_cache
+        self.export_batch_size = export_batch_size
+
+    def export(self, fmt: ExportFormat) -> AsyncIterator[bytes]:
+        return export_rows(self.database, fmt, USER_EXPORT_COLUMNS, self.export_batch_size)
+
 
     async def create_user(
         self,
@@ -37,4 +51,22 @@ class UserService:
 
     async def update_user_password(self, user_id: UUID, hashed_password: str, db: AsyncSession) -> UserTable:
         user = await self.database.get(db, user_id)
-        return await self.database.update(db, db_obj=user, obj_in={"hashed_password": hashed_password})
\ No newline at end of file
+        user = await self.database.update(db, db_obj=user, obj_in={"hashed_password": hashed_password})
+        self._invalidate_after_commit(user.id, db)
+        return user
+
+
+    async def set_admin(self, user_id: UUID, is_admin: bool, db: AsyncSession) -> UserTable:
+        user = await self.database.get(db, user_id)
+        user = await self.database.update(db, db_obj=user, obj_in={"is_admin": is_admin})
+        self._invalidate_after_commit(user.id, db)
+        return user
+
+
+    async def delete_user(self, user_id: UUID, db: AsyncSession):
+        await self.database.remove(db, id=user_id)
+        self._invalidate_after_commit(user_id, db)
+
+
+    def _invalidate_after_commit(self, user_id: UUID, db: AsyncSession):
+        run_after_commit(db, lambda: self.principal_cache.invalidate(user_id))
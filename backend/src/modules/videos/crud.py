@@ -1,9 +1,12 @@
-from uuid import UUID
-from sqlalchemy import delete
+from uuid import UUID, uuid4
+from typing import Any, Optional
+from collections import defaultdict
+from sqlalchemy import select, delete, insert, update, bindparam, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.crudbase import CRUDBase
-from src.models import VideoTable, VideoAttributeLinkTable
+from src.core.logger import logger
+from src.models import VideoTable, VideoAttributeLinkTable, AttributeValueTable
 from src.modules.videos.schemas import VideoCreate, VideoUpdate
 
 
@@ -14,11 +17,87 @@ class VideoDatabase(CRUDBase[VideoTable, VideoUpdate, VideoCreate]):
         video_id: UUID,
         attribute_ids: list[UUID]
     ):
-        await db.execute(
-            delete(VideoAttributeLinkTable).where(VideoAttributeLinkTable.video_id == video_id)
+        """
+        Replace the attribute values of one video, writing only the links that change.
+        """
+        await self.set_attributes(db, {video_id: set(attribute_ids)})
+
+
+    async def get_attribute_links(self, db: AsyncSession, video_ids: list[UUID]) -> dict[UUID, set[UUID]]:
+        result = await db.execute(
+            select(VideoAttributeLinkTable.video_id, VideoAttributeLinkTable.attribute_value_id)
+            .where(VideoAttributeLinkTable.video_id.in_(video_ids))
         )
-        db.add_all([
-            VideoAttributeLinkTable(video_id=video_id, attribute_value_id=attr_id)
-            for attr_id in attribute_ids
-        ])
-        await db.flush()
+        links = defaultdict(set)
+        for video_id, value_id in result.all():
+            links[video_id].add(value_id)
+        return links
+
+
+    async def set_attributes(
+        self,
+        db: AsyncSession,
+        desired: dict[UUID, set[UUID]],
+        current: Optional[dict[UUID, set[UUID]]] = None,
+    ) -> tuple[int, int]:
+        """
+        Make each video's attribute values equal to `desired[video_id]` with one read
+        (skipped if `current` links are passed), at most one DELETE and one INSERT for all videos.
+        Returns (inserted, deleted) link counts.
+        """
+        if not desired:
+            return 0, 0
+        if current is None:
+            current = await self.get_attribute_links(db, list(desired))
+
+        to_delete = [
+            (video_id, value_id)
+            for video_id, values in desired.items()
+            for value_id in current.get(video_id, set()) - values
+        ]
+        to_insert = [
+            {"id": uuid4(), "video_id": video_id, "attribute_value_id": value_id}
+            for video_id, values in desired.items()
+            for value_id in values - current.get(video_id, set())
+        ]
+
+        if to_delete:
+            await db.execute(
+                delete(VideoAttributeLinkTable)
+                .where(tuple_(VideoAttributeLinkTable.video_id, VideoAttributeLinkTable.attribute_value_id).in_(to_delete))
+            )
+        if to_insert:
+            await db.execute(insert(VideoAttributeLinkTable).values(to_insert))
+
+        logger.debug("Attribute links for %s videos: +%s -%s", len(desired), len(to_insert), len(to_delete))
+        return len(to_insert), len(to_delete)
+
+
+    async def get_existing_ids(self, db: AsyncSession, ids: list[UUID]) -> set[UUID]:
+        result = await db.execute(select(VideoTable.id).where(VideoTable.id.in_(ids)))
+        return set(result.scalars().all())
+
+
+    async def get_existing_attribute_value_ids(self, db: AsyncSession, ids: list[UUID]) -> set[UUID]:
+        result = await db.execute(select(AttributeValueTable.id).where(AttributeValueTable.id.in_(ids)))
+        return set(result.scalars().all())
+
+
+    async def update_many(self, db: AsyncSession, changes: dict[UUID, dict[str, Any]]):
+        """
+        Apply per-video column changes. Videos changing the same set of columns share one
+        executemany UPDATE, so a batch costs one statement per distinct column set.
+        """
+        groups: dict[tuple[str, ...], list[dict[str, Any]]] = defaultdict(list)
+        for video_id, values in changes.items():
+            if values:
+                groups[tuple(sorted(values))].append({"_id": video_id, **values})
+
+        table = self.model.__table__
+        for columns, params in groups.items():
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("_id"))
+                .values({column: bindparam(column) for column in columns})
+            )
+            await db.execute(stmt, params)
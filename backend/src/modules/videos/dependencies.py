@@ -1,12 +1,43 @@
+from typing import Optional
+from functools import lru_cache
+from fastapi import HTTPException, Query
+
 from .utils import VideoUtils
 from .crud import VideoDatabase
 from .service import VideoService
+from .schemas import VideoRead
 from src.models import VideoTable
 from src.core.dependencies import get_config
+from src.modules.entitlements.dependencies import get_entitlement_service
+
+@lru_cache()
+def get_video_utils() -> VideoUtils:
+    return VideoUtils(config=get_config())
+
 
+@lru_cache()
 def get_video_service() -> VideoService:
     return VideoService(
         config=get_config(),
         database=VideoDatabase(VideoTable),
-        utils=VideoUtils(config=get_config()),
-        )
\ No newline at end of file
+        utils=get_video_utils(),
+        entitlements=get_entitlement_service(),
+        )
+
+
+def get_video_fields(
+    fields: Optional[str] = Query(None, description="Comma-separated VideoRead fields to return (id is always included)"),
+    exclude: Optional[str] = Query(None, description="Comma-separated VideoRead fields to leave out"),
+) -> Optional[frozenset[str]]:
+    """
+    Sparse fieldset from `fields=` / `exclude=`; None means every field.
+    """
+    if fields is None and exclude is None:
+        return None
+    known = set(VideoRead.model_fields)
+    selected = {f.strip() for f in fields.split(",") if f.strip()} if fields is not None else set(known)
+    excluded = {f.strip() for f in exclude.split(",") if f.strip()} if exclude is not None else set()
+    invalid = (selected | excluded) - known
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid field(s): {', '.join(sorted(invalid))}")
+    return frozenset((selected - excluded) | {"id"})
@@ -1,6 +1,6 @@
 from uuid import UUID
 from fastapi import Form
-from typing import Optional
+from typing import Literal, Optional
 from decimal import Decimal
 from datetime import datetime
 from pydantic import BaseModel, Field
@@ -60,4 +60,43 @@ class VideoRead(VideoBase):
     hls_url: Optional[str] = None
     created_at: datetime
     attributes: Optional[list[AttributeTypedValueRead]] = None
-    hls_segments: dict[str, str] = {}
\ No newline at end of file
+    hls_segments: dict[str, str] = {}
+    can_watch: Optional[bool] = None
+
+
+class RankedVideoRead(BaseModel):
+    video: VideoRead
+    score: float
+
+
+class VideoBatchItem(BaseModel):
+    """
+    One video's changes. Metadata fields left out are not touched.
+    `attribute_value_ids` replaces the video's attribute values; `add_/remove_attribute_value_ids`
+    change them incrementally (applied after the replacement, if both are given).
+    """
+    id: UUID
+    title: Optional[str] = None
+    description: Optional[str] = None
+    access_level: Optional[int] = Field(None, ge=0, le=2)
+    price: Optional[Decimal] = None
+    attribute_value_ids: Optional[list[UUID]] = None
+    add_attribute_value_ids: list[UUID] = []
+    remove_attribute_value_ids: list[UUID] = []
+
+
+class VideoBatchRequest(BaseModel):
+    items: list[VideoBatchItem] = Field(min_length=1, max_length=1000)
+
+
+class VideoBatchItemResult(BaseModel):
+    id: UUID
+    status: Literal["updated", "unchanged", "not_found", "invalid"]
+    detail: Optional[str] = None
+
+
+class VideoBatchResponse(BaseModel):
+    results: list[VideoBatchItemResult]
+    updated: int
+    links_added: int
+    links_removed: int
@@ -3,16 +3,46 @@ import uuid
 import tempfile
 import shutil
 from uuid import UUID
-from typing import Optional
+from typing import AsyncIterator, Optional
 from fastapi import UploadFile
-from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .utils import VideoUtils
+from .utils import VideoUtils, columns_for
 from .crud import VideoDatabase
 from src.core.config import Config
-from .schemas import VideoCreate, VideoUpdate, VideoRead
-from src.models import VideoTable, VideoAttributeLinkTable, AttributeValueTable
+from src.core.logger import logger
+from src.core.tracing import get_tracer, traced
+from src.core.export import ExportFormat, export_rows
+from .schemas import (
+    VideoCreate,
+    VideoUpdate,
+    VideoRead,
+    RankedVideoRead,
+    VideoBatchItem,
+    VideoBatchItemResult,
+    VideoBatchResponse,
+)
+from src.models import VideoTable
+from src.modules.auth.schemas import Principal
+from src.modules.entitlements.service import EntitlementService
+
+# Storage URLs are exported unsigned
+VIDEO_EXPORT_COLUMNS = [
+    "id",
+    "title",
+    "description",
+    "access_level",
+    "price",
+    "preview_url",
+    "hls_url",
+    "created_at",
+    "resolved_attributes",
+]
+
+
+BATCH_METADATA_FIELDS = {"title", "description", "access_level", "price"}
+BATCH_REQUIRED_FIELDS = {"title", "access_level"}
+
 
 class VideoService:
     def __init__(
@@ -20,11 +50,14 @@ class VideoService:
         config: Config,
         utils: VideoUtils,
         database: VideoDatabase,
+        entitlements: EntitlementService,
     ):
         self.utils = utils
         self.config = config
         self.database = database
+        self.entitlements = entitlements
 
+    @traced("video.create")
     async def create_video(
         self,
         data: VideoCreate,
@@ -40,10 +73,11 @@ class VideoService:
             preview_path = os.path.join(tmpdir, "preview.jpg")
             hls_dir = os.path.join(tmpdir, "hls")
 
-            with open(mp4_path, "wb") as f:
-                shutil.copyfileobj(video_file.file, f)
-            with open(preview_path, "wb") as f:
-                shutil.copyfileobj(preview_file.file, f)
+            with get_tracer().span("video.copy_upload"):
+                with open(mp4_path, "wb") as f:
+                    shutil.copyfileobj(video_file.file, f)
+                with open(preview_path, "wb") as f:
+                    shutil.copyfileobj(preview_file.file, f)
 
             os.makedirs(hls_dir, exist_ok=True)
             self.utils.convert_to_hls(mp4_path, hls_dir)
@@ -66,27 +100,61 @@ class VideoService:
         if attribute_value_ids:
             await self.database.add_attributes(db, db_obj.id, attribute_value_ids)
 
-        video_with_attributes = await self.database.get(
-            db,
-            id=db_obj.id,
-            options=[
-                selectinload(VideoTable.attributes)
-                .selectinload(VideoAttributeLinkTable.attribute_value)
-                .selectinload(AttributeValueTable.type)
-            ]
-        )
+        # resolved_attributes is filled by DB triggers, reload it after the writes
+        db_obj = await self.database.refresh(db, db_obj)
+        return self.utils.attach_presigned_urls(db_obj)
+
+    @traced("video.list")
+    async def get_many(
+        self,
+        skip: int,
+        limit: int,
+        user: Principal,
+        db: AsyncSession,
+        fields: Optional[frozenset[str]] = None,
+    ) -> list[VideoRead]:
+        """
+        With `fields`, only the columns and the signing/listing work those fields need are done.
+        """
+        videos = await self.database.get_multi_projected(db, columns_for(fields), skip, limit)
+        reads = [self.utils.attach_presigned_urls(video, fields) for video in videos]
+        if fields is None or "can_watch" in fields:
+            await self.entitlements.attach_can_watch(user, reads, db)
+        return reads
 
-        return self.utils.attach_presigned_urls(video_with_attributes)
 
-    async def get_many(self, skip: int, limit: int, db: AsyncSession) -> list[VideoRead]:
-        videos = await self.database.get_multi(db, skip, limit, options=[
-                selectinload(VideoTable.attributes)
-                .selectinload(VideoAttributeLinkTable.attribute_value)
-                .selectinload(AttributeValueTable.type)
-            ])
-        return [self.utils.attach_presigned_urls(video) for video in videos]
+    def export(self, fmt: ExportFormat) -> AsyncIterator[bytes]:
+        return export_rows(self.database, fmt, VIDEO_EXPORT_COLUMNS, self.config.EXPORT_BATCH_SIZE)
 
 
+    @traced("video.ranked")
+    async def get_ranked(
+        self,
+        ranking: list[tuple[UUID, float]],
+        user: Principal,
+        db: AsyncSession,
+        fields: Optional[frozenset[str]] = None,
+    ) -> list[RankedVideoRead]:
+        """
+        Build reads for (video_id, score) pairs, keeping the ranking order.
+        Videos deleted since the ranking was computed are skipped.
+        """
+        if not ranking:
+            return []
+        ids = [video_id for video_id, _ in ranking]
+        rows = await self.database.get_multi_projected(db, columns_for(fields), limit=len(ids), id=ids)
+        by_id = {row.id: row for row in rows}
+        ranked = [
+            RankedVideoRead.model_construct(video=self.utils.attach_presigned_urls(by_id[video_id], fields), score=score)
+            for video_id, score in ranking
+            if video_id in by_id
+        ]
+        if fields is None or "can_watch" in fields:
+            await self.entitlements.attach_can_watch(user, [item.video for item in ranked], db)
+        return ranked
+
+
+    @traced("video.update")
     async def update_video(
         self,
         video_id: UUID,
@@ -117,19 +185,84 @@ class VideoService:
         if attribute_value_ids:
             await self.database.add_attributes(db, updated.id, attribute_value_ids)
 
-        video_with_attributes = await self.database.get(
-            db,
-            id=updated.id,
-            options=[
-                selectinload(VideoTable.attributes)
-                .selectinload(VideoAttributeLinkTable.attribute_value)
-                .selectinload(AttributeValueTable.type)
-            ]
+        updated = await self.database.refresh(db, updated)
+        return self.utils.attach_presigned_urls(updated)
+            
+
+    @traced("video.batch_update")
+    async def batch_update(self, items: list[VideoBatchItem], db: AsyncSession) -> VideoBatchResponse:
+        """
+        Apply metadata and attribute changes to many videos in the caller's transaction.
+        Lookups, attribute link writes and updates are set-based (a handful of statements for
+        the whole batch). Items that can't be applied are reported and skipped, the rest go through.
+        """
+        ids = [item.id for item in items]
+        existing = await self.database.get_existing_ids(db, ids)
+        referenced = {
+            value_id
+            for item in items
+            for value_id in [*(item.attribute_value_ids or []), *item.add_attribute_value_ids, *item.remove_attribute_value_ids]
+        }
+        known_values = await self.database.get_existing_attribute_value_ids(db, list(referenced)) if referenced else set()
+
+        results: dict[UUID, VideoBatchItemResult] = {}
+        rejected: list[VideoBatchItemResult] = []
+        changes: dict[UUID, dict] = {}
+        attribute_items: list[VideoBatchItem] = []
+
+        for item in items:
+            if item.id in results:
+                rejected.append(VideoBatchItemResult(id=item.id, status="invalid", detail="Duplicate id in batch"))
+                continue
+            if item.id not in existing:
+                results[item.id] = VideoBatchItemResult(id=item.id, status="not_found")
+                continue
+            metadata = item.model_dump(include=BATCH_METADATA_FIELDS, exclude_unset=True)
+            nulls = sorted(field for field in BATCH_REQUIRED_FIELDS if field in metadata and metadata[field] is None)
+            unknown = {
+                *(item.attribute_value_ids or []), *item.add_attribute_value_ids, *item.remove_attribute_value_ids
+            } - known_values
+            if nulls:
+                results[item.id] = VideoBatchItemResult(
+                    id=item.id, status="invalid", detail=f"Fields can't be null: {', '.join(nulls)}"
+                )
+                continue
+            if unknown:
+                results[item.id] = VideoBatchItemResult(
+                    id=item.id, status="invalid", detail=f"Unknown attribute value(s): {', '.join(sorted(map(str, unknown)))}"
+                )
+                continue
+
+            changes[item.id] = metadata
+            if item.attribute_value_ids is not None or item.add_attribute_value_ids or item.remove_attribute_value_ids:
+                attribute_items.append(item)
+            results[item.id] = VideoBatchItemResult(id=item.id, status="updated" if metadata else "unchanged")
+
+        current = await self.database.get_attribute_links(db, [item.id for item in attribute_items]) if attribute_items else {}
+        desired = {}
+        for item in attribute_items:
+            before = current.get(item.id, set())
+            values = set(item.attribute_value_ids) if item.attribute_value_ids is not None else set(before)
+            values = (values | set(item.add_attribute_value_ids)) - set(item.remove_attribute_value_ids)
+            if values != before:
+                desired[item.id] = values
+                results[item.id].status = "updated"
+
+        await self.database.update_many(db, changes)
+        added, removed = await self.database.set_attributes(db, desired, current)
+
+        ordered = list(results.values()) + rejected
+        updated = sum(result.status == "updated" for result in ordered)
+        logger.info(f"Video batch: {len(items)} items, {updated} updated, +{added}/-{removed} attribute links")
+        return VideoBatchResponse(
+            results=ordered,
+            updated=updated,
+            links_added=added,
+            links_removed=removed,
         )
 
-        return self.utils.attach_presigned_urls(video_with_attributes)
-            
 
+    @traced("video.delete")
     async def delete_video(self, video_id: UUID, db: AsyncSession) -> VideoRead:
         db_obj = await self.database.get(db, video_id)
 
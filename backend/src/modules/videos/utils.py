@@ -1,14 +1,54 @@
 import os
+import time
 import boto3
 import subprocess
+from typing import Optional, Union
+from sqlalchemy import Row
 from botocore.exceptions import ClientError
 
-
 from src.models import VideoTable
 from src.core.config import Config
 from src.core.logger import logger
+from src.core.metrics import FFMPEG_DURATION, instrument_boto_client
+from src.core.server_timing import server_timing
+from src.core.tracing import get_tracer, traced
 from .schemas import VideoRead, AttributeTypedValueRead
 
+# Columns attach_presigned_urls reads; list endpoints select only these.
+VIDEO_READ_COLUMNS = [
+    "id",
+    "title",
+    "description",
+    "preview_url",
+    "hls_url",
+    "access_level",
+    "price",
+    "created_at",
+    "resolved_attributes",
+]
+
+# Columns each VideoRead field is built from (can_watch needs access_level for entitlements)
+FIELD_COLUMNS = {
+    "id": ["id"],
+    "title": ["title"],
+    "description": ["description"],
+    "preview_url": ["preview_url"],
+    "hls_url": ["hls_url"],
+    "hls_segments": ["hls_url"],
+    "access_level": ["access_level"],
+    "price": ["price"],
+    "created_at": ["created_at"],
+    "attributes": ["resolved_attributes"],
+    "can_watch": ["access_level"],
+}
+
+
+def columns_for(fields: Optional[frozenset[str]]) -> list[str]:
+    if fields is None:
+        return VIDEO_READ_COLUMNS
+    needed = {"id"}.union(*(FIELD_COLUMNS[field] for field in fields))
+    return [column for column in VIDEO_READ_COLUMNS if column in needed]
+
 
 class VideoUtils:
     def __init__(self, config: Config):
@@ -20,24 +60,39 @@ class VideoUtils:
             aws_access_key_id=config.SPACES_KEY,
             aws_secret_access_key=config.SPACES_SECRET,
         )
+        instrument_boto_client(self.s3)
+
+
+    def warm_up(self):
+        """
+        One cheap request so the client's endpoint resolution, TLS session and
+        connection pool are ready before the first upload or listing.
+        """
+        try:
+            self.s3.head_bucket(Bucket=self.config.SPACES_BUCKET)
+            logger.info(f"Storage client warmed (bucket {self.config.SPACES_BUCKET})")
+        except ClientError as e:
+            logger.warning(f"Storage warm-up failed: {e}")
 
 
     def upload_to_spaces(self, key: str, path: str, content_type: str = "application/octet-stream"):
-        self.s3.upload_file(
-            Filename=path,
-            Bucket=self.config.SPACES_BUCKET,
-            Key=key,
-            ExtraArgs={"ContentType": content_type},
-        )
+        with get_tracer().span("storage.upload", **{"storage.key": key, "storage.bytes": os.path.getsize(path)}):
+            self.s3.upload_file(
+                Filename=path,
+                Bucket=self.config.SPACES_BUCKET,
+                Key=key,
+                ExtraArgs={"ContentType": content_type},
+            )
 
 
     def generate_presigned_url(self, key: str, expires: int = 600) -> str:
         try:
-            return self.s3.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": self.config.SPACES_BUCKET, "Key": key},
-                ExpiresIn=expires,
-            )
+            with server_timing("sign"):
+                return self.s3.generate_presigned_url(
+                    "get_object",
+                    Params={"Bucket": self.config.SPACES_BUCKET, "Key": key},
+                    ExpiresIn=expires,
+                )
         except ClientError as e:
             from src.core.logger import logger
             logger.error(f"Error generating presigned URL: {e}")
@@ -49,11 +104,44 @@ class VideoUtils:
         return url.replace(base, "") if url and url.startswith(base) else ""
 
 
-    def attach_presigned_urls(self, video: VideoTable) -> VideoRead:
-        preview_key = self.extract_key(video.preview_url)
-        hls_key = self.extract_key(video.hls_url)
-        hls_prefix = hls_key.replace("master.m3u8", "")
-
+    def attach_presigned_urls(self, video: Union[VideoTable, Row], fields: Optional[frozenset[str]] = None) -> VideoRead:
+        """
+        Build a VideoRead with signed URLs. With `fields`, only those fields are computed:
+        no bucket listing without hls_segments, no signing for URLs that weren't asked for.
+        `video` only needs the columns columns_for(fields) returns.
+        """
+        def wanted(field: str) -> bool:
+            return fields is None or field in fields
+
+        values = {"id": video.id}
+        for field in ("title", "description", "access_level", "price", "created_at"):
+            if wanted(field):
+                values[field] = getattr(video, field)
+        if wanted("can_watch"):
+            # Entitlements decide from access_level, it is dropped from the output if not requested
+            values["access_level"] = video.access_level
+
+        if wanted("preview_url"):
+            values["preview_url"] = self.generate_presigned_url(self.extract_key(video.preview_url))
+        if wanted("hls_url") or wanted("hls_segments"):
+            hls_key = self.extract_key(video.hls_url)
+            if wanted("hls_url"):
+                values["hls_url"] = self.generate_presigned_url(hls_key)
+            if wanted("hls_segments"):
+                values["hls_segments"] = self.sign_hls_segments(hls_key.replace("master.m3u8", ""))
+
+        if wanted("attributes"):
+            # Values come from the database, build the models without re-validating them
+            values["attributes"] = [
+                AttributeTypedValueRead.model_construct(type=item["type"], value=item["value"])
+                for item in video.resolved_attributes or []
+            ]
+
+        return VideoRead.model_construct(**values)
+
+
+    @traced("storage.sign_hls_segments")
+    def sign_hls_segments(self, hls_prefix: str) -> dict[str, str]:
         response = self.s3.list_objects_v2(
             Bucket=self.config.SPACES_BUCKET,
             Prefix=hls_prefix
@@ -63,35 +151,13 @@ class VideoUtils:
             for obj in response.get("Contents", [])
             if obj["Key"].endswith(".ts")
         ]
-
-        segment_urls = {
+        return {
             key.split("/")[-1]: self.generate_presigned_url(key)
             for key in ts_files
         }
 
-        attributes = []
-        for link in video.attributes or []:
-            val = link.attribute_value
-            if val and val.type:
-                attributes.append(AttributeTypedValueRead(
-                    type=val.type.name,
-                    value=val.value
-                ))
-
-        return VideoRead(
-            id=video.id,
-            title=video.title,
-            description=video.description,
-            preview_url=self.generate_presigned_url(preview_key),
-            hls_url=self.generate_presigned_url(hls_key),
-            access_level=video.access_level,
-            price=video.price,
-            created_at=video.created_at,
-            attributes=attributes,
-            hls_segments=segment_urls
-        )
-
 
+    @traced("ffmpeg.convert_to_hls")
     def convert_to_hls(self, input_path: str, output_dir: str):
         command = [
             "ffmpeg",
@@ -104,7 +170,13 @@ class VideoUtils:
             "-f", "hls",
             os.path.join(output_dir, "master.m3u8"),
         ]
-        subprocess.run(command, check=True)
+        started = time.perf_counter()
+        result = "error"
+        try:
+            subprocess.run(command, check=True)
+            result = "ok"
+        finally:
+            FFMPEG_DURATION.labels(result).observe(time.perf_counter() - started)
 
 
     def delete_from_spaces(self, key: str) -> None:
@@ -117,6 +189,7 @@ class VideoUtils:
             logger.warning(f"Не удалось удалить файл из Spaces ({key}): {e}")
 
 
+    @traced("storage.delete_prefix")
     def delete_prefix_from_spaces(self, prefix: str) -> None:
         try:
             response = self.s3.list_objects_v2(
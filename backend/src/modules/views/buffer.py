@@ -0,0 +1,118 @@
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+from src.core.logger import logger
+
+
+class EventBuffer:
+    """
+    Bounded in-process buffer that flushes events in batches.
+    A flush is triggered when `flush_size` events are waiting or every `flush_interval` seconds.
+    When `max_size` events are already waiting, new events are dropped and counted
+    instead of growing memory without limit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        writer: Callable[[list], Awaitable[None]],
+        flush_size: int,
+        flush_interval: float,
+        max_size: int,
+    ):
+        self.name = name
+        self.writer = writer
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+
+        self._events: deque = deque()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.accepted = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed_flushes = 0
+
+    def push(self, event) -> bool:
+        """
+        Non-blocking enqueue. Returns False if the event was dropped because the buffer is full.
+        """
+        if len(self._events) >= self.max_size:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 10000 == 0:
+                logger.warning(f"{self.name} buffer full ({self.max_size}), dropped {self.dropped} events so far")
+            return False
+
+        self._events.append(event)
+        self.accepted += 1
+        if len(self._events) >= self.flush_size:
+            self._wakeup.set()
+        return True
+
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"{self.name}-flusher")
+
+
+    async def stop(self):
+        """
+        Stop the background flusher and write out whatever is still buffered.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._events:
+            logger.warning(f"{self.name} buffer stopped with {len(self._events)} unflushed events")
+
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+
+    async def flush(self):
+        async with self._flush_lock:
+            while self._events:
+                size = min(self.flush_size, len(self._events))
+                batch = [self._events.popleft() for _ in range(size)]
+                try:
+                    await self.writer(batch)
+                except Exception as e:
+                    self.failed_flushes += 1
+                    logger.error(f"{self.name} flush of {len(batch)} events failed: {e}")
+                    self._requeue(batch)
+                    return
+                self.flushed += len(batch)
+
+
+    def _requeue(self, batch: list):
+        # Put the failed batch back in front (oldest first) as far as capacity allows
+        room = max(self.max_size - len(self._events), 0)
+        kept = batch[:room]
+        self._events.extendleft(reversed(kept))
+        self.dropped += len(batch) - len(kept)
+
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "buffered": len(self._events),
+            "accepted": self.accepted,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+        }
@@ -0,0 +1,246 @@
+import re
+import math
+from uuid import UUID
+from typing import Optional
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text, bindparam, select, delete, func, extract, literal, DateTime
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, TIMESTAMP
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import (
+    ViewLogTable,
+    VideoViewsHourlyTable,
+    VideoViewsDailyTable,
+    ViewRollupSeenTable,
+    RollupWatermarkTable,
+)
+from src.core.crudbase import CRUDBase
+from src.core.logger import logger
+from .schemas import ViewLogCreate, ViewRollupCreate
+
+# (id, user_id, video_id, viewed_at) - column order used by COPY
+ViewRecord = tuple[UUID, Optional[UUID], UUID, datetime]
+VIEW_COLUMNS = ["id", "user_id", "video_id", "viewed_at"]
+
+PARTITION_NAME = re.compile(r"^views_(\d{4})_(\d{2})$")
+
+ROLLUP_TABLES = {
+    "hour": VideoViewsHourlyTable,
+    "day": VideoViewsDailyTable,
+}
+
+# Counts each (user, video) pair once per window: pairs already in view_rollup_seen
+# are skipped by ON CONFLICT, only newly seen pairs are added to the rollup.
+ROLLUP_SQL = """
+WITH fresh AS (
+    INSERT INTO view_rollup_seen (granularity, bucket_start, video_id, user_id)
+    SELECT DISTINCT
+        CAST(:granularity AS text),
+        date_trunc(CAST(:granularity AS text), viewed_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+        video_id,
+        user_id
+    FROM views
+    WHERE viewed_at > :low AND viewed_at <= :high
+      AND video_id IS NOT NULL AND user_id IS NOT NULL
+    ON CONFLICT DO NOTHING
+    RETURNING bucket_start, video_id
+)
+INSERT INTO {table} (video_id, bucket_start, views)
+SELECT video_id, bucket_start, count(*) FROM fresh GROUP BY video_id, bucket_start
+ON CONFLICT (video_id, bucket_start) DO UPDATE SET views = {table}.views + EXCLUDED.views
+"""
+
+
+def month_bounds(month_start: date) -> tuple[datetime, datetime]:
+    lower = datetime(month_start.year, month_start.month, 1, tzinfo=timezone.utc)
+    if month_start.month == 12:
+        upper = datetime(month_start.year + 1, 1, 1, tzinfo=timezone.utc)
+    else:
+        upper = datetime(month_start.year, month_start.month + 1, 1, tzinfo=timezone.utc)
+    return lower, upper
+
+
+class ViewLogDatabase(CRUDBase[ViewLogTable, ViewLogCreate, ViewLogCreate]):
+    async def copy_records(self, db: AsyncSession, records: list[ViewRecord]):
+        """
+        Bulk load view records with COPY (routed to partitions by Postgres).
+        COPY goes to the asyncpg connection directly, past SQLAlchemy's transaction handling,
+        so it runs in its own asyncpg transaction block: a transaction of its own if the session
+        hasn't executed anything yet, a savepoint inside the session's transaction otherwise.
+        Either way a failed COPY leaves nothing behind; the caller still commits the session.
+        """
+        logger.debug("Copying %s view records", len(records))
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        async with raw.driver_connection.transaction():
+            await raw.driver_connection.copy_records_to_table(
+                self.model.__tablename__,
+                records=records,
+                columns=VIEW_COLUMNS,
+            )
+
+
+    async def insert_existing_records(self, db: AsyncSession, records: list[ViewRecord]) -> int:
+        """
+        Multi-row insert that skips views of deleted videos and nulls out deleted users.
+        Used when COPY fails on a foreign key, so one stale event can't poison a batch.
+        """
+        logger.debug("Inserting %s view records with FK filtering", len(records))
+        ids, user_ids, video_ids, viewed_at = (list(column) for column in zip(*records))
+        stmt = text("""
+            INSERT INTO views (id, user_id, video_id, viewed_at)
+            SELECT e.id, u.id, e.video_id, e.viewed_at
+            FROM unnest(:ids, :user_ids, :video_ids, :viewed_at) AS e(id, user_id, video_id, viewed_at)
+            JOIN videos v ON v.id = e.video_id
+            LEFT JOIN users u ON u.id = e.user_id
+        """).bindparams(
+            bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+            bindparam("user_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+            bindparam("video_ids", type_=ARRAY(PG_UUID(as_uuid=True))),
+            bindparam("viewed_at", type_=ARRAY(TIMESTAMP(timezone=True))),
+        )
+        result = await db.execute(stmt, {
+            "ids": ids,
+            "user_ids": user_ids,
+            "video_ids": video_ids,
+            "viewed_at": viewed_at,
+        })
+        return result.rowcount
+
+
+    async def get_month_partitions(self, db: AsyncSession) -> dict[str, date]:
+        """
+        Returns monthly partitions of the views table as {name: first day of month}.
+        """
+        result = await db.execute(text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'views'::regclass
+        """))
+        partitions = {}
+        for (name,) in result.all():
+            if match := PARTITION_NAME.match(name):
+                partitions[name] = date(int(match.group(1)), int(match.group(2)), 1)
+        return partitions
+
+
+    async def create_month_partition(self, db: AsyncSession, month_start: date):
+        """
+        Create and attach the partition for one UTC month.
+        Rows already routed to views_default for that month are moved into it first,
+        otherwise attaching would fail on the default partition constraint.
+        """
+        name = f"views_{month_start:%Y_%m}"
+        lower, upper = month_bounds(month_start)
+        bounds = {"lower": lower, "upper": upper}
+        logger.info(f"Creating view log partition {name} [{lower:%Y-%m-%d}, {upper:%Y-%m-%d})")
+
+        await db.execute(text(f"CREATE TABLE {name} (LIKE views INCLUDING DEFAULTS)"))
+        await db.execute(text(
+            f"INSERT INTO {name} SELECT * FROM views_default WHERE viewed_at >= :lower AND viewed_at < :upper"
+        ), bounds)
+        await db.execute(text("DELETE FROM views_default WHERE viewed_at >= :lower AND viewed_at < :upper"), bounds)
+        await db.execute(text(
+            f"ALTER TABLE views ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+
+
+    async def drop_partition(self, db: AsyncSession, name: str):
+        if not PARTITION_NAME.match(name):
+            raise ValueError(f"Not a monthly views partition: {name}")
+        logger.info(f"Dropping view log partition {name}")
+        await db.execute(text(f"DROP TABLE {name}"))
+
+
+    async def prune_default(self, db: AsyncSession, month_start: date) -> int:
+        """
+        Delete rows before month_start from views_default; partition drops don't reach them.
+        """
+        before, _ = month_bounds(month_start)
+        result = await db.execute(text("DELETE FROM views_default WHERE viewed_at < :before"), {"before": before})
+        if result.rowcount:
+            logger.info(f"Pruned {result.rowcount} view log rows before {before:%Y-%m-%d} from views_default")
+        return result.rowcount
+
+
+class ViewRollupDatabase(CRUDBase[VideoViewsHourlyTable, ViewRollupCreate, ViewRollupCreate]):
+    async def get_watermark(self, db: AsyncSession, name: str) -> Optional[datetime]:
+        result = await db.execute(select(RollupWatermarkTable.watermark).filter_by(name=name))
+        return result.scalar_one_or_none()
+
+
+    async def set_watermark(self, db: AsyncSession, name: str, watermark: datetime):
+        stmt = pg_insert(RollupWatermarkTable).values(name=name, watermark=watermark)
+        stmt = stmt.on_conflict_do_update(index_elements=["name"], set_={"watermark": stmt.excluded.watermark})
+        await db.execute(stmt)
+
+
+    async def get_oldest_view_time(self, db: AsyncSession) -> Optional[datetime]:
+        result = await db.execute(select(func.min(ViewLogTable.viewed_at)))
+        return result.scalar_one_or_none()
+
+
+    async def rollup_range(self, db: AsyncSession, granularity: str, low: datetime, high: datetime) -> int:
+        """
+        Add views with low < viewed_at <= high to the hourly or daily rollup.
+        Returns the number of rollup rows inserted or updated.
+        """
+        table = ROLLUP_TABLES[granularity].__tablename__
+        logger.debug("Rolling up views into %s: (%s, %s]", table, low.isoformat(), high.isoformat())
+        result = await db.execute(
+            text(ROLLUP_SQL.format(table=table)),
+            {"granularity": granularity, "low": low, "high": high},
+        )
+        return result.rowcount
+
+
+    async def prune_seen(self, db: AsyncSession, granularity: str, before: datetime) -> int:
+        """
+        Forget counted pairs of windows that started at or before `before` (closed windows).
+        """
+        result = await db.execute(
+            delete(ViewRollupSeenTable)
+            .where(ViewRollupSeenTable.granularity == granularity)
+            .where(ViewRollupSeenTable.bucket_start <= before)
+        )
+        return result.rowcount
+
+
+    async def get_trending(
+        self,
+        db: AsyncSession,
+        now: datetime,
+        since: datetime,
+        half_life_hours: float,
+        limit: int,
+    ) -> list[tuple[UUID, float]]:
+        """
+        Time-decayed score from hourly rollups: each bucket's views are halved every `half_life_hours`.
+        """
+        table = VideoViewsHourlyTable
+        age_hours = extract("epoch", literal(now, DateTime(timezone=True)) - table.bucket_start) / 3600
+        score = func.sum(table.views * func.exp(-math.log(2) * age_hours / half_life_hours)).label("score")
+        stmt = (
+            select(table.video_id, score)
+            .where(table.bucket_start >= since)
+            .group_by(table.video_id)
+            .order_by(score.desc())
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        return [(video_id, float(score)) for video_id, score in result.all()]
+
+
+    async def get_most_watched(self, db: AsyncSession, since: Optional[datetime], limit: int) -> list[tuple[UUID, float]]:
+        table = VideoViewsDailyTable
+        total = func.sum(table.views).label("total")
+        stmt = select(table.video_id, total).group_by(table.video_id).order_by(total.desc()).limit(limit)
+        if since is not None:
+            stmt = stmt.where(table.bucket_start >= since)
+        result = await db.execute(stmt)
+        return [(video_id, float(total)) for video_id, total in result.all()]
+
@@ -0,0 +1,24 @@
+from functools import lru_cache
+
+from .crud import ViewLogDatabase, ViewRollupDatabase
+from .service import ViewLogService, ViewRollupService
+from src.models import ViewLogTable, VideoViewsHourlyTable
+from src.core.database import SessionLocal
+from src.core.dependencies import get_config
+
+@lru_cache()
+def get_view_log_service() -> ViewLogService:
+    return ViewLogService(
+        config=get_config(),
+        database=ViewLogDatabase(ViewLogTable),
+        session_factory=SessionLocal,
+    )
+
+
+@lru_cache()
+def get_view_rollup_service() -> ViewRollupService:
+    return ViewRollupService(
+        config=get_config(),
+        database=ViewRollupDatabase(VideoViewsHourlyTable),
+        session_factory=SessionLocal,
+    )
@@ -0,0 +1,16 @@
+from uuid import UUID
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class ViewLogCreate(BaseModel):
+    user_id: Optional[UUID] = None
+    video_id: UUID
+    viewed_at: Optional[datetime] = None
+
+
+class ViewRollupCreate(BaseModel):
+    video_id: UUID
+    bucket_start: datetime
+    views: int
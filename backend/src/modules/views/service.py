@@ -0,0 +1,242 @@
+import asyncio
+from uuid import UUID, uuid4
+from typing import AsyncIterator, Optional
+from datetime import date, datetime, timezone, timedelta
+from asyncpg.exceptions import ForeignKeyViolationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import Config
+from src.core.logger import logger
+from src.core.export import ExportFormat, export_rows
+from .buffer import EventBuffer
+from .crud import ViewLogDatabase, ViewRollupDatabase, ViewRecord, ROLLUP_TABLES, VIEW_COLUMNS
+
+# pg advisory lock keys ("view" / "roll" in ASCII)
+MAINTENANCE_LOCK_KEY = 0x76696577
+ROLLUP_LOCK_KEY = 0x726F6C6C
+
+ROLLUP_WATERMARK = "views"
+
+# Most-watched periods in days, None = all time
+MOST_WATCHED_PERIODS = {"day": 1, "week": 7, "month": 30, "all": None}
+
+
+def add_months(month_start: date, months: int) -> date:
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class ViewLogService:
+    def __init__(self, config: Config, database: ViewLogDatabase, session_factory):
+        self.config = config
+        self.database = database
+        self.session_factory = session_factory
+        self.buffer = EventBuffer(
+            name="view_log",
+            writer=self._write_batch,
+            flush_size=config.VIEW_LOG_FLUSH_SIZE,
+            flush_interval=config.VIEW_LOG_FLUSH_INTERVAL,
+            max_size=config.VIEW_LOG_BUFFER_LIMIT,
+        )
+        self._maintenance_task: Optional[asyncio.Task] = None
+
+    def record_view(self, user_id: Optional[UUID], video_id: UUID) -> bool:
+        """
+        Queue a view event; it is written to the database by the next batch flush.
+        Returns False if the event was dropped because the buffer is full.
+        """
+        return self.buffer.push((uuid4(), user_id, video_id, datetime.now(timezone.utc)))
+
+
+    def export(
+        self,
+        fmt: ExportFormat,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the view log; a since/until range only scans the partitions it overlaps.
+        """
+        viewed_at = self.database.model.viewed_at
+        where = []
+        if since is not None:
+            where.append(viewed_at >= since)
+        if until is not None:
+            where.append(viewed_at < until)
+        return export_rows(
+            self.database,
+            fmt,
+            VIEW_COLUMNS,
+            self.config.EXPORT_BATCH_SIZE,
+            where=where,
+            session_factory=self.session_factory,
+        )
+
+
+    async def _write_batch(self, records: list[ViewRecord]):
+        async with self.session_factory() as db:
+            try:
+                await self.database.copy_records(db, records)
+                await db.commit()
+            except ForeignKeyViolationError:
+                await db.rollback()
+                written = await self.database.insert_existing_records(db, records)
+                await db.commit()
+                logger.warning(f"Skipped {len(records) - written} view events of deleted videos")
+
+        # The rollup watermark trails now by VIEW_ROLLUP_LAG, older views may have been written behind it
+        rollup_limit = datetime.now(timezone.utc) - timedelta(seconds=self.config.VIEW_ROLLUP_LAG)
+        late = sum(1 for record in records if record[3] <= rollup_limit)
+        if late:
+            logger.warning(f"{late} view events were written later than VIEW_ROLLUP_LAG and may be missing from rollups")
+
+
+    async def start(self):
+        self.buffer.start()
+        if self._maintenance_task is None:
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop(), name="view_log-maintenance")
+
+
+    async def stop(self):
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+        await self.buffer.stop()
+
+
+    async def _maintenance_loop(self):
+        while True:
+            try:
+                await self.maintain_partitions()
+            except Exception as e:
+                logger.error(f"View log partition maintenance failed: {e}")
+            await asyncio.sleep(self.config.VIEW_LOG_MAINTENANCE_INTERVAL)
+
+
+    async def maintain_partitions(self, today: Optional[date] = None) -> dict:
+        """
+        Create monthly partitions for the current month and VIEW_LOG_PARTITIONS_AHEAD months ahead,
+        and drop partitions older than VIEW_LOG_RETENTION_MONTHS full months. Rows of those months
+        that landed in views_default are deleted with them.
+        """
+        current = (today or datetime.now(timezone.utc).date()).replace(day=1)
+        wanted = [add_months(current, i) for i in range(self.config.VIEW_LOG_PARTITIONS_AHEAD + 1)]
+        cutoff = add_months(current, -self.config.VIEW_LOG_RETENTION_MONTHS)
+
+        async with self.session_factory() as db:
+            if not await self.database.try_advisory_lock(db, MAINTENANCE_LOCK_KEY):
+                logger.debug("View log partition maintenance is running in another worker")
+                return {"created": [], "dropped": [], "pruned_default": 0}
+
+            existing = await self.database.get_month_partitions(db)
+            created = [month for month in wanted if f"views_{month:%Y_%m}" not in existing]
+            for month in created:
+                await self.database.create_month_partition(db, month)
+
+            expired = sorted(name for name, month in existing.items() if month < cutoff)
+            for name in expired:
+                await self.database.drop_partition(db, name)
+            pruned = await self.database.prune_default(db, cutoff)
+
+            await db.commit()
+
+        return {
+            "created": [f"views_{month:%Y_%m}" for month in created],
+            "dropped": expired,
+            "pruned_default": pruned,
+        }
+
+
+class ViewRollupService:
+    def __init__(self, config: Config, database: ViewRollupDatabase, session_factory):
+        self.config = config
+        self.database = database
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="view_rollup")
+
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_rollup()
+            except Exception as e:
+                logger.error(f"View rollup failed: {e}")
+            await asyncio.sleep(self.config.VIEW_ROLLUP_INTERVAL)
+
+
+    async def run_rollup(self, now: Optional[datetime] = None) -> int:
+        """
+        Fold views newer than the watermark into the hourly and daily rollups.
+        Views from the last VIEW_ROLLUP_LAG seconds are left for the next run so events still
+        sitting in a worker's buffer are not skipped. Work is split into steps of
+        VIEW_ROLLUP_STEP_HOURS, each committed together with its watermark. The watermark never moves
+        back: views written after it passed their viewed_at are not counted (the batch writer logs them).
+        Returns the number of steps applied.
+        """
+        high_limit = (now or datetime.now(timezone.utc)) - timedelta(seconds=self.config.VIEW_ROLLUP_LAG)
+        step = timedelta(hours=self.config.VIEW_ROLLUP_STEP_HOURS)
+        steps = 0
+
+        while True:
+            async with self.session_factory() as db:
+                if not await self.database.try_advisory_lock(db, ROLLUP_LOCK_KEY):
+                    logger.debug("View rollup is running in another worker")
+                    return steps
+
+                low = await self.database.get_watermark(db, ROLLUP_WATERMARK)
+                if low is None:
+                    oldest = await self.database.get_oldest_view_time(db)
+                    low = oldest - timedelta(microseconds=1) if oldest else high_limit
+                    await self.database.set_watermark(db, ROLLUP_WATERMARK, min(low, high_limit))
+                if low >= high_limit:
+                    await db.commit()
+                    return steps
+
+                high = min(low + step, high_limit)
+                for granularity in ROLLUP_TABLES:
+                    await self.database.rollup_range(db, granularity, low, high)
+                await self.database.prune_seen(db, "hour", high - timedelta(hours=1))
+                await self.database.prune_seen(db, "day", high - timedelta(days=1))
+                await self.database.set_watermark(db, ROLLUP_WATERMARK, high)
+                await db.commit()
+
+            steps += 1
+            logger.debug("View rollup advanced to %s", high.isoformat())
+            if high >= high_limit:
+                return steps
+
+
+    async def get_trending(self, db: AsyncSession, limit: int) -> list[tuple[UUID, float]]:
+        now = datetime.now(timezone.utc)
+        return await self.database.get_trending(
+            db,
+            now=now,
+            since=now - timedelta(hours=self.config.TRENDING_WINDOW_HOURS),
+            half_life_hours=self.config.TRENDING_HALF_LIFE_HOURS,
+            limit=limit,
+        )
+
+
+    async def get_most_watched(self, db: AsyncSession, period: str, limit: int) -> list[tuple[UUID, float]]:
+        days = MOST_WATCHED_PERIODS[period]
+        since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+        return await self.database.get_most_watched(db, since, limit)
+
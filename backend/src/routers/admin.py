@@ -1,29 +1,49 @@
+import os
+import asyncio
 from uuid import UUID
-from typing import Optional
+from typing import Literal, Optional
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, UploadFile, File, Form
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query, Response
 
-from src.models import UserTable
 from src.core.database import get_db
+from src.core.logger import get_log_queue_handler
+from src.core.tracing import get_tracer
+from src.core.dependencies import get_config
+from src.core.profiler import profile, render_flamegraph
+from src.core.responses import ModelJSONResponse
+from src.core.http_cache import NO_STORE_HEADERS, conditional_on, no_store
+from src.core.export import ExportFormat, export_response
+from src.modules.users.service import UserService
+from src.modules.users.dependencies import get_user_service
+from src.modules.views.service import ViewLogService
 from src.modules.videos.service import VideoService
 from src.schemas import ListResponse, StatusResponse
-from src.modules.auth.dependencies import get_admin_user
+from src.modules.auth.schemas import Principal
+from src.modules.views.dependencies import get_view_log_service
+from src.modules.auth.dependencies import (
+    get_admin_user,
+    get_jwt_service,
+    get_password_manager,
+    get_ip_rate_limiter,
+    get_account_rate_limiter,
+)
 from src.modules.attributes.service import AttributeService
-from src.modules.videos.dependencies import get_video_service
+from src.modules.videos.dependencies import get_video_service, get_video_fields
 from src.modules.attributes.dependencies import get_attribute_service
-from src.modules.videos.schemas import VideoCreate, VideoUpdate, VideoRead
+from src.modules.videos.schemas import VideoCreate, VideoUpdate, VideoRead, VideoBatchRequest, VideoBatchResponse
 from src.modules.attributes.schemas import AttributeTypeCreate, AttributeTypeRead, AttributeValueCreate, AttributeValueRead, AttributeTypeSimple
 
 
 router = APIRouter()
 
-@router.post("/videos/", response_model=VideoRead, summary="Upload a new video")
+@router.post("/videos/", response_model=VideoRead, summary="Upload a new video", dependencies=[Depends(no_store)])
 async def create_video(
     db: AsyncSession = Depends(get_db),
     video_file: UploadFile = File(...),
     preview_file: UploadFile = File(...),
     data: VideoCreate = Depends(VideoCreate.as_form),
-    сurrent_user: UserTable = Depends(get_admin_user),
+    сurrent_user: Principal = Depends(get_admin_user),
     attribute_value_ids: Optional[str] = Form(None),
     video_service: VideoService = Depends(get_video_service),
 ):
@@ -39,20 +59,25 @@ async def get_all_videos(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
-    сurrent_user: UserTable = Depends(get_admin_user),
+    сurrent_user: Principal = Depends(get_admin_user),
     video_service: VideoService = Depends(get_video_service),
+    fields: Optional[frozenset[str]] = Depends(get_video_fields),
 ):
-    videos = await video_service.get_many(skip, limit, db)
-    return ListResponse[VideoRead](data=videos, total=len(videos))
+    videos = await video_service.get_many(skip, limit, сurrent_user, db, fields)
+    return ModelJSONResponse(
+        ListResponse[VideoRead].model_construct(data=videos, total=len(videos)),
+        include={"data": {"__all__": fields}, "total": True} if fields else None,
+        headers=NO_STORE_HEADERS,
+    )
 
 
-@router.put("/videos/{video_id}", response_model=VideoRead, summary="Update video by ID")
+@router.put("/videos/{video_id}", response_model=VideoRead, summary="Update video by ID", dependencies=[Depends(no_store)])
 async def update_video(
     video_id: UUID,
     db: AsyncSession = Depends(get_db),
     preview_file: Optional[UploadFile] = File(None),
     data: VideoUpdate = Depends(VideoUpdate.as_form),
-    сurrent_user: UserTable = Depends(get_admin_user),
+    сurrent_user: Principal = Depends(get_admin_user),
     attribute_value_ids: Optional[str] = Form(None),
     video_service: VideoService = Depends(get_video_service),
 ):
@@ -63,11 +88,21 @@ async def update_video(
     return await video_service.update_video(video_id, data, preview_file, attribute_value_ids, db)
 
 
+@router.post("/videos/batch", response_model=VideoBatchResponse, summary="Update metadata and attributes of many videos")
+async def batch_update_videos(
+    data: VideoBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_admin_user),
+    video_service: VideoService = Depends(get_video_service),
+):
+    return await video_service.batch_update(data.items, db)
+
+
 @router.delete("/videos/{video_id}", response_model=VideoRead, summary="Delete video by ID")
 async def delete_video(
     video_id: UUID,
     db: AsyncSession = Depends(get_db),
-    сurrent_user: UserTable = Depends(get_admin_user),
+    сurrent_user: Principal = Depends(get_admin_user),
     video_service: VideoService = Depends(get_video_service),
 ):
     await video_service.delete_video(db, video_id)
@@ -78,7 +113,7 @@ async def delete_video(
 async def create_attribute_type(
     data: AttributeTypeCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: UserTable = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
     attribute_service: AttributeService = Depends(get_attribute_service),
 ):
     return await attribute_service.create_type(data, db)
@@ -87,7 +122,8 @@ async def create_attribute_type(
 @router.get("/attribute/types", response_model=ListResponse[AttributeTypeRead], summary="Get all attribute types")
 async def get_attribute_types(
     db: AsyncSession = Depends(get_db),
-    current_user: UserTable = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
+    etag: str = Depends(conditional_on("attribute_types", "attribute_values")),
     attribute_service: AttributeService = Depends(get_attribute_service),
 ):
     types = await attribute_service.get_all_types(db)
@@ -98,7 +134,7 @@ async def get_attribute_types(
 async def create_attribute_value(
     data: AttributeValueCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: UserTable = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
     attribute_service: AttributeService = Depends(get_attribute_service),
 ):
     return await attribute_service.create_value(data, db)
@@ -108,7 +144,7 @@ async def create_attribute_value(
 async def delete_type(
     id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: UserTable = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
     attribute_service: AttributeService = Depends(get_attribute_service),
 ):
     await attribute_service.delete_type(id, db)
@@ -119,8 +155,81 @@ async def delete_type(
 async def delete_value(
     id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: UserTable = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
     attribute_service: AttributeService = Depends(get_attribute_service),
 ):
     await attribute_service.delete_value(id, db)
     return StatusResponse(message="Attribute value deleted successfully")
+
+
+@router.get("/stats", summary="In-process counters of this worker")
+async def get_runtime_stats(
+    current_user: Principal = Depends(get_admin_user),
+):
+    return {
+        "password_hashing": get_password_manager().stats(),
+        "jwt_decode_cache": get_jwt_service().stats(),
+        "auth_ip_rate_limit": get_ip_rate_limiter().stats(),
+        "auth_account_rate_limit": get_account_rate_limiter().stats(),
+        "view_log_buffer": get_view_log_service().buffer.stats(),
+        "logging": get_log_queue_handler().stats(),
+        "tracing": get_tracer().stats(),
+    }
+
+
+@router.get("/export/videos", summary="Export the video catalog as NDJSON or CSV")
+async def export_videos(
+    format: ExportFormat = "ndjson",
+    current_user: Principal = Depends(get_admin_user),
+    video_service: VideoService = Depends(get_video_service),
+):
+    return export_response(video_service.export(format), format, "videos")
+
+
+@router.get("/export/users", summary="Export users as NDJSON or CSV")
+async def export_users(
+    format: ExportFormat = "ndjson",
+    current_user: Principal = Depends(get_admin_user),
+    user_service: UserService = Depends(get_user_service),
+):
+    return export_response(user_service.export(format), format, "users")
+
+
+@router.get("/export/views", summary="Export the view log as NDJSON or CSV")
+async def export_views(
+    format: ExportFormat = "ndjson",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: Principal = Depends(get_admin_user),
+    view_log_service: ViewLogService = Depends(get_view_log_service),
+):
+    return export_response(view_log_service.export(format, since, until), format, "views")
+
+
+@router.get("/profile", summary="Sample the stacks of the worker serving this request")
+async def profile_worker(
+    seconds: float = Query(10, gt=0),
+    rate: int = Query(100, ge=1, le=1000),
+    format: Literal["collapsed", "svg"] = "collapsed",
+    tasks: bool = False,
+    current_user: Principal = Depends(get_admin_user),
+):
+    """
+    Collapsed stacks (flamegraph.pl / speedscope input) or a flame graph SVG of every thread,
+    plus suspended asyncio tasks with `tasks=true`. Only this worker process is sampled;
+    the X-Worker-Pid header says which one.
+    """
+    max_seconds = get_config().PROFILER_MAX_SECONDS
+    if seconds > max_seconds:
+        raise HTTPException(status_code=400, detail=f"seconds must be at most {max_seconds}")
+
+    loop = asyncio.get_running_loop() if tasks else None
+    sampler = await asyncio.to_thread(profile, seconds, rate, loop)
+    if sampler is None:
+        raise HTTPException(status_code=409, detail="A profile is already running in this worker")
+
+    headers = {**NO_STORE_HEADERS, "X-Worker-Pid": str(os.getpid()), "X-Profile-Samples": str(sampler.samples)}
+    if format == "svg":
+        title = f"pid {os.getpid()}: {sampler.samples} samples over {seconds:g}s at {rate}/s"
+        return Response(render_flamegraph(sampler.stacks, title), media_type="image/svg+xml", headers=headers)
+    return Response(sampler.collapsed(), media_type="text/plain; charset=utf-8", headers=headers)
@@ -1,12 +1,12 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 
 from src.core.database import get_db
 from src.schemas import StatusResponse
 from src.modules.auth.service import AuthService
-from src.modules.auth.dependencies import get_auth_service, get_bearer_token
+from src.modules.auth.dependencies import get_auth_service, get_bearer_token, check_auth_rate_limit
 from src.modules.auth.schemas import (
     TokenResponse,
     RegisterRequest,
@@ -19,20 +19,24 @@ router = APIRouter()
 
 @router.post("/register", response_model=TokenResponse, summary="Register a new user")
 async def register_user_route(
+    request: Request,
     data: RegisterRequest,
     db: AsyncSession = Depends(get_db),
     auth_service: AuthService = Depends(get_auth_service),
 ):
+    check_auth_rate_limit(request, data.email)
     access_token, refresh_token = await auth_service.register_user(data, db)
     return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
 
 @router.post("/login", response_model=TokenResponse, summary="User login")
 async def login_user_route(
+    request: Request,
     data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: AsyncSession = Depends(get_db),
     auth_service: AuthService = Depends(get_auth_service),
 ):
+    check_auth_rate_limit(request, data.username)
     access_token, refresh_token = await auth_service.authenticate_user(data.username, data.password, db)
     return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
@@ -59,18 +63,21 @@ async def request_password_recovery_route(
 
 @router.post("/password/reset", response_model=TokenResponse, summary="Reset password with recovery token")
 async def reset_password_route(
+    request: Request,
     data: ChangePassword,
     db: AsyncSession = Depends(get_db),
     auth_service: AuthService = Depends(get_auth_service),
 ):
+    check_auth_rate_limit(request)
     access_token, refresh_token = await auth_service.process_change_password(data.token, data.password, db)
     return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
 
 @router.post("/logout", response_model=StatusResponse, summary="Logout user")
 async def logout_user_route(
+    db: AsyncSession = Depends(get_db),
     refresh_token: str = Depends(get_bearer_token),
     auth_service: AuthService = Depends(get_auth_service),
 ):
-    await auth_service.logout_user(refresh_token)
+    await auth_service.logout_user(refresh_token, db)
     return StatusResponse(message="Logged out successfully")
\ No newline at end of file
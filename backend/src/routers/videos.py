@@ -0,0 +1,65 @@
+from uuid import UUID
+from typing import Literal, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, Query
+
+from src.core.database import get_db
+from src.core.responses import ModelJSONResponse
+from src.core.http_cache import NO_STORE_HEADERS
+from src.schemas import ListResponse, StatusResponse
+from src.modules.videos.service import VideoService
+from src.modules.videos.schemas import RankedVideoRead
+from src.modules.auth.schemas import Principal, TokenClaims
+from src.modules.auth.dependencies import get_current_user, get_token_claims
+from src.modules.videos.dependencies import get_video_service, get_video_fields
+from src.modules.views.service import ViewLogService, ViewRollupService
+from src.modules.views.dependencies import get_view_log_service, get_view_rollup_service
+
+
+router = APIRouter()
+
+@router.get("/trending", response_model=ListResponse[RankedVideoRead], summary="Get trending videos")
+async def get_trending_videos(
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    rollup_service: ViewRollupService = Depends(get_view_rollup_service),
+    video_service: VideoService = Depends(get_video_service),
+    fields: Optional[frozenset[str]] = Depends(get_video_fields),
+):
+    ranking = await rollup_service.get_trending(db, limit)
+    videos = await video_service.get_ranked(ranking, current_user, db, fields)
+    return ModelJSONResponse(
+        ListResponse[RankedVideoRead].model_construct(data=videos, total=len(videos)),
+        include={"data": {"__all__": {"video": fields, "score": True}}, "total": True} if fields else None,
+        headers=NO_STORE_HEADERS,
+    )
+
+
+@router.get("/most-watched", response_model=ListResponse[RankedVideoRead], summary="Get most watched videos")
+async def get_most_watched_videos(
+    period: Literal["day", "week", "month", "all"] = "week",
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    rollup_service: ViewRollupService = Depends(get_view_rollup_service),
+    video_service: VideoService = Depends(get_video_service),
+    fields: Optional[frozenset[str]] = Depends(get_video_fields),
+):
+    ranking = await rollup_service.get_most_watched(db, period, limit)
+    videos = await video_service.get_ranked(ranking, current_user, db, fields)
+    return ModelJSONResponse(
+        ListResponse[RankedVideoRead].model_construct(data=videos, total=len(videos)),
+        include={"data": {"__all__": {"video": fields, "score": True}}, "total": True} if fields else None,
+        headers=NO_STORE_HEADERS,
+    )
+
+
+@router.post("/{video_id}/views", response_model=StatusResponse, status_code=202, summary="Record a video view")
+async def record_view(
+    video_id: UUID,
+    claims: TokenClaims = Depends(get_token_claims),
+    view_log_service: ViewLogService = Depends(get_view_log_service),
+):
+    accepted = view_log_service.record_view(claims.id, video_id)
+    return StatusResponse(status=accepted, message="View recorded" if accepted else "View dropped")
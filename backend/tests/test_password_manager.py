@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+from src.modules.auth.password_manager import PasswordManager
+
+
+async def wait_for(condition, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_cancelled_queued_calls_release_their_queue_slots():
+    manager = PasswordManager(rounds=4, max_workers=1, max_queue=2)
+
+    async def scenario():
+        # Keep the only worker busy so the next calls stay queued
+        release = threading.Event()
+        blocker = asyncio.get_running_loop().run_in_executor(manager.executor, release.wait)
+
+        waiters = [asyncio.create_task(manager.hash_password("secret")) for _ in range(2)]
+        await wait_for(lambda: manager.stats()["queued"] == 2)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+
+        release.set()
+        await blocker
+        assert manager.stats()["queued"] == 0
+
+        hashed = await manager.hash_password("secret")
+        assert await manager.verify_password("secret", hashed)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        manager.shutdown()
+
+
+def test_started_jobs_are_dequeued_once():
+    manager = PasswordManager(rounds=4, max_workers=2, max_queue=8)
+
+    async def scenario():
+        hashes = await asyncio.gather(*(manager.hash_password(f"secret{i}") for i in range(8)))
+        assert len(set(hashes)) == 8
+        assert manager.stats()["queued"] == 0
+        assert manager.stats()["calls"] == 8
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        manager.shutdown()